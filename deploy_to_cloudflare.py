@@ -3,14 +3,22 @@
 deploy_to_cloudflare.py
 -----------------------
 Sube los archivos JSON a Cloudflare R2 después de procesar.
+Cada archivo se sube una sola vez a una clave inmutable derivada de su
+contenido (data/objetos/{sha256}.json, cache de un año); la edición es un
+índice nombre → clave. Al final se mueven los punteros
+data/YYYY/MM/_edicion.json y data/latest.json, que el Worker resuelve, así
+nadie ve una edición a medio publicar. Los objetos que ya están en R2 no se
+vuelven a subir.
 Requiere: pip install boto3
 Configurar variables de entorno:
   - CF_ACCOUNT_ID
   - CF_ACCESS_KEY_ID
   - CF_SECRET_ACCESS_KEY
   - CF_BUCKET_NAME
+  - CF_ENDPOINT_URL (opcional, p. ej. un S3 local para pruebas)
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -20,6 +28,11 @@ from botocore.config import Config
 import urllib3
 from datetime import datetime
 
+from rem.publicacion import (
+    PUNTERO_LATEST, CACHE_INMUTABLE, CACHE_MUTABLE, CACHE_PUNTERO,
+    prefijo_edicion, puntero_edicion, planificar_objetos, armar_indice, armar_puntero,
+)
+
 # Deshabilitar warnings SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -32,6 +45,11 @@ ACCESS_KEY_ID = os.environ.get("CF_ACCESS_KEY_ID", "b753044c51bbd1293e7319a2404e
 SECRET_ACCESS_KEY = os.environ.get("CF_SECRET_ACCESS_KEY", "214e6763c4bb1a53657843b666ecb2ec5e37ab7e47b3a1922aa5512187181a02")
 BUCKET_NAME = os.environ.get("CF_BUCKET_NAME", "rem-data")
 
+ENDPOINT_URL = os.environ.get("CF_ENDPOINT_URL", f"https://{ACCOUNT_ID}.r2.cloudflarestorage.com")
+
+# Versiones precomprimidas generadas por read REM.py (rem_*.json.gz / .br)
+CONTENT_ENCODING = {'.gz': 'gzip', '.br': 'br'}
+
 def validate_config():
     """Valida que estén las variables de entorno necesarias."""
     missing = []
@@ -51,9 +69,6 @@ def validate_config():
 
 def get_r2_client():
     """Crea cliente S3 compatible con R2."""
-    # Endpoint específico de tu bucket
-    endpoint_url = "https://b716491d6afe361dba0e016519df6cb3.r2.cloudflarestorage.com"
-    
     # Configuración para deshabilitar verificación SSL (común en desarrollo local)
     config = Config(
         signature_version='s3v4',
@@ -62,7 +77,7 @@ def get_r2_client():
     
     return boto3.client(
         "s3",
-        endpoint_url=endpoint_url,
+        endpoint_url=ENDPOINT_URL,
         aws_access_key_id=ACCESS_KEY_ID,
         aws_secret_access_key=SECRET_ACCESS_KEY,
         region_name="auto",
@@ -70,15 +85,18 @@ def get_r2_client():
         verify=False  # Deshabilitar verificación SSL
     )
 
-def upload_file_to_r2(client, file_path, object_key):
+def upload_file_to_r2(client, file_path, object_key, cache_control=CACHE_MUTABLE):
     """Sube un archivo a R2."""
     try:
         # Leer archivo
         with open(file_path, 'rb') as f:
             content = f.read()
         
-        # Determinar content type
-        content_type = 'application/json' if file_path.suffix == '.json' else 'application/octet-stream'
+        # Determinar content type (y encoding si es .json.gz / .json.br)
+        content_encoding = CONTENT_ENCODING.get(file_path.suffix)
+        suffix = Path(file_path.stem).suffix if content_encoding else file_path.suffix
+        content_type = 'application/json' if suffix == '.json' else 'application/octet-stream'
+        extra = {'ContentEncoding': content_encoding} if content_encoding else {}
         
         # Subir
         client.put_object(
@@ -86,7 +104,8 @@ def upload_file_to_r2(client, file_path, object_key):
             Key=object_key,
             Body=content,
             ContentType=content_type,
-            CacheControl='public, max-age=3600'  # Cache 1 hora
+            CacheControl=cache_control,
+            **extra
         )
         
         return True
@@ -94,8 +113,71 @@ def upload_file_to_r2(client, file_path, object_key):
         print(f"❌ Error subiendo {object_key}: {e}")
         return False
 
-def deploy():
+def put_json_to_r2(client, object_key, body, cache_control):
+    """Sube un JSON ya serializado (índice o puntero)."""
+    try:
+        client.put_object(
+            Bucket=BUCKET_NAME,
+            Key=object_key,
+            Body=body,
+            ContentType='application/json',
+            CacheControl=cache_control
+        )
+        return True
+    except Exception as e:
+        print(f"❌ Error subiendo {object_key}: {e}")
+        return False
+
+def read_json_object(client, object_key):
+    """Contenido JSON de un objeto de R2, o None si no existe."""
+    try:
+        return json.loads(client.get_object(Bucket=BUCKET_NAME, Key=object_key)['Body'].read())
+    except Exception:
+        return None
+
+def published_objects(client, pointer):
+    """Claves de objetos del índice al que apunta `pointer` (vacío si no hay)."""
+    index = read_json_object(client, pointer["indice"]) if pointer and pointer.get("indice") else None
+    return set((index or {}).get("objetos", {}).values())
+
+def copy_object_in_r2(client, source_key, object_key):
+    """Copia un objeto dentro del bucket (CopyObject): R2 no vuelve a recibir los bytes."""
+    try:
+        client.copy_object(
+            Bucket=BUCKET_NAME,
+            Key=object_key,
+            CopySource={'Bucket': BUCKET_NAME, 'Key': source_key},
+            MetadataDirective='REPLACE',
+            CacheControl=CACHE_MUTABLE,
+            ContentType='application/json',
+            **({'ContentEncoding': CONTENT_ENCODING[Path(object_key).suffix]}
+               if Path(object_key).suffix in CONTENT_ENCODING else {})
+        )
+        return True
+    except Exception as e:
+        print(f"❌ Error copiando {source_key} → {object_key}: {e}")
+        return False
+
+def get_publication_period():
+    """Edición ('YYYY-MM') del XLSX más reciente en data/, o el mes actual."""
+    from rem.ediciones import encontrar_ediciones
+    
+    ediciones = encontrar_ediciones(DATA_DIR)
+    if ediciones:
+        return list(ediciones)[-1]
+    return datetime.now().strftime("%Y-%m")
+
+def deploy(argv=None):
     """Ejecuta el deploy completo."""
+    parser = argparse.ArgumentParser(description="Deploy de los JSON del REM a Cloudflare R2")
+    parser.add_argument("--periodo", help="Edición a publicar, YYYY-MM (default: la del XLSX más reciente en data/)")
+    parser.add_argument(
+        "--copiar-latest", action="store_true",
+        help="Además del puntero, copiar los objetos a data/latest/ con CopyObject (lectores directos del bucket)"
+    )
+    parser.add_argument("--forzar", action="store_true", help="Subir todo aunque R2 ya tenga el mismo contenido")
+    args = parser.parse_args(argv)
+    
     print("=" * 70)
     print("🚀 DEPLOY A CLOUDFLARE R2")
     print("=" * 70)
@@ -115,7 +197,17 @@ def deploy():
         print("❌ No hay archivos JSON para subir")
         sys.exit(1)
     
-    print(f"📦 Archivos a subir: {len(json_files)}")
+    compressed_files = [f for ext in CONTENT_ENCODING for f in sorted(DATA_DIR.glob(f"rem_*.json{ext}"))]
+    
+    periodo = args.periodo or get_publication_period()
+    prefix = prefijo_edicion(periodo)
+    
+    # Clave inmutable de cada archivo e índice de la edición
+    objetos = planificar_objetos(json_files + compressed_files)
+    index_key, index_body = armar_indice(periodo, {name: key for name, (_, key) in objetos.items()})
+    
+    print(f"📦 Archivos a publicar: {len(json_files)} (+ {len(compressed_files)} precomprimidos)")
+    print(f"📍 Edición: {periodo} (índice {index_key})")
     print()
     
     # Crear cliente R2
@@ -134,32 +226,49 @@ def deploy():
         print(f"⚠️  No se pudo verificar bucket (probablemente ya existe): {e}")
         print(f"   Continuando con el upload...")
     
+    # Lo ya publicado: los índices a los que apuntan latest y esta edición
+    latest_pointer = read_json_object(r2, PUNTERO_LATEST)
+    edition_pointer = read_json_object(r2, puntero_edicion(periodo))
+    published = set() if args.forzar else published_objects(r2, latest_pointer) | published_objects(r2, edition_pointer)
+    
+    # Sin cambios en los datos y los punteros ya en este índice: no hay nada que publicar
+    if not args.forzar and edition_pointer and edition_pointer.get("indice") == index_key \
+            and (latest_pointer or {}).get("periodo", "") >= periodo:
+        print(f"✅ R2 ya tiene publicada la edición {periodo}: no se sube nada")
+        return
+    
     print()
-    print("📤 Subiendo archivos...")
+    print("📤 Subiendo objetos inmutables...")
     print("-" * 70)
     
-    # Subir cada archivo
+    # Subir cada archivo que R2 todavía no tiene
     success_count = 0
     fail_count = 0
+    unchanged_count = 0
     
-    for json_file in json_files:
-        # Clave en R2: data/rem_xxx.json
-        object_key = f"data/{json_file.name}"
+    for name, (file_path, object_key) in objetos.items():
+        if object_key in published:
+            unchanged_count += 1
+            continue
         
-        print(f"  Subiendo {json_file.name}...", end=" ")
+        print(f"  Subiendo {name} → {object_key}...", end=" ")
         
-        if upload_file_to_r2(r2, json_file, object_key):
+        if upload_file_to_r2(r2, file_path, object_key, CACHE_INMUTABLE):
             print("✅")
             success_count += 1
         else:
             print("❌")
             fail_count += 1
     
+    if unchanged_count:
+        print(f"  ⏭️  {unchanged_count} archivos ya publicados (mismo contenido)")
     print("-" * 70)
     
     # Crear y subir metadata
     metadata = {
         "ultima_actualizacion": datetime.utcnow().isoformat() + "Z",
+        "periodo": periodo,
+        "indice": index_key,
         "archivos": len(json_files),
         "tablas": [f.stem.replace("rem_", "") for f in json_files if f.name != "rem_bloques.json"],
         "version": "1.0"
@@ -170,18 +279,58 @@ def deploy():
         json.dump(metadata, f, ensure_ascii=False, indent=2)
     
     print(f"  Subiendo metadata...", end=" ")
-    if upload_file_to_r2(r2, metadata_path, "data/_metadata.json"):
+    if upload_file_to_r2(r2, metadata_path, f"{prefix}_metadata.json"):
         print("✅")
         success_count += 1
     else:
         print("❌")
         fail_count += 1
     
+    print(f"  Subiendo índice...", end=" ")
+    if put_json_to_r2(r2, index_key, index_body, CACHE_INMUTABLE):
+        print("✅")
+        success_count += 1
+    else:
+        print("❌")
+        fail_count += 1
+    
+    if args.copiar_latest and fail_count == 0:
+        print()
+        print("📋 Copiando a data/latest/ (CopyObject, sin volver a subir)...")
+        copies = [(key, f"data/latest/{name}") for name, (_, key) in objetos.items()]
+        for source_key, object_key in copies + [(f"{prefix}_metadata.json", "data/latest/_metadata.json")]:
+            print(f"  {object_key}...", end=" ")
+            if copy_object_in_r2(r2, source_key, object_key):
+                print("✅")
+                success_count += 1
+            else:
+                print("❌")
+                fail_count += 1
+    
+    # Los punteros se mueven al final, con un PUT cada uno: hasta acá el
+    # Worker sigue sirviendo la edición anterior completa
+    if fail_count == 0:
+        pointer = armar_puntero(periodo, index_key, metadata["ultima_actualizacion"])
+        pointer_keys = [puntero_edicion(periodo)]
+        if (latest_pointer or {}).get("periodo", "") <= periodo:
+            pointer_keys.append(PUNTERO_LATEST)
+        for pointer_key in pointer_keys:
+            print(f"  Apuntando {pointer_key} → {periodo}...", end=" ")
+            if put_json_to_r2(r2, pointer_key, pointer, CACHE_PUNTERO):
+                print("✅")
+                success_count += 1
+            else:
+                print("❌")
+                fail_count += 1
+    else:
+        print(f"⚠️  Hubo errores: los punteros siguen en la edición anterior")
+    
     print()
     print("=" * 70)
     print(f"📊 RESUMEN DEL DEPLOY")
     print("=" * 70)
     print(f"  ✅ Exitosos: {success_count}")
+    print(f"  ⏭️  Sin cambios: {unchanged_count}")
     print(f"  ❌ Fallidos:  {fail_count}")
     print()
     
@@ -192,7 +341,7 @@ def deploy():
         print("✅ Deploy exitoso")
         print()
         print(f"🌐 Los datos están disponibles en:")
-        print(f"   https://{BUCKET_NAME}.{ACCOUNT_ID}.r2.cloudflarestorage.com/data/rem_bloques.json")
+        print(f"   https://{BUCKET_NAME}.{ACCOUNT_ID}.r2.cloudflarestorage.com/{PUNTERO_LATEST}")
         print()
         print("💡 Próximo paso: Configurar Cloudflare Worker para API pública")
 
@@ -3,16 +3,28 @@
 deploy_with_wrangler.py
 -----------------------
 Sube archivos JSON a Cloudflare R2 usando Wrangler CLI
-Estructura: data/YYYY/MM/rem_*.json
+Estructura: data/objetos/{sha256}.json (inmutables) + índice de la edición,
+y los punteros data/YYYY/MM/_edicion.json y data/latest.json al final.
+Solo sube los objetos que no subió un deploy anterior
+(manifiesto en data/.cache/deploy_r2.json; --forzar sube todo).
 """
 
+import argparse
 import os
+import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import json
 from datetime import datetime
 
+from rem.publicacion import (
+    PUNTERO_LATEST, CACHE_INMUTABLE, CACHE_MUTABLE, CACHE_PUNTERO,
+    prefijo_edicion, puntero_edicion, planificar_objetos, armar_indice, armar_puntero,
+)
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 
@@ -21,6 +33,18 @@ API_TOKEN = os.environ.get("CLOUDFLARE_API_TOKEN")
 ACCOUNT_ID = os.environ.get("CLOUDFLARE_ACCOUNT_ID")
 BUCKET_NAME = "rem-data"
 
+# Versiones precomprimidas generadas por read REM.py (rem_*.json.gz / .br)
+CONTENT_ENCODING = {'.gz': 'gzip', '.br': 'br'}
+
+# Subidas en paralelo: procesos wrangler simultáneos, intentos por archivo
+# y espera base (s) entre intentos
+WORKERS_SUBIDA = int(os.environ.get("WRANGLER_WORKERS", 8))
+INTENTOS_SUBIDA = 3
+ESPERA_REINTENTO = 1.0
+
+# Manifiesto de lo ya subido: objetos inmutables y a qué índice apunta cada puntero
+MANIFIESTO_DEPLOY = DATA_DIR / ".cache" / "deploy_r2.json"
+
 if not API_TOKEN or not ACCOUNT_ID:
     print("❌ ERROR: Variables de entorno CLOUDFLARE_API_TOKEN y CLOUDFLARE_ACCOUNT_ID requeridas")
     print("")
@@ -29,64 +53,53 @@ if not API_TOKEN or not ACCOUNT_ID:
     print("  $env:CLOUDFLARE_ACCOUNT_ID = 'tu_account_id_aqui'")
     sys.exit(1)
 
-def get_publication_date():
-    """
-    Detecta la fecha de publicación del REM desde el nombre del archivo XLSX.
-    Retorna (año, mes) como strings.
-    """
-    xlsx_files = list(DATA_DIR.glob("*.xlsx"))
-    if not xlsx_files:
-        # Fallback a fecha actual
-        now = datetime.now()
-        return str(now.year), f"{now.month:02d}"
-    
-    # Buscar patrón en nombre de archivo: "nov-2025" o "2025-11"
-    filename = xlsx_files[0].stem.lower()
-    
-    # Mapeo de meses en español
-    meses = {
-        'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04',
-        'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
-        'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'
-    }
-    
-    # Intentar extraer año y mes del nombre
-    for mes_nombre, mes_num in meses.items():
-        if mes_nombre in filename:
-            # Buscar año (4 dígitos)
-            import re
-            year_match = re.search(r'20\d{2}', filename)
-            if year_match:
-                year = year_match.group()
-                return year, mes_num
+def get_publication_period():
+    """Edición ('YYYY-MM') del XLSX más reciente en data/, o el mes actual."""
+    from rem.ediciones import encontrar_ediciones
     
-    # Si no se encuentra, usar fecha actual
-    now = datetime.now()
-    return str(now.year), f"{now.month:02d}"
+    ediciones = encontrar_ediciones(DATA_DIR)
+    if ediciones:
+        return list(ediciones)[-1]
+    return datetime.now().strftime("%Y-%m")
 
 def setup_env():
     """Configura variables de entorno para wrangler."""
     os.environ["CLOUDFLARE_API_TOKEN"] = API_TOKEN
     os.environ["CLOUDFLARE_ACCOUNT_ID"] = ACCOUNT_ID
-    # Agregar npm global a PATH
-    npm_path = os.path.join(os.environ["APPDATA"], "npm")
-    if npm_path not in os.environ["PATH"]:
-        os.environ["PATH"] = f"{npm_path};{os.environ['PATH']}"
+    # Agregar npm global a PATH (Windows)
+    if "APPDATA" in os.environ:
+        npm_path = os.path.join(os.environ["APPDATA"], "npm")
+        if npm_path not in os.environ["PATH"]:
+            os.environ["PATH"] = f"{npm_path};{os.environ['PATH']}"
 
-def upload_file_with_wrangler(local_path, object_key):
+def wrangler_command():
+    """Ejecutable de wrangler: $WRANGLER, wrangler.cmd de npm en Windows o el del PATH."""
+    if os.environ.get("WRANGLER"):
+        return os.environ["WRANGLER"]
+    if "APPDATA" in os.environ:
+        return os.path.join(os.environ["APPDATA"], "npm", "wrangler.cmd")
+    return shutil.which("wrangler") or "wrangler"
+
+def upload_file_with_wrangler(local_path, object_key, cache_control=CACHE_MUTABLE):
     """Sube un archivo usando wrangler CLI."""
     try:
-        # Usar wrangler.cmd en Windows
-        wrangler_cmd = os.path.join(os.environ["APPDATA"], "npm", "wrangler.cmd")
+        wrangler_cmd = wrangler_command()
         
         cmd = [
             wrangler_cmd, "r2", "object", "put",
             f"{BUCKET_NAME}/{object_key}",
             f"--file={local_path}",
+            "--content-type=application/json",
+            f"--cache-control={cache_control}",
             "--remote"  # IMPORTANTE: subir al bucket remoto, no local
         ]
         
-        result = subprocess.run(
+        # .json.gz / .json.br: la edge los sirve tal cual con su Content-Encoding
+        content_encoding = CONTENT_ENCODING.get(Path(local_path).suffix)
+        if content_encoding:
+            cmd.append(f"--content-encoding={content_encoding}")
+        
+        subprocess.run(
             cmd,
             capture_output=True,
             text=True,
@@ -95,14 +108,86 @@ def upload_file_with_wrangler(local_path, object_key):
         
         return True
     except subprocess.CalledProcessError as e:
-        print(f"      Error: {e.stderr[:100]}")
+        print(f"      Error ({object_key}): {e.stderr[:100]}")
         return False
     except FileNotFoundError:
         print(f"      Error: wrangler no encontrado en PATH")
         return False
 
-def deploy():
+def upload_with_retries(local_path, object_key, cache_control=CACHE_MUTABLE):
+    """
+    Sube un archivo con hasta INTENTOS_SUBIDA intentos y espera exponencial.
+    Retorna (object_key, exitoso, segundos, intentos).
+    """
+    inicio = time.perf_counter()
+    for intento in range(1, INTENTOS_SUBIDA + 1):
+        if upload_file_with_wrangler(local_path, object_key, cache_control):
+            return object_key, True, time.perf_counter() - inicio, intento
+        if intento < INTENTOS_SUBIDA:
+            time.sleep(ESPERA_REINTENTO * 2 ** (intento - 1))
+    return object_key, False, time.perf_counter() - inicio, INTENTOS_SUBIDA
+
+def upload_many(uploads, workers=None):
+    """
+    Sube [(local_path, object_key, cache_control)] con un pool de hasta `workers` procesos
+    wrangler simultáneos. Muestra cada resultado a medida que termina y
+    retorna la lista de (object_key, exitoso, segundos, intentos).
+    """
+    resultados = []
+    with ThreadPoolExecutor(max_workers=workers or WORKERS_SUBIDA) as pool:
+        futuros = [pool.submit(upload_with_retries, *upload) for upload in uploads]
+        for futuro in as_completed(futuros):
+            object_key, exitoso, segundos, intentos = futuro.result()
+            reintentos = f" ({intentos} intentos)" if intentos > 1 else ""
+            print(f"  {'✅' if exitoso else '❌'} {object_key}  {segundos:.2f}s{reintentos}")
+            resultados.append((object_key, exitoso, segundos, intentos))
+    return resultados
+
+def percentil(valores, p):
+    """Percentil p (0-100) por rango más cercano."""
+    ordenados = sorted(valores)
+    indice = max(0, -(-len(ordenados) * p // 100) - 1)
+    return ordenados[int(indice)]
+
+def print_upload_stats(resultados, total_bytes, duracion):
+    """Throughput y percentiles de latencia por archivo de las subidas."""
+    if not resultados:
+        return
+    latencias = [segundos for _, _, segundos, _ in resultados]
+    print(f"  ⏱️  {len(resultados)} subidas en {duracion:.1f}s: "
+          f"{len(resultados) / duracion:.1f} archivos/s, {total_bytes / duracion / 1024:.1f} KB/s")
+    print(f"     Latencia por archivo: p50 {percentil(latencias, 50):.2f}s · "
+          f"p90 {percentil(latencias, 90):.2f}s · p99 {percentil(latencias, 99):.2f}s · "
+          f"máx {max(latencias):.2f}s")
+
+def read_deploy_manifest():
+    """
+    Manifiesto del deploy: {"objetos": [claves subidas], "punteros": {puntero: índice},
+    "latest": edición a la que apunta latest.json ('' si nunca se publicó)}.
+    """
+    try:
+        with open(MANIFIESTO_DEPLOY, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return {"objetos": list(manifest.get("objetos", [])), "punteros": manifest.get("punteros", {}),
+                "latest": manifest.get("latest", "")}
+    except (OSError, ValueError, AttributeError):
+        return {"objetos": [], "punteros": {}, "latest": ""}
+
+def write_deploy_manifest(manifest):
+    """Guarda el manifiesto del deploy (escritura atómica)."""
+    MANIFIESTO_DEPLOY.parent.mkdir(parents=True, exist_ok=True)
+    temporal = MANIFIESTO_DEPLOY.with_suffix(".tmp")
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporal, MANIFIESTO_DEPLOY)
+
+def deploy(argv=None):
     """Ejecuta el deploy completo."""
+    parser = argparse.ArgumentParser(description="Deploy de los JSON del REM a R2 con wrangler")
+    parser.add_argument("--periodo", help="Edición a publicar, YYYY-MM (default: la del XLSX más reciente en data/)")
+    parser.add_argument("--forzar", action="store_true", help="Subir todo aunque el manifiesto diga que no cambió")
+    args = parser.parse_args(argv)
+    
     print("=" * 70)
     print("🚀 DEPLOY A CLOUDFLARE R2 (WRANGLER)")
     print("=" * 70)
@@ -111,9 +196,10 @@ def deploy():
     # Setup
     setup_env()
     
-    # Detectar fecha de publicación
-    year, month = get_publication_date()
-    print(f"📅 Fecha detectada: {year}/{month}")
+    # Edición a publicar: la más reciente de data/ salvo --periodo
+    periodo = args.periodo or get_publication_period()
+    year, month = periodo.split("-")
+    print(f"📅 Edición: {year}/{month}")
     print()
     
     # Verificar archivos
@@ -126,41 +212,62 @@ def deploy():
         print("❌ No hay archivos JSON para subir")
         sys.exit(1)
     
-    print(f"📦 Archivos a subir: {len(json_files)}")
-    print(f"📍 Destino: data/{year}/{month}/")
+    compressed_files = [f for ext in CONTENT_ENCODING for f in sorted(DATA_DIR.glob(f"rem_*.json{ext}"))]
+    upload_files = json_files + compressed_files
+    
+    prefix = prefijo_edicion(periodo)
+    
+    # Clave inmutable de cada archivo e índice de la edición
+    objetos = planificar_objetos(upload_files)
+    index_key, index_body = armar_indice(periodo, {name: key for name, (_, key) in objetos.items()})
+    
+    print(f"📦 Archivos a publicar: {len(json_files)} (+ {len(compressed_files)} precomprimidos)")
+    print(f"📍 Edición: {periodo} (índice {index_key})")
     print()
     
-    # Subir archivos
-    print("📤 Subiendo archivos...")
+    # Solo lo que ningún deploy anterior subió; --forzar olvida los objetos
+    # y punteros pero no la edición de latest
+    manifest = read_deploy_manifest()
+    if args.forzar:
+        manifest.update(objetos=[], punteros={})
+    subidos = set(manifest["objetos"])
+    
+    # latest.json nunca retrocede a una edición más vieja que la publicada
+    pointer_keys = [puntero_edicion(periodo)]
+    if manifest["latest"] <= periodo:
+        pointer_keys.append(PUNTERO_LATEST)
+    
+    if all(manifest["punteros"].get(key) == index_key for key in pointer_keys):
+        print(f"✅ R2 ya tiene publicada la edición {periodo} (manifiesto): no se sube nada")
+        return 0
+    
+    uploads = [(f, key, CACHE_INMUTABLE) for f, key in objetos.values() if key not in subidos]
+    sin_cambios = len(objetos) - len(uploads)
+    
+    # Subir los objetos inmutables en paralelo
+    print(f"📤 Subiendo {len(uploads)} objetos ({WORKERS_SUBIDA} en paralelo, {sin_cambios} ya publicados)...")
     print("-" * 70)
     
-    exitosos = 0
-    fallidos = 0
+    inicio = time.perf_counter()
+    resultados = upload_many(uploads)
     
-    for json_file in json_files:
-        # Subir a data/YYYY/MM/filename.json en R2
-        object_key = f"data/{year}/{month}/{json_file.name}"
-        print(f"  Subiendo {json_file.name}... ", end="", flush=True)
-        
-        if upload_file_with_wrangler(json_file, object_key):
-            print("✅")
-            exitosos += 1
-        else:
-            print("❌")
-            fallidos += 1
+    subidos.update(key for key, exitoso, _, _ in resultados if exitoso)
+    manifest["objetos"] = sorted(subidos)
+    write_deploy_manifest(manifest)
     
     print("-" * 70)
     
     # Generar y subir metadata
     print()
-    print("📋 Generando metadata...")
+    print("📋 Generando metadata e índice...")
     
     metadata = {
         "ultima_actualizacion": datetime.now().isoformat() + "Z",
         "año": year,
         "mes": month,
-        "periodo": f"{year}-{month}",
-        "archivos": [f"data/{year}/{month}/{f.name}" for f in json_files],
+        "periodo": periodo,
+        "indice": index_key,
+        "archivos": [objetos[f.name][1] for f in json_files],
         "total_archivos": len(json_files),
         "version": "1.0"
     }
@@ -169,36 +276,35 @@ def deploy():
     with open(metadata_file, 'w', encoding='utf-8') as f:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
     
-    # Subir metadata al período específico Y a la raíz para "latest"
-    print(f"  Subiendo metadata periodo... ", end="", flush=True)
-    if upload_file_with_wrangler(metadata_file, f"data/{year}/{month}/_metadata.json"):
-        print("✅")
-        exitosos += 1
-    else:
-        print("❌")
-        fallidos += 1
+    index_file = MANIFIESTO_DEPLOY.parent / "_index.json"
+    index_file.write_bytes(index_body)
+    
+    # Metadata e índice cuando los datos ya están en R2
+    resultados += upload_many([
+        (metadata_file, f"{prefix}_metadata.json", CACHE_MUTABLE),
+        (index_file, index_key, CACHE_INMUTABLE),
+    ])
     
-    print(f"  Subiendo metadata latest... ", end="", flush=True)
-    if upload_file_with_wrangler(metadata_file, "data/latest/_metadata.json"):
-        print("✅")
-        exitosos += 1
+    # Punteros al final y de a uno (primero la edición, después latest):
+    # hasta acá el Worker sigue sirviendo la edición anterior completa
+    if all(exitoso for _, exitoso, _, _ in resultados):
+        pointer_file = MANIFIESTO_DEPLOY.parent / "_puntero.json"
+        pointer_file.write_bytes(armar_puntero(periodo, index_key, metadata["ultima_actualizacion"]))
+        for pointer_key in pointer_keys:
+            resultados += upload_many([(pointer_file, pointer_key, CACHE_PUNTERO)])
+            if not resultados[-1][1]:
+                break
+            manifest["punteros"][pointer_key] = index_key
+            if pointer_key == PUNTERO_LATEST:
+                manifest["latest"] = periodo
+            write_deploy_manifest(manifest)
     else:
-        print("❌")
-        fallidos += 1
+        print("⚠️  Hubo errores: los punteros siguen en la edición anterior")
+    duracion = time.perf_counter() - inicio
     
-    # Copiar todos los archivos también a latest/
-    print()
-    print("📋 Copiando a latest/...")
-    for json_file in json_files:
-        object_key = f"data/latest/{json_file.name}"
-        print(f"  {json_file.name}... ", end="", flush=True)
-        
-        if upload_file_with_wrangler(json_file, object_key):
-            print("✅")
-            exitosos += 1
-        else:
-            print("❌")
-            fallidos += 1
+    exitosos = sum(1 for _, exitoso, _, _ in resultados if exitoso)
+    fallidos = len(resultados) - exitosos
+    total_bytes = sum(f.stat().st_size for f, _, _ in uploads) + metadata_file.stat().st_size + len(index_body)
     
     # Resumen
     print()
@@ -206,15 +312,17 @@ def deploy():
     print("📊 RESUMEN DEL DEPLOY")
     print("=" * 70)
     print(f"  ✅ Exitosos: {exitosos}")
+    print(f"  ⏭️  Sin cambios: {sin_cambios}")
     print(f"  ❌ Fallidos:  {fallidos}")
+    print_upload_stats(resultados, total_bytes, duracion)
     print()
     
     if fallidos == 0:
         print("🎉 Deploy completado exitosamente!")
         print()
         print("📍 URLs públicas:")
-        print(f"   https://pub-<subdomain>.r2.dev/data/_metadata.json")
-        print(f"   https://pub-<subdomain>.r2.dev/data/rem_bloques.json")
+        print(f"   https://pub-<subdomain>.r2.dev/{PUNTERO_LATEST}")
+        print(f"   https://pub-<subdomain>.r2.dev/{index_key}")
         print()
         print("⚠️  Nota: Debes configurar un dominio público en Cloudflare R2")
         print("   Dashboard → R2 → rem-data → Settings → Public Access")
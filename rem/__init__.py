@@ -0,0 +1,57 @@
+"""
+rem
+---
+Parser del Relevamiento de Expectativas de Mercado (REM) del BCRA.
+
+    import rem
+    bloques = rem.parsear_libro("tablas-relevamiento-expectativas-mercado-nov-2025.xlsx")
+    bloques = rem.parsear_libro(respuesta.content)          # bytes en memoria
+    bloques["tipo_cambio"]["datos"]
+
+Los submódulos se importan recién cuando se usa alguno de sus nombres, así
+`import rem` no carga pandas.
+"""
+import importlib
+
+# Versión del parser: cambiarla invalida el cache de parseo
+PARSER_VERSION = "2"
+
+# Nombre público → submódulo que lo define
+_EXPORTS = {
+    "parsear_libro": "parser",
+    "parsear_archivos": "parser",
+    "procesar_hoja": "parser",
+    "armar_resultado": "parser",
+    "HOJAS_PROCESAR": "lectura",
+    "MOTORES": "lectura",
+    "MOTOR_POR_DEFECTO": "lectura",
+    "validar_motor": "lectura",
+    "MESES": "ediciones",
+    "edicion_de_archivo": "ediciones",
+    "validar_edicion": "ediciones",
+    "argumento_edicion": "ediciones",
+    "ediciones_en_rango": "ediciones",
+    "encontrar_ediciones": "ediciones",
+    "hash_archivo": "cache",
+    "formatos_salida": "cache",
+    "salida_vigente": "cache",
+    "registrar_salida": "cache",
+    "serializar": "salida",
+    "ensamblar_objeto": "salida",
+    "escribir_json": "salida",
+    "comprimir_archivos": "salida",
+    "guardar_parquet": "salida",
+    "escribir_salidas": "salida",
+    "clave_objeto": "publicacion",
+    "planificar_objetos": "publicacion",
+    "armar_indice": "publicacion",
+    "armar_puntero": "publicacion",
+}
+
+__all__ = ["PARSER_VERSION", *_EXPORTS]
+
+def __getattr__(nombre):
+    if nombre in _EXPORTS:
+        modulo = importlib.import_module(f".{_EXPORTS[nombre]}", __name__)
+        return getattr(modulo, nombre)
+    raise AttributeError(f"module 'rem' has no attribute '{nombre}'")
@@ -0,0 +1,87 @@
+"""
+Cache de parseo: los bloques de cada hoja guardados por SHA-256 del XLSX y
+versión del parser. No importa pandas, así un run sin cambios es inmediato.
+"""
+from pathlib import Path
+import hashlib
+import json
+import os
+
+from . import PARSER_VERSION
+
+def hash_archivo(archivo):
+    """SHA-256 del contenido del archivo."""
+    sha = hashlib.sha256()
+    with open(archivo, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def ruta_cache(cache_dir, sha):
+    return Path(cache_dir) / f"{sha}-v{PARSER_VERSION}.json"
+
+def leer_cache(cache_dir, sha):
+    """
+    Retorna (nombres_de_hojas, hojas_procesadas) guardados para ese
+    contenido y versión del parser, o None si no están en cache.
+    """
+    try:
+        with open(ruta_cache(cache_dir, sha), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache['nombres_hojas'], [(hoja, [tuple(b) for b in bloques]) for hoja, bloques in cache['hojas']]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def guardar_cache(cache_dir, sha, archivo, nombres_hojas, hojas_procesadas):
+    """Guarda los bloques de cada hoja (escritura atómica)."""
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    destino = ruta_cache(cache_dir, sha)
+    temporal = destino.with_suffix(".tmp")
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({
+            'archivo': Path(archivo).name,
+            'sha256': sha,
+            'parser_version': PARSER_VERSION,
+            'nombres_hojas': nombres_hojas,
+            'hojas': hojas_procesadas,
+        }, f, ensure_ascii=False)
+    os.replace(temporal, destino)
+
+def formatos_salida(comprimir=True, parquet=False, indentado=False):
+    """
+    Formatos que escribe escribir_salidas con esas opciones. Los JSON
+    indentados (--pretty) y compactos son formatos distintos: uno no
+    sirve de caché para el otro.
+    """
+    formato_json = 'json_indentado' if indentado else 'json'
+    return (formato_json,) + (('comprimido',) if comprimir else ()) + (('parquet',) if parquet else ())
+
+def salida_vigente(directorio, sha, formatos=('json',)):
+    """
+    True si las salidas de `directorio` se generaron desde este contenido y
+    versión del parser e incluyen todos los formatos pedidos.
+    """
+    try:
+        with open(Path(directorio) / ".cache" / "salida.json", 'r', encoding='utf-8') as f:
+            salida = json.load(f)
+    except (OSError, ValueError):
+        return False
+    
+    return (
+        salida.get('sha256') == sha
+        and salida.get('parser_version') == PARSER_VERSION
+        and set(formatos) <= set(salida.get('formatos', ['json']))
+        and all((Path(directorio) / nombre).exists() for nombre in salida.get('archivos', []))
+    )
+
+def registrar_salida(directorio, sha, archivos, formatos=('json',)):
+    """Registra de qué XLSX salieron los archivos escritos en `directorio`."""
+    marcador = Path(directorio) / ".cache" / "salida.json"
+    marcador.parent.mkdir(parents=True, exist_ok=True)
+    with open(marcador, 'w', encoding='utf-8') as f:
+        json.dump({
+            'sha256': sha,
+            'parser_version': PARSER_VERSION,
+            'formatos': list(formatos),
+            'archivos': [str(Path(a).relative_to(directorio)) for a in archivos],
+        }, f, ensure_ascii=False, indent=2)
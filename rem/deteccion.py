@@ -0,0 +1,214 @@
+"""
+Detección de bloques (tablas) dentro de una hoja del REM.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Títulos exactos o muy específicos de los bloques
+TITULOS_EXACTOS = [
+    "precios minoristas (ipc nivel general-nacional; indec)",
+    "precios minoristas (ipc núcleo-nacional; indec)",
+    "tasa de interés (tamar)",
+    "tipo de cambio nominal",
+    "exportaciones",
+    "importaciones",
+    "resultado primario del spnf",
+    "desocupación abierta",
+    "pib a precios constantes"
+]
+
+# Palabras clave que indican títulos de bloques (más específicas)
+PALABRAS_CLAVE_TITULO = [
+    "precios minoristas",
+    "ipc nivel general",
+    "ipc núcleo",
+    "tasa de interés",
+    "tamar",
+    "tipo de cambio nominal",
+    "resultado primario",
+    "spnf",
+    "desocupación",
+    "pib a precios constantes"
+]
+
+# Títulos cortos que se aceptan tal cual aparecen en la hoja
+TITULOS_CORTOS = ["Exportaciones", "Importaciones", "PIB a precios constantes"]
+
+# Palabras que suelen aparecer en la fila de encabezado de un bloque
+PALABRAS_ENCABEZADO = ["período", "periodo", "mes", "año", "trimestre", "referencia", "fecha"]
+
+# Todas las subcadenas de los títulos exactos: un texto "está contenido" en
+# algún título exacto si y solo si pertenece a este conjunto.
+_SUBCADENAS_TITULOS = {
+    titulo[a:b]
+    for titulo in TITULOS_EXACTOS
+    for a in range(len(titulo) + 1)
+    for b in range(a, len(titulo) + 1)
+}
+
+_RE_TITULOS_EXACTOS = "|".join(re.escape(t) for t in TITULOS_EXACTOS)
+_RE_PALABRAS_CLAVE = "|".join(re.escape(p) for p in PALABRAS_CLAVE_TITULO)
+_RE_ENCABEZADO = "|".join(re.escape(p) for p in PALABRAS_ENCABEZADO)
+
+def clasificar_textos(textos):
+    """
+    Clasifica una serie de strings. Un texto es título de bloque si es
+    parte de un título exacto o lo contiene, o si (con 3+ caracteres) es un
+    título corto o tiene una palabra clave, menos de 200 caracteres y
+    menos de 30% de dígitos.
+    Retorna DataFrame con las columnas 'titulo', 'vacio' y 'encabezado'.
+    """
+    original = textos.str.strip()
+    texto = original.str.lower()
+    largo = texto.str.len()
+    
+    exacto = texto.str.contains(_RE_TITULOS_EXACTOS, regex=True) | texto.isin(_SUBCADENAS_TITULOS)
+    corto = original.isin(TITULOS_CORTOS)
+    tiene_clave = texto.str.contains(_RE_PALABRAS_CLAVE, regex=True)
+    ratio_numeros = (texto.str.count(r'\d') / largo.where(largo > 0)).fillna(0)
+    
+    titulo = exacto | (
+        (original.str.len() >= 3)
+        & (corto | (tiene_clave & (largo < 200) & (ratio_numeros < 0.3)))
+    )
+    
+    return pd.DataFrame({
+        'titulo': titulo.to_numpy(dtype=bool),
+        'vacio': (original == "").to_numpy(dtype=bool),
+        'encabezado': textos.str.lower().str.contains(_RE_ENCABEZADO, regex=True).to_numpy(dtype=bool),
+    })
+
+def calcular_mascaras(df, umbral=0.8):
+    """
+    Calcula en pocas pasadas vectorizadas las máscaras de toda la hoja.
+    Retorna dict con:
+      - 'titulo': matriz booleana de celdas que son título de bloque
+      - 'fila_titulo': filas con al menos un título (cortan un bloque)
+      - 'fila_inicio': filas cuyo primer título no está vacío (abren un bloque)
+      - 'fila_vacia': filas con al menos `umbral` de celdas vacías o en blanco
+      - 'fila_encabezado': filas con palabras típicas de encabezado
+    """
+    valores = df.to_numpy(dtype=object)
+    nrows, ncols = valores.shape
+    celdas = pd.Series(valores.ravel(), dtype=object)
+    
+    nulos = celdas.isna().to_numpy()
+    es_texto = celdas.map(type).to_numpy() == str
+    
+    titulo = np.zeros(celdas.shape[0], dtype=bool)
+    vacio = nulos.copy()
+    encabezado = np.zeros(celdas.shape[0], dtype=bool)
+    
+    if es_texto.any():
+        # Clasificar cada string distinto una sola vez
+        textos = celdas[es_texto]
+        codigos, unicos = pd.factorize(textos)
+        clases = clasificar_textos(pd.Series(unicos, dtype=object))
+        
+        titulo[es_texto] = clases['titulo'].to_numpy()[codigos]
+        vacio[es_texto] = clases['vacio'].to_numpy()[codigos]
+        encabezado[es_texto] = clases['encabezado'].to_numpy()[codigos]
+    
+    titulo = titulo.reshape(nrows, ncols)
+    vacio = vacio.reshape(nrows, ncols)
+    encabezado = encabezado.reshape(nrows, ncols)
+    
+    fila_titulo = titulo.any(axis=1)
+    primera = titulo.argmax(axis=1)
+    
+    return {
+        'titulo': titulo,
+        'fila_titulo': fila_titulo,
+        'fila_inicio': fila_titulo & ~vacio[np.arange(nrows), primera],
+        'fila_vacia': vacio.sum(axis=1) / max(ncols, 1) >= umbral,
+        'fila_encabezado': encabezado.any(axis=1),
+    }
+
+def detectar_bloques_mejorado(df):
+    """
+    Detecta bloques de datos en el DataFrame.
+    Retorna lista de tuplas: (titulo, fila_inicio_datos, fila_fin_datos)
+    
+    Las máscaras de título, filas vacías y encabezados se calculan una sola
+    vez para toda la hoja; los límites de cada bloque se buscan sobre esos
+    arrays en lugar de recorrer las celdas fila por fila.
+    """
+    bloques = []
+    nrows = df.shape[0]
+    if nrows == 0 or df.shape[1] == 0:
+        return bloques
+    
+    mascaras = calcular_mascaras(df)
+    fila_titulo = mascaras['fila_titulo']
+    fila_vacia = mascaras['fila_vacia']
+    fila_encabezado = mascaras['fila_encabezado']
+    
+    filas_titulo = np.flatnonzero(fila_titulo)
+    filas_inicio = np.flatnonzero(mascaras['fila_inicio'])
+    
+    # Inicio de cada racha de 3+ filas vacías consecutivas
+    tres_vacias = fila_vacia[:-2] & fila_vacia[1:-1] & fila_vacia[2:]
+    inicios_vacias = np.flatnonzero(tres_vacias)
+    
+    valores = df.to_numpy(dtype=object)
+    
+    i = 0
+    while True:
+        # Buscar próxima fila con título
+        pos = np.searchsorted(filas_inicio, i)
+        if pos >= len(filas_inicio):
+            break
+        i = int(filas_inicio[pos])
+        
+        # Primera celda de la fila que es título
+        col = int(np.argmax(mascaras['titulo'][i]))
+        titulo = str(valores[i, col]).strip()
+        
+        # Buscar fila de encabezado (siguiente fila no vacía) en las próximas filas
+        limite = min(i + 10, nrows)
+        ventana = slice(i + 1, limite)
+        header_idx = None
+        
+        # Un encabezado suele tener palabras como "período", "mes", "año", etc.
+        candidatos = np.flatnonzero(~fila_vacia[ventana] & fila_encabezado[ventana])
+        if len(candidatos):
+            header_idx = i + 1 + int(candidatos[0])
+        else:
+            # Si no encontramos encabezado explícito, usar la siguiente fila no vacía
+            no_vacias = np.flatnonzero(~fila_vacia[ventana])
+            j = i + 1 + int(no_vacias[0]) if len(no_vacias) else max(limite, i + 1)
+            if j < nrows:
+                header_idx = j
+        
+        if header_idx is not None:
+            # Fin del bloque: próximo título o 3+ filas vacías consecutivas
+            fin_bloque = nrows
+            
+            pos_t = np.searchsorted(filas_titulo, header_idx + 1)
+            prox_titulo = int(filas_titulo[pos_t]) if pos_t < len(filas_titulo) else None
+            
+            pos_v = np.searchsorted(inicios_vacias, header_idx + 1)
+            prox_vacias = int(inicios_vacias[pos_v]) if pos_v < len(inicios_vacias) else None
+            
+            if prox_titulo is not None and (prox_vacias is None or prox_titulo <= prox_vacias + 2):
+                fin_bloque = prox_titulo
+            elif prox_vacias is not None:
+                fin_bloque = prox_vacias
+            
+            # Agregar bloque si tiene datos
+            if fin_bloque > header_idx + 1:
+                bloques.append({
+                    'titulo': titulo,
+                    'fila_titulo': i,
+                    'fila_header': header_idx,
+                    'fila_inicio_datos': header_idx + 1,
+                    'fila_fin_datos': fin_bloque
+                })
+                i = fin_bloque
+                continue
+        
+        i += 1
+    
+    return bloques
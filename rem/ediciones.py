@@ -0,0 +1,64 @@
+"""
+Ediciones del REM: nombres de archivo del BCRA ↔ 'YYYY-MM'.
+"""
+from pathlib import Path
+import re
+
+# Meses en los nombres de archivo del BCRA
+MESES = {
+    "ene": 1, "feb": 2, "mar": 3, "abr": 4,
+    "may": 5, "jun": 6, "jul": 7, "ago": 8,
+    "sep": 9, "oct": 10, "nov": 11, "dic": 12
+}
+
+PATRON_ARCHIVO_REM = re.compile(r"^tablas-relevamiento-expectativas-mercado-([a-z]{3})-(\d{4})\.xlsx$")
+PATRON_EDICION = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+def edicion_de_archivo(archivo):
+    """Retorna la edición ('YYYY-MM') según el nombre del archivo, o None."""
+    m = PATRON_ARCHIVO_REM.match(Path(archivo).name.lower())
+    if not m or m.group(1) not in MESES:
+        return None
+    return f"{m.group(2)}-{MESES[m.group(1)]:02d}"
+
+def validar_edicion(edicion):
+    """Verifica que la edición tenga la forma 'YYYY-MM' con un mes válido. Retorna la edición."""
+    if not isinstance(edicion, str) or not PATRON_EDICION.match(edicion):
+        raise ValueError(f"Edición inválida: '{edicion}'. Formato: YYYY-MM (p.ej. 2025-11)")
+    return edicion
+
+def argumento_edicion(texto):
+    """Tipo de argparse para --desde/--hasta: la edición, o un error de uso sin traceback."""
+    import argparse
+    try:
+        return validar_edicion(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def ediciones_en_rango(desde, hasta):
+    """Lista de ediciones 'YYYY-MM' entre desde y hasta (inclusive)."""
+    validar_edicion(desde)
+    validar_edicion(hasta)
+    if desde > hasta:
+        raise ValueError(f"Rango inválido: --desde {desde} es posterior a --hasta {hasta}")
+    anio, mes = map(int, desde.split("-"))
+    ediciones = []
+    while f"{anio:04d}-{mes:02d}" <= hasta:
+        ediciones.append(f"{anio:04d}-{mes:02d}")
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return ediciones
+
+def encontrar_ediciones(directorio, desde=None, hasta=None):
+    """
+    Busca en un directorio todas las ediciones publicadas del REM.
+    Retorna dict edición → archivo, ordenado por edición.
+    """
+    ediciones = {}
+    for archivo in Path(directorio).glob("tablas-relevamiento-expectativas-mercado-*.xlsx"):
+        edicion = edicion_de_archivo(archivo)
+        if edicion is None:
+            continue
+        if (desde and edicion < desde) or (hasta and edicion > hasta):
+            continue
+        ediciones[edicion] = archivo
+    return dict(sorted(ediciones.items()))
@@ -0,0 +1,143 @@
+"""
+Lectura de las hojas del Excel con motores intercambiables.
+
+Cada motor recibe el origen (ruta, bytes o archivo abierto) y las hojas a
+leer, y retorna (nombres_de_hojas, iterador de (hoja, df)).
+pandas y los lectores de Excel se importan recién al leer, así elegir un
+motor (o no leer nada porque la salida está en cache) no los carga.
+"""
+from datetime import date, datetime
+import io
+import os
+
+def abrir_origen(origen):
+    """Los bytes se leen desde memoria; rutas y archivos abiertos pasan tal cual."""
+    if isinstance(origen, (bytes, bytearray, memoryview)):
+        return io.BytesIO(origen)
+    return origen
+
+# Hojas del Excel que contienen las tablas
+HOJAS_PROCESAR = ["Cuadros de resultados", "Resultados TOP 10"]
+
+# Strings que pandas interpreta como nulos al leer el Excel
+VALORES_NULOS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+def leer_hojas_pandas(origen, hojas):
+    """
+    Lee las hojas con pandas (openpyxl), construyendo un DataFrame por hoja.
+    Retorna (nombres_de_hojas, iterador de (hoja, df)).
+    """
+    import pandas as pd
+    
+    xls = pd.ExcelFile(abrir_origen(origen), engine="openpyxl")
+    
+    def _iterar():
+        for hoja in hojas:
+            if hoja in xls.sheet_names:
+                yield hoja, xls.parse(hoja, header=None)
+    
+    return xls.sheet_names, _iterar()
+
+def hoja_desde_filas(filas):
+    """
+    Arma la hoja a partir de un iterador de filas (tuplas de valores),
+    con el mismo recorte que pandas: sin celdas vacías al final de cada
+    fila ni filas vacías al final de la hoja.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    matriz = []
+    ancho = 0
+    ultima_no_vacia = 0
+    
+    for fila in filas:
+        fila = [None if isinstance(v, str) and v in VALORES_NULOS else v for v in fila]
+        while fila and fila[-1] is None:
+            fila.pop()
+        matriz.append(fila)
+        if fila:
+            ancho = max(ancho, len(fila))
+            ultima_no_vacia = len(matriz)
+    
+    valores = np.full((ultima_no_vacia, ancho), None, dtype=object)
+    for i, fila in enumerate(matriz[:ultima_no_vacia]):
+        valores[i, :len(fila)] = fila
+    
+    return pd.DataFrame(valores)
+
+def leer_hojas_streaming(origen, hojas):
+    """
+    Lee solo las hojas pedidas en modo read-only, iterando sus filas sin
+    cargar el libro completo en memoria ni convertir celda por celda con pandas.
+    Retorna (nombres_de_hojas, iterador de (hoja, df)).
+    """
+    from openpyxl import load_workbook
+    
+    wb = load_workbook(abrir_origen(origen), read_only=True, data_only=True, keep_links=False)
+    
+    def _iterar():
+        try:
+            for hoja in hojas:
+                if hoja in wb.sheetnames:
+                    yield hoja, hoja_desde_filas(wb[hoja].iter_rows(values_only=True))
+        finally:
+            wb.close()
+    
+    return wb.sheetnames, _iterar()
+
+def _valor_calamine(valor):
+    """Lleva un valor de calamine a lo que entrega openpyxl."""
+    if valor == "":
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if type(valor) is date:
+        return datetime(valor.year, valor.month, valor.day)
+    return valor
+
+def leer_hojas_calamine(origen, hojas):
+    """
+    Lee las hojas con calamine (lector en Rust, mucho más rápido que openpyxl).
+    Requiere: pip install python-calamine
+    Retorna (nombres_de_hojas, iterador de (hoja, df)).
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        raise ImportError("El motor 'calamine' requiere: pip install python-calamine")
+    
+    origen = abrir_origen(origen)
+    if hasattr(origen, 'read'):
+        wb = CalamineWorkbook.from_filelike(origen)
+    else:
+        wb = CalamineWorkbook.from_path(str(origen))
+    
+    def _iterar():
+        try:
+            for hoja in hojas:
+                if hoja in wb.sheet_names:
+                    filas = wb.get_sheet_by_name(hoja).to_python(skip_empty_area=False)
+                    yield hoja, hoja_desde_filas([_valor_calamine(v) for v in fila] for fila in filas)
+        finally:
+            wb.close()
+    
+    return wb.sheet_names, _iterar()
+
+# Motores de lectura disponibles: nombre → función (origen, hojas)
+MOTORES = {
+    "openpyxl": leer_hojas_pandas,
+    "streaming": leer_hojas_streaming,
+    "calamine": leer_hojas_calamine,
+}
+
+# Motor por defecto (se puede cambiar con la variable de entorno REM_MOTOR)
+MOTOR_POR_DEFECTO = os.environ.get("REM_MOTOR", "openpyxl")
+
+def validar_motor(motor):
+    """Verifica que el motor de lectura exista."""
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: '{motor}'. Opciones: {', '.join(MOTORES)}")
@@ -0,0 +1,377 @@
+"""
+Normalización de bloques: nombres de columna, períodos y números.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+import re
+
+import numpy as np
+import pandas as pd
+
+def limpiar_nombre_columna(s) -> str:
+    """Limpia y normaliza nombres de columnas."""
+    if pd.isna(s) or s is None:
+        return "col"
+    
+    s = str(s).strip()
+    if not s or s.lower() in ["nan", "none", ""]:
+        return "col"
+    
+    # Remover caracteres especiales y normalizar
+    s = s.replace("%", "pct")
+    s = re.sub(r'[^\w\s-]', '', s)
+    s = re.sub(r'\s+', '_', s)
+    s = re.sub(r'_+', '_', s)
+    s = s.strip('_').lower()
+    
+    return s if s else "col"
+
+def normalizar_bloque(df, bloque):
+    """
+    Normaliza un bloque de datos extraído.
+    """
+    header_idx = bloque['fila_header']
+    inicio = bloque['fila_inicio_datos']
+    fin = bloque['fila_fin_datos']
+    
+    # Extraer encabezado
+    header = df.iloc[header_idx].tolist()
+    
+    # Limpiar nombres de columnas
+    columnas_limpias = []
+    contador = {}
+    
+    for col in header:
+        nombre_limpio = limpiar_nombre_columna(col)
+        
+        # Evitar duplicados agregando sufijo numérico
+        if nombre_limpio in contador:
+            contador[nombre_limpio] += 1
+            nombre_limpio = f"{nombre_limpio}_{contador[nombre_limpio]}"
+        else:
+            contador[nombre_limpio] = 0
+        
+        columnas_limpias.append(nombre_limpio)
+    
+    # Extraer datos
+    df_datos = df.iloc[inicio:fin].copy()
+    df_datos.columns = columnas_limpias[:len(df_datos.columns)]
+    
+    # Resetear índice
+    df_datos = df_datos.reset_index(drop=True)
+    
+    # Eliminar filas completamente vacías
+    df_datos = df_datos.dropna(how='all')
+    
+    # Eliminar columnas completamente vacías
+    df_datos = df_datos.dropna(axis=1, how='all')
+    
+    # Identificar columna de período/fecha
+    columna_periodo = None
+    for col in df_datos.columns:
+        if 'period' in col or 'período' in col or 'per_od' in col or 'fecha' in col or 'mes' in col or 'trimestre' in col:
+            columna_periodo = col
+            break
+    
+    # Convertir columna de período y agregar al lado su tipo y su etiqueta original
+    columna_tipo = columna_etiqueta = None
+    if columna_periodo:
+        periodos, tipos = convertir_columna_periodo(df_datos[columna_periodo])
+        etiquetas = etiquetas_periodo(df_datos[columna_periodo], periodos)
+        
+        # Filtrar filas de notas ("Fuente: ...") que se colaron en los datos
+        es_nota = (tipos == 'nota').to_numpy()
+        df_datos = df_datos[~es_nota]
+        
+        columna_tipo = f"{columna_periodo}_tipo"
+        columna_etiqueta = f"{columna_periodo}_etiqueta"
+        df_datos[columna_periodo] = periodos[~es_nota]
+        posicion = df_datos.columns.get_loc(columna_periodo)
+        df_datos.insert(posicion + 1, columna_tipo, tipos[~es_nota])
+        df_datos.insert(posicion + 2, columna_etiqueta, etiquetas[~es_nota])
+    
+    # Convertir las columnas numéricas: todo el bloque en una sola pasada
+    columnas_datos = [col for col in df_datos.columns if col not in (columna_periodo, columna_tipo, columna_etiqueta)]
+    if columnas_datos:
+        convertidas = convertir_bloque_numerico(df_datos[columnas_datos])
+        df_datos = df_datos.assign(**{col: convertidas[col] for col in columnas_datos})
+    
+    return df_datos
+
+# Formatos de fecha que puede tener la columna de período como texto. Se
+# infiere uno por columna y se convierte toda la columna de una vez; los
+# textos que no respetan ese formato prueban los demás y, si ninguno sirve,
+# pd.to_datetime (p.ej. "2025-10-31 00:00:00").
+FORMATOS_FECHA = [
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%Y',
+    '%Y/%m',
+    '%Y-%m',
+]
+
+# Textos distintos que se recuerdan ya interpretados: alcanza para las
+# etiquetas y valores de varias ediciones sin crecer sin límite cuando el
+# paquete se reusa en un proceso largo
+TAMANIO_CACHE_TEXTOS = 4096
+
+_NUMEROS_ROMANOS = {'i': 1, 'ii': 2, 'iii': 3, 'iv': 4}
+
+def _anio_completo(texto):
+    """Convierte '25' o '2025' a 2025."""
+    anio = int(texto)
+    return anio + 2000 if anio < 100 else anio
+
+# Etiquetas especiales de período: (patrón, tipo, conversión a período)
+PATRONES_PERIODO = [
+    # "Trim. III-25", "Trim III-2025" → inicio del trimestre
+    (re.compile(r'^trim\.?\s*(iv|i{1,3})\s*[-/]\s*(\d{2}|\d{4})$', re.IGNORECASE), 'trimestre',
+     lambda m: date(_anio_completo(m.group(2)), 3 * _NUMEROS_ROMANOS[m.group(1).lower()] - 2, 1).isoformat()),
+    # "2026" → inicio del año
+    (re.compile(r'^(\d{4})$'), 'año',
+     lambda m: date(int(m.group(1)), 1, 1).isoformat()),
+    # "próx. 12 meses" → se conserva la etiqueta
+    (re.compile(r'^pr[oó]x\.?\s*\d+\s*mes(es)?$', re.IGNORECASE), 'relativo',
+     lambda m: m.group(0)),
+    # "Fuente: BCRA", "Nota: ..." → no son datos
+    (re.compile(r'^(fuente|nota)\b', re.IGNORECASE), 'nota',
+     lambda m: m.string),
+]
+
+# Textos que pd.to_datetime puede interpretar como fecha ("2025-10-31 00:00:00")
+_PARECE_FECHA = re.compile(r'\d+[-/.]\d+')
+
+def _fecha_de_texto(texto):
+    """Fecha ISO de un texto según FORMATOS_FECHA o pd.to_datetime; None si no es fecha."""
+    for fmt in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    if _PARECE_FECHA.search(texto):
+        fecha = pd.to_datetime(texto, errors='coerce')
+        if pd.notna(fecha):
+            return fecha.strftime('%Y-%m-%d')
+    return None
+
+def inferir_formato_fecha(textos, muestras=5):
+    """
+    Primer formato de FORMATOS_FECHA que interpreta alguno de los primeros
+    `muestras` textos con forma de fecha de la columna, o None.
+    """
+    candidatos = [texto for texto in textos if _PARECE_FECHA.search(texto)][:muestras]
+    for texto in candidatos:
+        for fmt in FORMATOS_FECHA:
+            try:
+                datetime.strptime(texto, fmt)
+                return fmt
+            except ValueError:
+                continue
+    return None
+
+@lru_cache(maxsize=TAMANIO_CACHE_TEXTOS)
+def interpretar_etiqueta_periodo(texto):
+    """
+    Interpreta una etiqueta de período (memoizado: las mismas etiquetas
+    se repiten en cada bloque y en cada edición).
+    Retorna tupla (periodo, tipo).
+    """
+    texto = texto.strip()
+    for patron, tipo, convertir in PATRONES_PERIODO:
+        m = patron.match(texto)
+        if m:
+            return convertir(m), tipo
+    fecha = _fecha_de_texto(texto)
+    if fecha:
+        return fecha, 'fecha'
+    return texto, 'texto'
+
+def interpretar_periodo(valor):
+    """
+    Interpreta un valor de la columna de período.
+    Retorna tupla (periodo, tipo); (None, None) para valores nulos.
+    """
+    if isinstance(valor, str):
+        return interpretar_etiqueta_periodo(valor)
+    # Antes que las fechas: pd.NaT es subclase de datetime
+    if valor is None or pd.isna(valor):
+        return None, None
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime('%Y-%m-%d'), 'fecha'
+    if isinstance(valor, np.datetime64):
+        return pd.Timestamp(valor).strftime('%Y-%m-%d'), 'fecha'
+    # Años como número (2026 o 2026.0)
+    if isinstance(valor, (int, float, np.number)) and not isinstance(valor, (bool, np.bool_)):
+        if valor % 1 == 0 and 1900 <= valor <= 2100:
+            return f"{int(valor):04d}-01-01", 'año'
+    # Cualquier otro valor no nulo se conserva como texto
+    return str(valor).strip(), 'texto'
+
+def convertir_columna_periodo(serie):
+    """
+    Convierte la columna de período completa. Las fechas como texto se
+    convierten de una vez con el formato inferido para la columna
+    (inferir_formato_fecha); el resto de los valores, uno por uno (cada
+    texto distinto se interpreta una sola vez, ver interpretar_etiqueta_periodo).
+    Retorna (periodos, tipos):
+      - periodos: fecha ISO (YYYY-MM-DD) para fechas, trimestres y años;
+        la etiqueta original para períodos relativos o textos.
+      - tipos: 'fecha', 'trimestre', 'año', 'relativo', 'nota', 'texto'
+        o None para valores nulos.
+    """
+    valores = serie.to_numpy(dtype=object)
+    periodos = [None] * len(valores)
+    tipos = [None] * len(valores)
+    
+    es_texto = [isinstance(valor, str) for valor in valores]
+    textos = {i: valor.strip() for i, valor in enumerate(valores) if es_texto[i]}
+    
+    # Fechas como texto: un formato por columna y una sola conversión
+    fmt = inferir_formato_fecha(dict.fromkeys(textos.values()))
+    if fmt:
+        indices = list(textos)
+        fechas = pd.to_datetime([textos[i] for i in indices], format=fmt, errors='coerce')
+        # Ningún formato de FORMATOS_FECHA coincide con una etiqueta especial
+        for i, fecha in zip(indices, np.datetime_as_string(fechas.to_numpy(), unit='D')):
+            if fecha != 'NaT':
+                periodos[i], tipos[i] = fecha, 'fecha'
+                del textos[i]
+    
+    for i, valor in enumerate(valores):
+        if es_texto[i] and i not in textos:
+            continue
+        periodos[i], tipos[i] = interpretar_periodo(textos.get(i, valor))
+    
+    return (pd.Series(periodos, index=serie.index, dtype=object),
+            pd.Series(tipos, index=serie.index, dtype=object))
+
+def _etiqueta_periodo(valor, periodo):
+    """Lo que muestra la celda: el texto, el año sin decimales o, para fechas, el período."""
+    if isinstance(valor, str):
+        return valor.strip()
+    if isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool) and float(valor).is_integer():
+        return str(int(valor))
+    return periodo
+
+def etiquetas_periodo(serie, periodos):
+    """
+    Etiqueta original de cada período, tal como figura en el Excel
+    ("Trim. IV-25", "próx. 12 meses", "2026"), para conservarla junto al
+    período convertido.
+    """
+    return pd.Series(
+        [_etiqueta_periodo(valor, periodo) for valor, periodo in zip(serie, periodos)],
+        index=serie.index, dtype=object,
+    )
+
+@lru_cache(maxsize=TAMANIO_CACHE_TEXTOS)
+def interpretar_numero(texto):
+    """
+    Convierte un texto a número sin %, $ ni espacios y con coma decimal
+    (memoizado: los mismos textos se repiten en cada bloque).
+    Retorna float (NaN para "nan") o el texto sin espacios alrededor si
+    no es numérico.
+    """
+    limpio = texto.strip()
+    numero = limpio.replace('%', '').replace('$', '').replace(',', '.')
+    numero = numero.replace(' ', '').replace('\xa0', '')
+    if numero:
+        try:
+            return float(numero)
+        except ValueError:
+            pass
+    return limpio
+
+def _a_numero(valor):
+    """Número (NaN si es nulo) o texto no numérico de una celda."""
+    if isinstance(valor, str):
+        return interpretar_numero(valor)
+    if isinstance(valor, (int, float, np.number)):
+        return float(valor)
+    if valor is None or pd.isna(valor):
+        return np.nan
+    return interpretar_numero(str(valor))
+
+def convertir_bloque_numerico(df):
+    """
+    Convierte a número todas las columnas de un bloque en una sola pasada:
+    aplana los valores, convierte cada celda (los textos se interpretan una
+    sola vez cada uno) y vuelve a armar las columnas. No usa pd.to_numeric
+    por columna: con los textos repetidos del REM, la pasada memoizada es
+    más rápida en bloques de 10 filas y también de 1000.
+    Retorna un DataFrame con las mismas columnas e índice: float64 las que
+    solo tienen números o nulos; object (floats, None y los textos) las que
+    conservan textos no numéricos (ej: "próx. 12 meses").
+    """
+    if all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in df.dtypes):
+        return df.astype('float64')
+    
+    # Orden por columnas: cada columna queda contigua en el arreglo plano
+    filas = len(df)
+    planos = [_a_numero(valor) for valor in df.to_numpy(dtype=object).ravel(order='F')]
+    
+    columnas = {}
+    for i, col in enumerate(df.columns):
+        valores = planos[i * filas:(i + 1) * filas]
+        if all(type(valor) is float for valor in valores):
+            columnas[col] = np.array(valores, dtype='float64')
+        else:
+            columnas[col] = np.array(
+                [None if type(valor) is float and valor != valor else valor for valor in valores],
+                dtype=object
+            )
+    return pd.DataFrame(columnas, index=df.index, columns=df.columns)
+
+def bloque_a_registros(df):
+    """Convierte un bloque normalizado a lista de registros (NaN → None)."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+def generar_clave_bloque(titulo, hoja, usado=None):
+    """Genera una clave única para un bloque basada en su título y hoja."""
+    if usado is None:
+        usado = set()
+    
+    titulo_lower = titulo.lower()
+    
+    # Determinar sufijo por hoja
+    sufijo_hoja = "_top10" if "top" in hoja.lower() else ""
+    
+    # Mapeo de títulos a claves
+    if 'ipc nivel general' in titulo_lower or ('nivel general' in titulo_lower and 'ipc' in titulo_lower):
+        clave_base = 'ipc_general'
+    elif 'ipc núcleo' in titulo_lower or 'ipc nucleo' in titulo_lower or ('núcleo' in titulo_lower and 'ipc' in titulo_lower):
+        clave_base = 'ipc_nucleo'
+    elif 'tamar' in titulo_lower or 'tasa de interés' in titulo_lower or 'tasa de interes' in titulo_lower:
+        clave_base = 'tasa_interes'
+    elif 'tipo de cambio' in titulo_lower:
+        clave_base = 'tipo_cambio'
+    elif 'exportaciones' in titulo_lower:
+        clave_base = 'exportaciones'
+    elif 'importaciones' in titulo_lower:
+        clave_base = 'importaciones'
+    elif 'resultado primario' in titulo_lower or 'spnf' in titulo_lower:
+        clave_base = 'resultado_primario'
+    elif 'desocupación' in titulo_lower or 'desocupacion' in titulo_lower:
+        clave_base = 'desocupacion'
+    elif 'pib' in titulo_lower or 'producto bruto' in titulo_lower:
+        clave_base = 'pbi'
+    else:
+        # Generar clave genérica
+        clave_base = re.sub(r'[^\w\s]', '', titulo_lower)
+        clave_base = re.sub(r'\s+', '_', clave_base)
+        clave_base = clave_base[:30]
+    
+    # Combinar con sufijo de hoja
+    clave = f"{clave_base}{sufijo_hoja}"
+    
+    # Evitar duplicados
+    if clave not in usado:
+        usado.add(clave)
+        return clave
+    
+    contador = 2
+    while f"{clave}_{contador}" in usado:
+        contador += 1
+    clave_final = f"{clave}_{contador}"
+    usado.add(clave_final)
+    return clave_final
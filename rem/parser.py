@@ -0,0 +1,209 @@
+"""
+Pipeline de parseo en memoria: libro XLSX → dict clave → bloque.
+
+Un bloque es el dict que se publica como rem_{clave}.json:
+    {'titulo', 'hoja', 'clave', 'filas', 'columnas', 'datos'}
+donde 'datos' es la lista de registros (columna → valor, None si falta).
+"""
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+
+from .cache import hash_archivo, leer_cache, guardar_cache
+from .deteccion import detectar_bloques_mejorado
+from .lectura import HOJAS_PROCESAR, MOTORES, MOTOR_POR_DEFECTO, validar_motor
+from .normalizacion import normalizar_bloque, bloque_a_registros, generar_clave_bloque
+
+def procesar_hoja(nombre_hoja, df):
+    """
+    Detecta y normaliza los bloques de una hoja.
+    Retorna lista de tuplas (titulo, columnas, registros).
+    """
+    print(f"\n{'='*60}")
+    print(f"📊 Procesando hoja: {nombre_hoja}")
+    print(f"{'='*60}")
+    
+    print(f"   Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
+    
+    # Detectar bloques
+    print("\n🔍 Detectando bloques...")
+    bloques = detectar_bloques_mejorado(df)
+    print(f"   Encontrados: {len(bloques)} bloques")
+    
+    if not bloques:
+        print("⚠️  No se detectaron bloques en esta hoja")
+        return []
+    
+    # Procesar bloques
+    print("\n⚙️  Procesando bloques...")
+    
+    normalizados = []
+    for idx, bloque in enumerate(bloques, 1):
+        titulo = bloque['titulo']
+        print(f"\n   [{idx}/{len(bloques)}] {titulo}")
+        
+        try:
+            # Normalizar bloque
+            df_normalizado = normalizar_bloque(df, bloque)
+            normalizados.append((titulo, df_normalizado.columns.tolist(), bloque_a_registros(df_normalizado)))
+            
+            print(f"      ✓ {len(df_normalizado)} filas, {len(df_normalizado.columns)} columnas")
+            
+        except Exception as e:
+            print(f"      ❌ Error procesando bloque: {e}")
+            import traceback
+            traceback.print_exc()
+            continue
+    
+    return normalizados
+
+def armar_resultado(hojas_procesadas):
+    """
+    Arma el dict clave → entrada a partir de las hojas ya procesadas.
+    hojas_procesadas: lista de (nombre_hoja, [(titulo, columnas, registros)])
+    en el orden de HOJAS_PROCESAR, así los sufijos de generar_clave_bloque
+    no dependen del orden en que terminan los procesos.
+    """
+    resultado = {}
+    claves_usadas = set()
+    
+    for nombre_hoja, normalizados in hojas_procesadas:
+        for titulo, columnas, registros in normalizados:
+            # Generar clave
+            clave = generar_clave_bloque(titulo, nombre_hoja, claves_usadas)
+            
+            # Crear entrada
+            resultado[clave] = {
+                'titulo': titulo,
+                'hoja': nombre_hoja,
+                'clave': clave,
+                'filas': len(registros),
+                'columnas': columnas,
+                'datos': registros
+            }
+    
+    return resultado
+
+def avisar_hojas_faltantes(nombres_hojas):
+    """Muestra las hojas encontradas y advierte las que faltan."""
+    print(f"   Hojas encontradas: {nombres_hojas}")
+    
+    for hoja in HOJAS_PROCESAR:
+        if hoja not in nombres_hojas:
+            print(f"⚠️  Advertencia: No existe hoja '{hoja}'")
+
+def _procesar_hojas(origen, motor):
+    """Lee el libro una vez y procesa sus hojas en este proceso."""
+    nombres_hojas, hojas = MOTORES[motor](origen, HOJAS_PROCESAR)
+    avisar_hojas_faltantes(nombres_hojas)
+    return nombres_hojas, [(nombre_hoja, procesar_hoja(nombre_hoja, df)) for nombre_hoja, df in hojas]
+
+def _procesar_hoja_aislada(origen, hoja, motor):
+    """
+    Tarea del pool de procesos: lee y procesa una sola hoja.
+    Retorna (nombres_de_hojas, [(titulo, columnas, registros)], log) para
+    que el proceso principal muestre el log en orden.
+    """
+    log = io.StringIO()
+    normalizados = []
+    
+    with contextlib.redirect_stdout(log):
+        nombres_hojas, hojas = MOTORES[motor](origen, [hoja])
+        for nombre_hoja, df in hojas:
+            normalizados = procesar_hoja(nombre_hoja, df)
+    
+    return nombres_hojas, normalizados, log.getvalue()
+
+def _enviar_hojas(pool, origen, motor):
+    """Encola una tarea por hoja de HOJAS_PROCESAR."""
+    return [pool.submit(_procesar_hoja_aislada, origen, hoja, motor) for hoja in HOJAS_PROCESAR]
+
+def _unir_hojas(tareas):
+    """
+    Une los resultados de _enviar_hojas en orden fijo de hojas, sin importar
+    cuál terminó primero, y muestra el log de cada una.
+    Retorna (nombres_de_hojas, hojas_procesadas).
+    """
+    hojas_procesadas = []
+    
+    for i, (hoja, tarea) in enumerate(zip(HOJAS_PROCESAR, tareas)):
+        nombres_hojas, normalizados, log = tarea.result()
+        if i == 0:
+            avisar_hojas_faltantes(nombres_hojas)
+        print(log, end="")
+        if hoja in nombres_hojas:
+            hojas_procesadas.append((hoja, normalizados))
+    
+    return nombres_hojas, hojas_procesadas
+
+def parsear_libro(origen, motor=MOTOR_POR_DEFECTO, workers=1):
+    """
+    Parsea un libro REM sin tocar el disco (más allá de leer `origen` si es
+    una ruta). `origen` puede ser una ruta, los bytes del XLSX o un archivo
+    abierto en modo binario. Con workers > 1 cada hoja se procesa en un
+    proceso distinto.
+    Retorna dict clave → bloque.
+    """
+    validar_motor(motor)
+    
+    if workers <= 1:
+        _, hojas_procesadas = _procesar_hojas(origen, motor)
+        return armar_resultado(hojas_procesadas)
+    
+    # Los procesos reciben rutas o bytes (un archivo abierto no se puede enviar)
+    if hasattr(origen, 'read'):
+        origen = origen.read()
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        _, hojas_procesadas = _unir_hojas(_enviar_hojas(pool, origen, motor))
+    
+    return armar_resultado(hojas_procesadas)
+
+def parsear_archivos(archivos, motor=MOTOR_POR_DEFECTO, workers=None, cache_dir=None):
+    """
+    Procesa varios archivos REM repartiendo cada (archivo, hoja) en un
+    ProcessPoolExecutor. workers=None usa todos los núcleos; workers=1
+    procesa todo en este proceso.
+    Con cache_dir, los archivos ya parseados (mismo SHA-256 y misma
+    PARSER_VERSION) se cargan del cache sin leer el Excel, y los nuevos se
+    guardan ahí.
+    Retorna dict archivo → resultado, en el mismo orden que `archivos`.
+    """
+    validar_motor(motor)
+    
+    procesadas = {}
+    hashes = {}
+    pendientes = []
+    
+    for archivo in archivos:
+        en_cache = None
+        if cache_dir:
+            hashes[archivo] = hash_archivo(archivo)
+            en_cache = leer_cache(cache_dir, hashes[archivo])
+        if en_cache:
+            print(f"♻️  {Path(archivo).name}: sin cambios, cargado desde cache")
+            procesadas[archivo] = en_cache[1]
+        else:
+            pendientes.append(archivo)
+    
+    def _guardar(archivo, nombres_hojas, hojas_procesadas):
+        procesadas[archivo] = hojas_procesadas
+        if cache_dir:
+            guardar_cache(cache_dir, hashes[archivo], archivo, nombres_hojas, hojas_procesadas)
+    
+    if workers is not None and workers <= 1:
+        for archivo in pendientes:
+            if len(archivos) > 1:
+                print(f"\n📄 Archivo: {Path(archivo).name}")
+            _guardar(archivo, *_procesar_hojas(archivo, motor))
+    elif pendientes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tareas = {archivo: _enviar_hojas(pool, archivo, motor) for archivo in pendientes}
+            
+            for archivo in pendientes:
+                if len(archivos) > 1:
+                    print(f"\n📄 Archivo: {Path(archivo).name}")
+                _guardar(archivo, *_unir_hojas(tareas[archivo]))
+    
+    return {archivo: armar_resultado(procesadas[archivo]) for archivo in archivos}
@@ -0,0 +1,58 @@
+"""
+Publicación inmutable en R2: cada archivo se sube una sola vez a una clave
+derivada de su contenido (data/objetos/{sha256}.json[.gz|.br]) con cache de
+un año, y cada edición es un índice nombre → clave, también inmutable. Lo
+único que cambia son dos punteros chicos: data/YYYY/MM/_edicion.json y
+data/latest.json, que se escriben al final de la publicación.
+"""
+from pathlib import Path
+import hashlib
+import json
+
+from .cache import hash_archivo
+
+PREFIJO_OBJETOS = "data/objetos/"
+PUNTERO_LATEST = "data/latest.json"
+
+# Cache-Control de objetos inmutables, de lo que se reescribe (metadata) y de los punteros
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_MUTABLE = "public, max-age=300"
+CACHE_PUNTERO = "no-cache"
+
+def prefijo_edicion(periodo):
+    """'2025-11' → 'data/2025/11/'."""
+    year, month = periodo.split("-")
+    return f"data/{year}/{month}/"
+
+def puntero_edicion(periodo):
+    """Puntero de una edición: data/YYYY/MM/_edicion.json."""
+    return f"{prefijo_edicion(periodo)}_edicion.json"
+
+def clave_objeto(nombre, sha):
+    """Clave inmutable de un archivo: su SHA-256 con las extensiones del nombre."""
+    return f"{PREFIJO_OBJETOS}{sha}{''.join(Path(nombre).suffixes)}"
+
+def planificar_objetos(archivos):
+    """Retorna {nombre: (archivo, clave_objeto)} de los archivos a publicar."""
+    return {Path(a).name: (Path(a), clave_objeto(Path(a).name, hash_archivo(a))) for a in archivos}
+
+def armar_indice(periodo, objetos):
+    """
+    Índice de una edición: {"periodo", "objetos": {nombre: clave}}.
+    Retorna (clave, bytes); la clave sale del contenido, así que un índice
+    idéntico al ya publicado tiene la misma clave.
+    """
+    contenido = json.dumps(
+        {"periodo": periodo, "objetos": dict(sorted(objetos.items()))},
+        ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    return clave_objeto("_index.json", hashlib.sha256(contenido).hexdigest()), contenido
+
+def armar_puntero(periodo, indice, actualizado):
+    """Puntero a la edición publicada: se reemplaza con un único PUT."""
+    return json.dumps({
+        "periodo": periodo,
+        "prefijo": prefijo_edicion(periodo),
+        "indice": indice,
+        "ultima_actualizacion": actualizado,
+    }, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,197 @@
+"""
+Escritura de resultados: JSON (compacto o indentado), versiones
+precomprimidas y Parquet. pandas se importa recién al armar los DataFrame,
+así serializar/ensamblar JSON (p.ej. desde validate_output.py) no lo carga.
+"""
+import gzip
+import json
+
+def serializar(objeto, indentado=False):
+    """JSON en bytes UTF-8: compacto por defecto, con indent=2 si indentado."""
+    if indentado:
+        texto = json.dumps(objeto, ensure_ascii=False, indent=2)
+    else:
+        texto = json.dumps(objeto, ensure_ascii=False, separators=(',', ':'))
+    return texto.encode('utf-8')
+
+def ensamblar_objeto(fragmentos, indentado=False):
+    """
+    Arma el JSON de un objeto {clave: valor} a partir de los valores ya
+    serializados, sin volver a codificarlos. El resultado es idéntico a
+    serializar() del objeto completo.
+    """
+    if not fragmentos:
+        return b"{}"
+    
+    if indentado:
+        miembros = [
+            b"  " + serializar(clave) + b": " + fragmento.replace(b"\n", b"\n  ")
+            for clave, fragmento in fragmentos.items()
+        ]
+        return b"{\n" + b",\n".join(miembros) + b"\n}"
+    
+    miembros = [serializar(clave) + b":" + fragmento for clave, fragmento in fragmentos.items()]
+    return b"{" + b",".join(miembros) + b"}"
+
+def escribir_json(resultado, directorio, indentado=False):
+    """
+    Escribe rem_{clave}.json por bloque y rem_bloques.json. Cada bloque se
+    serializa una sola vez y el maestro se arma con los mismos bytes.
+    Retorna las rutas escritas.
+    """
+    fragmentos = {clave: serializar(entrada, indentado) for clave, entrada in resultado.items()}
+    rutas = []
+    
+    for clave, fragmento in fragmentos.items():
+        ruta = directorio / f"rem_{clave}.json"
+        ruta.write_bytes(fragmento)
+        rutas.append(ruta)
+    
+    ruta = directorio / "rem_bloques.json"
+    ruta.write_bytes(ensamblar_objeto(fragmentos, indentado))
+    rutas.append(ruta)
+    
+    return rutas
+
+def comprimir_archivos(rutas):
+    """
+    Escribe junto a cada archivo su versión .gz y .br a máxima compresión,
+    para que la edge sirva bytes ya comprimidos. Retorna las rutas escritas.
+    Sin el paquete brotli solo se generan los .gz.
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("⚠️  Sin brotli no se generan los .br (pip install brotli)")
+    
+    rutas_comprimidas = []
+    for ruta in rutas:
+        contenido = ruta.read_bytes()
+        
+        # mtime=0: el .gz solo depende del contenido
+        gz = ruta.with_name(ruta.name + ".gz")
+        gz.write_bytes(gzip.compress(contenido, compresslevel=9, mtime=0))
+        rutas_comprimidas.append(gz)
+        
+        if brotli:
+            br = ruta.with_name(ruta.name + ".br")
+            br.write_bytes(brotli.compress(contenido, quality=11))
+            rutas_comprimidas.append(br)
+    
+    return rutas_comprimidas
+
+# Tipos de período que el parser convierte a fecha ISO (columna `periodo`
+# en Parquet; validate_output.py valida esas fechas)
+TIPOS_PERIODO_FECHA = ('fecha', 'trimestre', 'año')
+
+def columnas_periodo(columnas):
+    """Retorna (columna_periodo, columna_tipo) de un bloque, o (None, None)."""
+    for col in columnas:
+        if f"{col}_tipo" in columnas:
+            return col, f"{col}_tipo"
+    return None, None
+
+def bloque_a_dataframe(entrada):
+    """
+    DataFrame tipado de un bloque: columnas de texto como string, el resto
+    como float64 (los valores no numéricos, p.ej. '-', quedan nulos) y el
+    período como fecha cuando su tipo lo permite, con la etiqueta original
+    del Excel al lado.
+    """
+    import pandas as pd
+    
+    columnas = entrada['columnas']
+    df = pd.DataFrame(entrada['datos'], columns=columnas)
+    columna_periodo, columna_tipo = columnas_periodo(columnas)
+    columna_etiqueta = f"{columna_periodo}_etiqueta" if columna_periodo else None
+    
+    for col in columnas:
+        if col in (columna_periodo, columna_tipo, columna_etiqueta):
+            continue
+        valores = df[col].dropna()
+        if len(valores) and valores.map(lambda x: isinstance(x, str)).all():
+            df[col] = df[col].astype("string")
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype("float64")
+    
+    if columna_periodo:
+        periodos = df[columna_periodo].astype("string")
+        es_fecha = df[columna_tipo].isin(TIPOS_PERIODO_FECHA)
+        df[columna_periodo] = pd.to_datetime(periodos.where(es_fecha), format="%Y-%m-%d", errors='coerce')
+        df[columna_tipo] = df[columna_tipo].astype("string")
+        # JSON de un parser anterior, sin la etiqueta: el período como texto
+        etiquetas = df.pop(columna_etiqueta).astype("string") if columna_etiqueta in df else periodos
+        df.insert(df.columns.get_loc(columna_periodo) + 1, columna_etiqueta, etiquetas)
+    
+    return df
+
+def bloques_formato_largo(resultado):
+    """
+    Todos los bloques en una sola tabla larga:
+    clave, titulo, hoja, periodo, periodo_etiqueta, periodo_tipo,
+    <columnas de texto del bloque>, estadistico, valor.
+    """
+    import pandas as pd
+    
+    partes = []
+    for clave, entrada in resultado.items():
+        df = bloque_a_dataframe(entrada)
+        columna_periodo, columna_tipo = columnas_periodo(entrada['columnas'])
+        if columna_periodo:
+            df = df.rename(columns={
+                columna_periodo: 'periodo',
+                f"{columna_periodo}_etiqueta": 'periodo_etiqueta',
+                columna_tipo: 'periodo_tipo',
+            })
+        
+        ids = [col for col in df.columns if df[col].dtype != "float64"]
+        largo = df.melt(id_vars=ids, var_name='estadistico', value_name='valor')
+        largo.insert(0, 'hoja', entrada['hoja'])
+        largo.insert(0, 'titulo', entrada['titulo'])
+        largo.insert(0, 'clave', clave)
+        partes.append(largo)
+    
+    largo = pd.concat(partes, ignore_index=True)
+    for col in largo.columns:
+        if largo[col].dtype == object:
+            largo[col] = largo[col].astype("string")
+    largo['valor'] = largo['valor'].astype("float64")
+    return largo
+
+def guardar_parquet(resultado, directorio):
+    """
+    Escribe un Parquet por bloque (rem_{clave}.parquet) y el consolidado en
+    formato largo (rem_bloques.parquet). Retorna las rutas escritas.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("La salida Parquet requiere: pip install pyarrow")
+    
+    directorio.mkdir(parents=True, exist_ok=True)
+    rutas = []
+    
+    for clave, entrada in resultado.items():
+        ruta = directorio / f"rem_{clave}.parquet"
+        bloque_a_dataframe(entrada).to_parquet(ruta, index=False, compression="zstd")
+        rutas.append(ruta)
+    
+    ruta = directorio / "rem_bloques.parquet"
+    bloques_formato_largo(resultado).to_parquet(ruta, index=False, compression="zstd")
+    rutas.append(ruta)
+    
+    return rutas
+
+def escribir_salidas(resultado, directorio, indentado=False, comprimir=True, parquet=False):
+    """
+    Escribe todas las salidas de un resultado en `directorio`: los JSON,
+    opcionalmente sus .gz/.br y el Parquet (en directorio/parquet).
+    Retorna las rutas escritas.
+    """
+    escritos = escribir_json(resultado, directorio, indentado)
+    if comprimir:
+        escritos += comprimir_archivos(escritos)
+    if parquet:
+        escritos += guardar_parquet(resultado, directorio / "parquet")
+    return escritos
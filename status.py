@@ -8,6 +8,8 @@ Muestra el estado actual del proyecto API REM
 from pathlib import Path
 import json
 
+from rem.ediciones import encontrar_ediciones
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 
@@ -63,9 +65,9 @@ def check_status():
         print(f"  ✅ Archivos JSON individuales: {len(json_files)}")
         print(f"  ✅ Archivos Excel: {len(xlsx_files)}")
         
-        if xlsx_files:
-            latest = max(xlsx_files, key=lambda p: p.stat().st_mtime)
-            print(f"     → Último: {latest.name}")
+        ediciones = encontrar_ediciones(DATA_DIR)
+        if ediciones:
+            print(f"     → Última edición: {list(ediciones.values())[-1].name}")
     else:
         print(f"  ❌ Directorio data/ no existe")
     
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+test_backfill.py
+----------------
+Prueba `read REM.py --backfill` sobre un directorio con varias ediciones
+de prueba (libros generados con la estructura del REM): forma del JSON
+consolidado, filtro por rango y reporte de ediciones faltantes. También
+que sin argumentos se lea la edición más reciente de data/.
+
+Uso:
+    python test_backfill.py
+"""
+
+import contextlib
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from rem.ediciones import MESES, ediciones_en_rango
+from test_motores import BLOQUES_PRUEBA, crear_libro_prueba
+
+BASE_DIR = Path(__file__).resolve().parent
+NOMBRE_MES = {numero: nombre for nombre, numero in MESES.items()}
+
+def cargar_lector(data_dir):
+    """Importa "read REM.py" apuntando su DATA_DIR a data_dir."""
+    loader = importlib.machinery.SourceFileLoader("read_rem", str(BASE_DIR / "read REM.py"))
+    spec = importlib.util.spec_from_loader("read_rem", loader)
+    modulo = importlib.util.module_from_spec(spec)
+    loader.exec_module(modulo)
+    modulo.DATA_DIR = data_dir
+    modulo.CACHE_DIR = data_dir / ".cache"
+    return modulo
+
+def archivo_edicion(directorio, edicion):
+    """Ruta del XLSX de una edición 'YYYY-MM' con el nombre que usa el BCRA."""
+    anio, mes = edicion.split("-")
+    return directorio / f"tablas-relevamiento-expectativas-mercado-{NOMBRE_MES[int(mes)]}-{anio}.xlsx"
+
+def test_backfill():
+    print("=" * 70)
+    print("🧪 PROBANDO BACKFILL HISTÓRICO")
+    print("=" * 70)
+    print()
+
+    tests_passed = 0
+    tests_failed = 0
+
+    def verificar(nombre, condicion):
+        nonlocal tests_passed, tests_failed
+        if condicion:
+            print(f"   ✅ {nombre}")
+            tests_passed += 1
+        else:
+            print(f"   ❌ {nombre}")
+            tests_failed += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        directorio = tmp / "historico"
+        directorio.mkdir()
+        # 2025-10 no está: es la edición faltante del rango
+        ediciones = ["2025-07", "2025-08", "2025-09", "2025-11", "2025-12"]
+        for semilla, edicion in enumerate(ediciones, 1):
+            crear_libro_prueba(archivo_edicion(directorio, edicion), semilla)
+        (directorio / "tablas-relevamiento-expectativas-mercado-xyz-2025.xlsx").write_bytes(b"PK")
+        lector = cargar_lector(tmp / "data")
+        claves = {"ipc_general", "tipo_cambio", "exportaciones", "pbi"}
+        claves |= {clave + "_top10" for clave in claves}
+
+        def backfill(*args, **kwargs):
+            """Corre ejecutar_backfill sin caché. Retorna (histórico, JSON escrito, salida)."""
+            destino = tmp / "historico_rem.json"
+            destino.unlink(missing_ok=True)
+            salida = io.StringIO()
+            with contextlib.redirect_stdout(salida):
+                historico = lector.ejecutar_backfill(directorio, *args, workers=2, salida=destino, cache=False, **kwargs)
+            escrito = json.loads(destino.read_text(encoding="utf-8")) if destino.exists() else None
+            return historico, escrito, salida.getvalue()
+
+        print(f"1️⃣  Todas las ediciones ({len(ediciones)} libros)")
+        historico, escrito, _ = backfill()
+        verificar("una entrada por edición, ordenadas", list(escrito) == ediciones)
+        verificar("{YYYY-MM: {clave: tabla}} con todas las tablas", all(set(tablas) == claves for tablas in escrito.values()))
+        verificar("cada tabla con título, hoja, columnas y datos", all(
+            {"titulo", "hoja", "clave", "filas", "columnas", "datos"} <= set(tabla)
+            and tabla["filas"] == len(tabla["datos"])
+            for tablas in escrito.values() for tabla in tablas.values()
+        ))
+        verificar("tablas del bloque de su edición", [
+            escrito[e]["ipc_general"]["titulo"] for e in ediciones
+        ] == [BLOQUES_PRUEBA[0][0]] * len(ediciones) and len({
+            escrito[e]["ipc_general"]["datos"][0]["mediana"] for e in ediciones
+        }) == len(ediciones))
+        verificar("JSON escrito igual al histórico retornado", escrito == json.loads(json.dumps(historico)))
+        verificar("el XLSX sin mes válido se ignora", len(escrito) == len(ediciones))
+        print()
+
+        print("2️⃣  Rango --desde 2025-08 --hasta 2025-11")
+        _, escrito, salida = backfill("2025-08", "2025-11")
+        verificar("solo las ediciones del rango", list(escrito) == ["2025-08", "2025-09", "2025-11"])
+        verificar("reporta la edición faltante", "Ediciones sin archivo local: 2025-10" in salida)
+        verificar("sugiere descargarla", '"download REM" --desde 2025-08 --hasta 2025-11' in salida)
+        _, escrito, salida = backfill("2025-11")
+        verificar("solo --desde: desde esa edición, sin reporte", list(escrito) == ["2025-11", "2025-12"]
+                  and "sin archivo local" not in salida)
+        print()
+
+        print("3️⃣  Rango sin ediciones locales")
+        historico, escrito, salida = backfill("2024-01", "2024-03")
+        verificar("retorna vacío y no escribe", historico == {} and escrito is None)
+        verificar("reporta las tres faltantes", "2024-01, 2024-02, 2024-03" in salida)
+        print()
+
+        print("4️⃣  Sin argumentos: la edición más reciente, no la última modificada")
+        lector.DATA_DIR = directorio
+        viejo = archivo_edicion(directorio, "2025-07")
+        os.utime(viejo, (viejo.stat().st_atime, viejo.stat().st_mtime + 3600))
+        verificar("elige 2025-12 aunque 2025-07 sea más nuevo en disco",
+                  lector.encontrar_archivo_rem() == archivo_edicion(directorio, "2025-12"))
+        print()
+
+        print("5️⃣  Códigos de salida")
+        with contextlib.redirect_stdout(io.StringIO()):
+            corrupto = lector.main([str(directorio / "tablas-relevamiento-expectativas-mercado-xyz-2025.xlsx"), "--sin-cache"])
+            vacio = lector.main(["--backfill", "--directorio", str(directorio), "--desde", "2024-01", "--hasta", "2024-03",
+                                 "--salida", str(tmp / "vacio.json"), "--sin-cache"])
+        verificar("XLSX ilegible: código 1", corrupto == 1)
+        verificar("backfill sin ediciones: código 1", vacio == 1)
+        print()
+
+        print("6️⃣  Caché de salidas")
+        lector.DATA_DIR = tmp / "salida"
+        lector.DATA_DIR.mkdir()
+        libro = str(archivo_edicion(directorio, "2025-12"))
+
+        def leer(*args):
+            """Corre main() con el libro de 2025-12. Retorna (código, salida)."""
+            salida = io.StringIO()
+            with contextlib.redirect_stdout(salida):
+                codigo = lector.main([libro, "--sin-comprimir", *args])
+            return codigo, salida.getvalue()
+
+        leer()
+        _, salida = leer("--pretty")
+        verificar("--pretty después de compacto: se vuelve a escribir", "Sin cambios" not in salida
+                  and (lector.DATA_DIR / "rem_bloques.json").read_bytes().startswith(b"{\n"))
+        _, salida = leer("--pretty")
+        verificar("--pretty otra vez: sin cambios", "Sin cambios" in salida)
+        _, salida = leer()
+        verificar("compacto después de --pretty: se vuelve a escribir", "Sin cambios" not in salida
+                  and (lector.DATA_DIR / "rem_bloques.json").read_bytes().startswith(b'{"'))
+        codigo, salida = leer("--validar")
+        verificar("sin cambios con --validar: valida los archivos del disco", "Sin cambios" in salida
+                  and "VALIDACIÓN DE DATOS REM" in salida and codigo in (0, 2))
+        print()
+
+        print("7️⃣  --desde/--hasta inválidos")
+
+        def error_de_uso(*args):
+            """Mensaje de argparse si main() rechaza los argumentos, o None."""
+            errores = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(errores):
+                    lector.main(["--backfill", "--directorio", str(directorio), *args])
+            except SystemExit as e:
+                return errores.getvalue() if e.code == 2 else None
+            return None
+
+        verificar("--desde 2025: error de uso, sin traceback", "Formato: YYYY-MM" in (error_de_uso("--desde", "2025") or ""))
+        verificar("--hasta 2025-13: mes inválido", "Edición inválida" in (error_de_uso("--hasta", "2025-13") or ""))
+        verificar("--desde posterior a --hasta", "posterior" in (error_de_uso("--desde", "2025-11", "--hasta", "2025-01") or ""))
+        for desde, hasta in (("2025", "2025-03"), ("2025-01", "2025-3"), ("2025-03", "2025-01")):
+            try:
+                ediciones_en_rango(desde, hasta)
+                verificar(f"ediciones_en_rango({desde!r}, {hasta!r}) rechazado", False)
+            except ValueError:
+                verificar(f"ediciones_en_rango({desde!r}, {hasta!r}) rechazado", True)
+        print()
+
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(test_backfill())
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+test_deploy.py
+--------------
+Prueba deploy_with_wrangler.py con un `wrangler` falso: un script que
+registra cada `r2 object put`, demora un poco y falla a propósito el
+primer intento de algunos objetos (FAKE_FALLAS) o todos (FAKE_SIEMPRE). No toca Cloudflare ni el ./data real.
+
+Uso:
+    python test_deploy.py
+"""
+
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from rem.cache import hash_archivo
+from rem.publicacion import clave_objeto
+
+BASE_DIR = Path(__file__).resolve().parent
+DEMORA = 0.2
+
+WRANGLER_FALSO = """#!{python}
+import json, os, sys, time
+args = sys.argv[1:]
+clave = args[3].split("/", 1)[1]
+inicio = time.time()
+time.sleep(float(os.environ["FAKE_DEMORA"]))
+marca = os.path.join(os.environ["FAKE_DIR"], clave.replace("/", "_") + ".fallo")
+falla = any(f in clave for f in os.environ["FAKE_FALLAS"].split(",") if f) and not os.path.exists(marca)
+falla = falla or any(f in clave for f in os.environ.get("FAKE_SIEMPRE", "").split(",") if f)
+with open(os.path.join(os.environ["FAKE_DIR"], "log.jsonl"), "a") as f:
+    f.write(json.dumps({{"clave": clave, "args": args, "inicio": inicio, "fin": time.time(), "falla": falla}}) + "\\n")
+if falla:
+    open(marca, "w").close()
+    sys.stderr.write("Error: 503 Service Unavailable")
+    sys.exit(1)
+"""
+
+class ServidorS3(BaseHTTPRequestHandler):
+    """
+    S3 mínimo con rutas path-style (/bucket/clave): PUT, PUT con
+    x-amz-copy-source (CopyObject), GET / HEAD de objetos, HEAD del bucket
+    y ListObjectsV2. Guarda los objetos en `objetos` (clave → (bytes,
+    headers)) y registra cada petición en `peticiones` como (método, clave,
+    bytes recibidos).
+    """
+    objetos = {}
+    peticiones = []
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _clave(self):
+        partes = unquote(urlsplit(self.path).path).lstrip("/").split("/", 1)
+        return partes[1] if len(partes) > 1 else ""
+
+    def _enviar(self, status, cuerpo=b"", headers=None):
+        self.send_response(status)
+        for nombre, valor in (headers or {}).items():
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(cuerpo)
+
+    def _leer_cuerpo(self):
+        cuerpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "aws-chunked" not in self.headers.get("Content-Encoding", ""):
+            return cuerpo
+        # aws-chunked: "<tamaño hex>;chunk-signature=...\r\n<datos>\r\n" ... "0\r\n"
+        datos = b""
+        while cuerpo:
+            cabecera, cuerpo = cuerpo.split(b"\r\n", 1)
+            tamanio = int(cabecera.split(b";")[0], 16)
+            if tamanio == 0:
+                break
+            datos, cuerpo = datos + cuerpo[:tamanio], cuerpo[tamanio + 2:]
+        return datos
+
+    def do_PUT(self):
+        clave = self._clave()
+        origen = self.headers.get("x-amz-copy-source")
+        if origen:
+            cuerpo, headers = type(self).objetos[unquote(origen).lstrip("/").split("/", 1)[1]]
+            type(self).peticiones.append(("COPY", clave, 0))
+            type(self).objetos[clave] = (cuerpo, dict(headers))
+            etag = headers["ETag"]
+            xml = f"<CopyObjectResult><ETag>{etag}</ETag><LastModified>2025-01-01T00:00:00.000Z</LastModified></CopyObjectResult>"
+            self._enviar(200, xml.encode(), {"Content-Type": "application/xml"})
+            return
+        cuerpo = self._leer_cuerpo()
+        type(self).peticiones.append(("PUT", clave, len(cuerpo)))
+        headers = {
+            nombre: self.headers[nombre]
+            for nombre in ("Content-Type", "Cache-Control")
+            if self.headers.get(nombre)
+        }
+        encoding = self.headers.get("Content-Encoding", "").replace("aws-chunked", "").strip(", ")
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        headers["ETag"] = '"' + hashlib.md5(cuerpo).hexdigest() + '"'
+        type(self).objetos[clave] = (cuerpo, headers)
+        self._enviar(200, headers={"ETag": headers["ETag"]})
+
+    def do_GET(self):
+        clave = self._clave()
+        if not clave:
+            self._listar()
+            return
+        type(self).peticiones.append(("GET", clave, 0))
+        if clave not in self.objetos:
+            self._enviar(404, b"<Error><Code>NoSuchKey</Code></Error>", {"Content-Type": "application/xml"})
+            return
+        cuerpo, headers = self.objetos[clave]
+        self._enviar(200, cuerpo, headers)
+
+    def do_HEAD(self):
+        clave = self._clave()
+        if not clave:
+            self._enviar(200)
+        elif clave in self.objetos:
+            self._enviar(200, self.objetos[clave][0], self.objetos[clave][1])
+        else:
+            self._enviar(404)
+
+    def _listar(self):
+        prefijo = parse_qs(urlsplit(self.path).query).get("prefix", [""])[0]
+        type(self).peticiones.append(("LIST", prefijo, 0))
+        contenidos = "".join(
+            f"<Contents><Key>{clave}</Key><ETag>{headers['ETag']}</ETag><Size>{len(cuerpo)}</Size>"
+            f"<LastModified>2025-01-01T00:00:00.000Z</LastModified></Contents>"
+            for clave, (cuerpo, headers) in sorted(self.objetos.items()) if clave.startswith(prefijo)
+        )
+        xml = (
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>rem-data</Name><Prefix>{prefijo}</Prefix><IsTruncated>false</IsTruncated>{contenidos}"
+            "</ListBucketResult>"
+        )
+        self._enviar(200, xml.encode(), {"Content-Type": "application/xml"})
+
+def cargar_deploy(data_dir):
+    """Importa deploy_with_wrangler apuntando su DATA_DIR a data_dir."""
+    spec = importlib.util.spec_from_file_location("deploy_wrangler", BASE_DIR / "deploy_with_wrangler.py")
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.DATA_DIR = data_dir
+    modulo.MANIFIESTO_DEPLOY = data_dir / ".cache" / "deploy_r2.json"
+    modulo.ESPERA_REINTENTO = 0
+    return modulo
+
+def cargar_deploy_r2(data_dir, endpoint):
+    """Importa deploy_to_cloudflare apuntando a un S3 local y a data_dir."""
+    os.environ.update({
+        "CF_ENDPOINT_URL": endpoint,
+        "CF_ACCESS_KEY_ID": "prueba",
+        "CF_SECRET_ACCESS_KEY": "prueba",
+        "CF_BUCKET_NAME": "rem-data",
+    })
+    spec = importlib.util.spec_from_file_location("deploy_r2", BASE_DIR / "deploy_to_cloudflare.py")
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.DATA_DIR = data_dir
+    return modulo
+
+def ejecutar_deploy_r2(deploy, *args):
+    """Corre deploy() sin mostrar su salida. Retorna el exit code."""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            deploy.deploy(list(args))
+    except SystemExit as e:
+        return e.code
+    return 0
+
+def max_simultaneos(registros):
+    """Máximo de subidas en curso a la vez según los intervalos registrados."""
+    eventos = sorted([(r["inicio"], 1) for r in registros] + [(r["fin"], -1) for r in registros])
+    en_curso = maximo = 0
+    for _, delta in eventos:
+        en_curso += delta
+        maximo = max(maximo, en_curso)
+    return maximo
+
+def test_deploy():
+    print("=" * 70)
+    print("🧪 PROBANDO DEPLOY CON WRANGLER FALSO")
+    print("=" * 70)
+    print()
+
+    tests_passed = 0
+    tests_failed = 0
+
+    def verificar(nombre, condicion):
+        nonlocal tests_passed, tests_failed
+        if condicion:
+            print(f"   ✅ {nombre}")
+            tests_passed += 1
+        else:
+            print(f"   ❌ {nombre}")
+            tests_failed += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data_dir = tmp / "data"
+        data_dir.mkdir()
+        nombres = [f"rem_tabla_{i:02d}.json" for i in range(10)]
+        for nombre in nombres:
+            (data_dir / nombre).write_text(json.dumps({"tabla": nombre}), encoding="utf-8")
+            (data_dir / (nombre + ".gz")).write_bytes(b"\x1f\x8b" + nombre.encode())
+        # Un XLSX viejo que quedó en data/, más nuevo en disco que el de la edición vigente
+        (data_dir / "tablas-relevamiento-expectativas-mercado-nov-2025.xlsx").write_bytes(b"PK")
+        (data_dir / "tablas-relevamiento-expectativas-mercado-oct-2025.xlsx").write_bytes(b"PK")
+
+        def clave(nombre):
+            """Clave inmutable actual de un archivo de data_dir."""
+            return clave_objeto(nombre, hash_archivo(data_dir / nombre))
+
+        wrangler = tmp / "wrangler"
+        wrangler.write_text(WRANGLER_FALSO.format(python=sys.executable), encoding="utf-8")
+        wrangler.chmod(0o755)
+        log = tmp / "log.jsonl"
+
+        os.environ.update({
+            "CLOUDFLARE_API_TOKEN": os.environ.get("CLOUDFLARE_API_TOKEN", "token"),
+            "CLOUDFLARE_ACCOUNT_ID": os.environ.get("CLOUDFLARE_ACCOUNT_ID", "cuenta"),
+            "WRANGLER": str(wrangler),
+            "FAKE_DIR": str(tmp),
+            "FAKE_DEMORA": str(DEMORA),
+            "FAKE_FALLAS": clave(nombres[3] + ".gz"),
+        })
+        deploy = cargar_deploy(data_dir)
+        verificar("edición del XLSX más reciente, no el primero del glob", deploy.get_publication_period() == "2025-11")
+        periodo = "data/2025/11/"
+        punteros = [f"{periodo}_edicion.json", "data/latest.json"]
+        objetos = {clave(n) for nombre in nombres for n in (nombre, nombre + ".gz")}
+
+        print(f"1️⃣  Deploy de {len(nombres)} tablas (+ .gz) con {deploy.WORKERS_SUBIDA} workers")
+        salida = io.StringIO()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(salida):
+            codigo = deploy.deploy([])
+        duracion = time.perf_counter() - inicio
+        registros = [json.loads(linea) for linea in log.read_text().splitlines()]
+        claves = {r["clave"] for r in registros if not r["falla"]}
+        indice = next(c for c in claves if c.startswith("data/objetos/") and c not in objetos)
+
+        verificar("exit code 0", codigo == 0)
+        verificar("objetos + metadata + índice + 2 punteros",
+                  claves == objetos | {f"{periodo}_metadata.json", indice, *punteros})
+        verificar("objetos inmutables con cache de un año", all(
+            "--cache-control=public, max-age=31536000, immutable" in r["args"]
+            for r in registros if r["clave"] in objetos or r["clave"] == indice
+        ))
+        verificar("punteros sin cache", all(
+            "--cache-control=no-cache" in r["args"] for r in registros if r["clave"] in punteros
+        ))
+        verificar("el fallo se reintentó", sum(r["clave"] == clave(nombres[3] + ".gz") for r in registros) == 2)
+        verificar("Content-Encoding en los .gz", all(
+            "--content-encoding=gzip" in r["args"] for r in registros if r["clave"].endswith(".gz")
+        ))
+        simultaneos = max_simultaneos(registros)
+        verificar(f"subidas en paralelo (máx. {simultaneos})", 1 < simultaneos <= deploy.WORKERS_SUBIDA)
+        # Costo real de un proceso wrangler falso (arranque + demora), medido aparte
+        uno = time.perf_counter()
+        deploy.upload_file_with_wrangler(data_dir / nombres[0], "data/medicion.json")
+        en_serie = len(registros) * (time.perf_counter() - uno)
+        verificar(f"más rápido que en serie ({duracion:.1f}s vs ≥{en_serie:.1f}s)", duracion < en_serie / 2)
+        verificar("resumen con percentiles", "p50" in salida.getvalue() and "archivos/s" in salida.getvalue())
+        orden = [r["clave"] for r in sorted(registros, key=lambda r: r["inicio"]) if not r["falla"]]
+        verificar("punteros al final: edición y después latest", orden[-2:] == punteros)
+        fin_datos = max(r["fin"] for r in registros if r["clave"] not in punteros)
+        verificar("punteros después de todos los objetos", min(r["inicio"] for r in registros if r["clave"] in punteros) >= fin_datos)
+        print()
+
+        def claves_subidas(*args):
+            """Corre deploy() y retorna las claves que recibió el wrangler falso."""
+            log.unlink(missing_ok=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                codigo = deploy.deploy(list(args))
+            registros = [json.loads(linea) for linea in log.read_text().splitlines()] if log.exists() else []
+            return codigo, [r["clave"] for r in registros]
+
+        print("2️⃣  Segunda corrida sin cambios")
+        codigo, claves = claves_subidas()
+        verificar("exit code 0", codigo == 0)
+        verificar("ninguna subida", claves == [])
+        print()
+
+        print("3️⃣  Cambia una tabla: solo se sube su objeto")
+        (data_dir / nombres[5]).write_text(json.dumps({"tabla": "revisada"}), encoding="utf-8")
+        codigo, claves = claves_subidas()
+        nuevo_indice = [c for c in claves if c.startswith("data/objetos/") and c != clave(nombres[5])]
+        verificar("exit code 0", codigo == 0)
+        verificar("objeto + metadata + índice nuevo + punteros", sorted(claves) == sorted(
+            [clave(nombres[5]), f"{periodo}_metadata.json", *nuevo_indice, *punteros]
+        ) and nuevo_indice != [indice])
+        verificar("--forzar sube todo", len(claves_subidas("--forzar")[1]) == len(objetos) + 4)
+        print()
+
+        print("4️⃣  Un objeto que falla siempre")
+        (data_dir / nombres[7]).write_text(json.dumps({"tabla": "corregida"}), encoding="utf-8")
+        os.environ["FAKE_SIEMPRE"] = clave(nombres[7])
+        codigo, claves = claves_subidas()
+        verificar("exit code 1", codigo == 1)
+        verificar(f"{deploy.INTENTOS_SUBIDA} intentos antes de darlo por fallido",
+                  claves.count(clave(nombres[7])) == deploy.INTENTOS_SUBIDA)
+        verificar("con errores no se mueven los punteros", not set(punteros) & set(claves))
+        del os.environ["FAKE_SIEMPRE"]
+        codigo, claves = claves_subidas()
+        verificar("la corrida siguiente sube el fallido y publica", codigo == 0
+                  and clave(nombres[7]) in claves and claves[-2:] == punteros and len(claves) == 5)
+        print()
+
+        print("5️⃣  Edición anterior: no mueve latest")
+        codigo, claves = claves_subidas("--periodo", "2025-10")
+        verificar("exit code 0", codigo == 0)
+        verificar("puntero de 2025-10 escrito, latest no", claves[-1] == "data/2025/10/_edicion.json"
+                  and punteros[1] not in claves)
+        codigo, claves = claves_subidas("--periodo", "2025-10", "--forzar")
+        verificar("ni con --forzar", codigo == 0 and punteros[1] not in claves)
+        print()
+
+    if importlib.util.find_spec("boto3") is None:
+        print("⏭️  deploy_to_cloudflare.py omitido: requiere pip install boto3")
+        print()
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            servidor = ThreadingHTTPServer(("127.0.0.1", 0), ServidorS3)
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            for nombre in ("rem_bloques.json", "rem_tipo_cambio.json"):
+                (tmp / nombre).write_text(json.dumps({"tabla": nombre}), encoding="utf-8")
+                (tmp / (nombre + ".br")).write_bytes(b"br:" + nombre.encode())
+            (tmp / "tablas-relevamiento-expectativas-mercado-nov-2025.xlsx").write_bytes(b"PK")
+            r2 = cargar_deploy_r2(tmp, f"http://127.0.0.1:{servidor.server_port}")
+            locales = sorted(f.name for f in tmp.glob("rem_*.json*"))
+            objetos = {n: clave_objeto(n, hash_archivo(tmp / n)) for n in locales}
+            punteros = ["data/2025/11/_edicion.json", "data/latest.json"]
+
+            print("6️⃣  Deploy boto3 a un S3 local: objetos inmutables y punteros")
+            ServidorS3.objetos, ServidorS3.peticiones = {}, []
+            verificar("exit code 0", ejecutar_deploy_r2(r2) == 0)
+            puts = [clave for metodo, clave, _ in ServidorS3.peticiones if metodo == "PUT"]
+            puntero = json.loads(ServidorS3.objetos["data/latest.json"][0])
+            verificar("un PUT por archivo + metadata, índice y punteros", sorted(puts) == sorted(
+                [*objetos.values(), "data/2025/11/_metadata.json", puntero["indice"], *punteros]
+            ))
+            verificar("punteros al final", puts[-2:] == punteros)
+            verificar("puntero → índice de 2025-11", puntero["periodo"] == "2025-11"
+                      and json.loads(ServidorS3.objetos[puntero["indice"]][0])["objetos"] == objetos)
+            verificar("objetos con Cache-Control immutable", all(
+                ServidorS3.objetos[c][1]["Cache-Control"] == "public, max-age=31536000, immutable"
+                for c in [*objetos.values(), puntero["indice"]]
+            ))
+            verificar("Content-Encoding br conservado",
+                      ServidorS3.objetos[objetos["rem_bloques.json.br"]][1].get("Content-Encoding") == "br")
+            verificar("nada subido a data/latest/", not any(c.startswith("data/latest/") for c in ServidorS3.objetos))
+            print()
+
+            print("7️⃣  Delta contra lo ya publicado")
+            ServidorS3.peticiones = []
+            verificar("exit code 0 sin cambios", ejecutar_deploy_r2(r2) == 0)
+            verificar("ningún PUT", not any(m == "PUT" for m, _, _ in ServidorS3.peticiones))
+            (tmp / "rem_tipo_cambio.json").write_text(json.dumps({"tabla": "revisada"}), encoding="utf-8")
+            ServidorS3.peticiones = []
+            verificar("exit code 0 con una tabla nueva", ejecutar_deploy_r2(r2) == 0)
+            puts = [clave for metodo, clave, _ in ServidorS3.peticiones if metodo == "PUT"]
+            nuevo = clave_objeto("rem_tipo_cambio.json", hash_archivo(tmp / "rem_tipo_cambio.json"))
+            indice = json.loads(ServidorS3.objetos["data/latest.json"][0])["indice"]
+            verificar("solo la tabla, la metadata, el índice y los punteros", puts == [
+                nuevo, "data/2025/11/_metadata.json", indice, *punteros,
+            ])
+            verificar("el objeto anterior sigue intacto", objetos["rem_tipo_cambio.json"] in ServidorS3.objetos)
+            print()
+
+            print("8️⃣  Edición anterior: no mueve latest")
+            ServidorS3.peticiones = []
+            verificar("exit code 0", ejecutar_deploy_r2(r2, "--periodo", "2025-10") == 0)
+            puts = [clave for metodo, clave, _ in ServidorS3.peticiones if metodo == "PUT"]
+            verificar("puntero de 2025-10 escrito", puts[-1] == "data/2025/10/_edicion.json")
+            verificar("latest sigue en 2025-11", json.loads(ServidorS3.objetos["data/latest.json"][0])["periodo"] == "2025-11")
+            print()
+
+            print("9️⃣  --copiar-latest: data/latest/ con CopyObject")
+            ServidorS3.objetos, ServidorS3.peticiones = {}, []
+            verificar("exit code 0", ejecutar_deploy_r2(r2, "--copiar-latest") == 0)
+            copias = [clave for metodo, clave, _ in ServidorS3.peticiones if metodo == "COPY"]
+            verificar("copias del lado del servidor", sorted(copias) == sorted(
+                [f"data/latest/{n}" for n in locales] + ["data/latest/_metadata.json"]
+            ))
+            verificar("sin bytes re-subidos", not any(c.startswith("data/latest/") for m, c, _ in ServidorS3.peticiones if m == "PUT"))
+            indice = json.loads(ServidorS3.objetos["data/latest.json"][0])["indice"]
+            verificar("copias idénticas", all(
+                ServidorS3.objetos[f"data/latest/{n}"][0] == ServidorS3.objetos[c][0]
+                for n, c in json.loads(ServidorS3.objetos[indice][0])["objetos"].items()
+            ))
+            print()
+            servidor.shutdown()
+
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(test_deploy())
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+test_descarga.py
+----------------
+Prueba "download REM" contra un servidor HTTP local que imita a bcra.gob.ar
+(ETag / Last-Modified / 304 / Range) y que puede cortar conexiones a
+propósito, sin tocar la red ni el ./data real.
+
+Uso:
+    python test_descarga.py
+"""
+
+import contextlib
+import hashlib
+import importlib.machinery
+import importlib.util
+import io
+import socket
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import validate_output
+from rem.cache import hash_archivo
+from rem.ediciones import ediciones_en_rango
+
+BASE_DIR = Path(__file__).resolve().parent
+ARCHIVO = "tablas-relevamiento-expectativas-mercado-nov-2025.xlsx"
+
+class ServidorREM(BaseHTTPRequestHandler):
+    """
+    Sirve los archivos de `archivos` (ruta → bytes). Con `validadores`
+    responde ETag / Last-Modified y 304 a los GET condicionales; con
+    `acepta_rango` responde 206 a los pedidos Range. Cada GET consume un
+    valor de `cortes`: la cantidad de bytes del cuerpo a enviar antes de
+    cortar la conexión (None = sin corte). `demora` (segundos) se espera
+    antes de responder cada petición. `fallas` (ruta → n) responde 503 a
+    los primeros n pedidos de esa ruta.
+    Registra cada petición en `peticiones` como (método, ruta, headers), su
+    instante de llegada en `llegadas` y el máximo de peticiones en curso a
+    la vez en `max_en_curso`.
+    """
+    archivos = {}
+    validadores = True
+    acepta_rango = True
+    error = None
+    cortes = []
+    demora = 0
+    fallas = {}
+    peticiones = []
+    llegadas = []
+    en_curso = 0
+    max_en_curso = 0
+    candado = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, con_cuerpo):
+        clase = type(self)
+        with clase.candado:
+            clase.peticiones.append((self.command, self.path, dict(self.headers)))
+            clase.llegadas.append(time.monotonic())
+            clase.en_curso += 1
+            clase.max_en_curso = max(clase.max_en_curso, clase.en_curso)
+        try:
+            self._atender(con_cuerpo)
+        finally:
+            with clase.candado:
+                clase.en_curso -= 1
+
+    def _atender(self, con_cuerpo):
+        time.sleep(self.demora)
+        if self.fallas.get(self.path):
+            self.fallas[self.path] -= 1
+            self.send_error(503)
+            return
+        if self.error:
+            self.send_error(self.error)
+            return
+        contenido = self.archivos.get(self.path)
+        if contenido is None:
+            self.send_error(404)
+            return
+
+        etag = '"' + hashlib.sha256(contenido).hexdigest()[:16] + '"'
+        if self.validadores and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        inicio = 0
+        rango = self.headers.get("Range", "")
+        if self.acepta_rango and rango.startswith("bytes=") and self.headers.get("If-Range", etag) == etag:
+            inicio = int(rango[len("bytes="):].rstrip("-"))
+        cuerpo = contenido[inicio:]
+
+        self.send_response(206 if inicio else 200)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if inicio:
+            self.send_header("Content-Range", f"bytes {inicio}-{len(contenido) - 1}/{len(contenido)}")
+        if self.validadores:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(usegmt=True))
+        self.end_headers()
+        if not con_cuerpo:
+            return
+
+        corte = type(self).cortes.pop(0) if type(self).cortes else None
+        if corte is None:
+            self.wfile.write(cuerpo)
+        else:
+            # Cuerpo incompleto y conexión cerrada, como un enlace que se cae
+            self.wfile.write(cuerpo[:corte])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+
+    def do_GET(self):
+        self._responder(True)
+
+    def do_HEAD(self):
+        self._responder(False)
+
+def cargar_descarga(data_dir):
+    """Importa "download REM" (sin extensión) apuntando su DATA_DIR a data_dir."""
+    loader = importlib.machinery.SourceFileLoader("download_rem", str(BASE_DIR / "download REM"))
+    spec = importlib.util.spec_from_loader("download_rem", loader)
+    modulo = importlib.util.module_from_spec(spec)
+    loader.exec_module(modulo)
+    modulo.DATA_DIR = data_dir
+    modulo.ESTADO_DESCARGAS = data_dir / ".cache" / "descargas.json"
+    modulo.ESPEJO_DIR = data_dir / "historico"
+    modulo.MANIFIESTO = modulo.ESPEJO_DIR / "manifiesto.json"
+    modulo.ESPERA_REINTENTO = 0
+    # Bloques chicos: los cortes del servidor caen en bloques completos
+    modulo.CHUNK_DESCARGA = 100
+    return modulo
+
+def ejecutar(descarga, *args):
+    """Corre main() sin mostrar su salida. Retorna el exit code."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return descarga.main(list(args))
+
+def test_descarga():
+    print("=" * 70)
+    print("🧪 PROBANDO DESCARGAS (servidor local)")
+    print("=" * 70)
+    print()
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ServidorREM)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/{ARCHIVO}"
+
+    fixture = next(BASE_DIR.glob("data/tablas-relevamiento-expectativas-mercado-*.xlsx"), None)
+    original = fixture.read_bytes() if fixture else b"PK\x03\x04" + bytes(range(256)) * 64
+    # Misma longitud, otro contenido: una comparación por tamaño no lo detecta
+    revisado = original[:-1] + bytes([original[-1] ^ 1])
+
+    tests_passed = 0
+    tests_failed = 0
+
+    def verificar(nombre, condicion):
+        nonlocal tests_passed, tests_failed
+        if condicion:
+            print(f"   ✅ {nombre}")
+            tests_passed += 1
+        else:
+            print(f"   ❌ {nombre}")
+            tests_failed += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        descarga = cargar_descarga(data_dir)
+        descarga.find_latest_rem_url = lambda ventana=None: url
+
+        ServidorREM.archivos = {f"/{ARCHIVO}": original}
+
+        print("1️⃣  Primera corrida: descarga completa")
+        ServidorREM.peticiones = []
+        verificar("exit code 0 (archivo nuevo)", ejecutar(descarga) == 0)
+        verificar("archivo escrito", (data_dir / ARCHIVO).read_bytes() == original)
+        verificar("ETag guardado", bool(descarga.leer_estado().get(url, {}).get("etag")))
+        print()
+
+        print("2️⃣  Sin cambios: un solo GET condicional con 304")
+        ServidorREM.peticiones = []
+        verificar("exit code 1 (sin cambios)", ejecutar(descarga) == 1)
+        verificar("una sola petición", len(ServidorREM.peticiones) == 1)
+        metodo, _, headers = ServidorREM.peticiones[0]
+        verificar("GET con If-None-Match", metodo == "GET" and "If-None-Match" in headers)
+        verificar("GET con If-Modified-Since", "If-Modified-Since" in headers)
+        # Copia en disco distinta de la registrada: sus validadores darían un 304 equivocado
+        (data_dir / ARCHIVO).write_bytes(revisado)
+        ServidorREM.peticiones = []
+        verificar("validadores de otro contenido: se descarga", ejecutar(descarga) == 0
+                  and (data_dir / ARCHIVO).read_bytes() == original)
+        verificar("GET sin If-None-Match", "If-None-Match" not in ServidorREM.peticiones[0][2])
+        print()
+
+        print("3️⃣  Revisión con el mismo tamaño")
+        ServidorREM.archivos = {f"/{ARCHIVO}": revisado}
+        verificar("exit code 0 (archivo nuevo)", ejecutar(descarga) == 0)
+        verificar("archivo actualizado", (data_dir / ARCHIVO).read_bytes() == revisado)
+        print()
+
+        print("4️⃣  Servidor sin ETag / Last-Modified")
+        ServidorREM.validadores = False
+        verificar("exit code 1 por contenido idéntico", ejecutar(descarga) == 1)
+        ServidorREM.validadores = True
+        print()
+
+        print("5️⃣  Error del servidor")
+        ServidorREM.error = 500
+        verificar("exit code 2 (error)", ejecutar(descarga) == 2)
+        ServidorREM.error = None
+        print()
+
+        print("6️⃣  Conexión cortada dos veces: se reanuda con Range")
+        (data_dir / ARCHIVO).unlink()
+        ServidorREM.archivos = {f"/{ARCHIVO}": original}
+        ServidorREM.cortes = [1000, 3000]
+        ServidorREM.peticiones = []
+        verificar("exit code 0 (archivo nuevo)", ejecutar(descarga) == 0)
+        verificar("archivo completo e idéntico", (data_dir / ARCHIVO).read_bytes() == original)
+        rangos = [headers.get("Range") for _, _, headers in ServidorREM.peticiones]
+        verificar("reanudó desde los bytes recibidos", rangos == [None, "bytes=1000-", "bytes=4000-"])
+        verificar("sin .part residual", not (data_dir / (ARCHIVO + ".part")).exists())
+        verificar("sha256 guardado", descarga.leer_estado()[url]["sha256"] == hashlib.sha256(original).hexdigest())
+        print()
+
+        print("7️⃣  Sin reintentos restantes: el .part sobrevive a la corrida")
+        (data_dir / ARCHIVO).unlink()
+        ServidorREM.cortes = [500] * descarga.INTENTOS_DESCARGA
+        verificar("exit code 2 (error)", ejecutar(descarga) == 2)
+        verificar(".part conservado", (data_dir / (ARCHIVO + ".part")).stat().st_size == 500 * descarga.INTENTOS_DESCARGA)
+        ServidorREM.peticiones = []
+        verificar("la corrida siguiente completa", ejecutar(descarga) == 0)
+        verificar("primer pedido ya con Range", ServidorREM.peticiones[0][2].get("Range") == f"bytes={500 * descarga.INTENTOS_DESCARGA}-")
+        verificar("archivo completo e idéntico", (data_dir / ARCHIVO).read_bytes() == original)
+        print()
+
+        print("8️⃣  .part que no se puede reanudar: vuelve a empezar")
+        (data_dir / ARCHIVO).unlink()
+        ServidorREM.acepta_rango = False
+        ServidorREM.cortes = [2000]
+        verificar("exit code 0 (archivo nuevo)", ejecutar(descarga) == 0)
+        verificar("servidor que ignora Range: archivo completo e idéntico", (data_dir / ARCHIVO).read_bytes() == original)
+        ServidorREM.acepta_rango = True
+        parcial = data_dir / (ARCHIVO + ".part")
+        validador = data_dir / (ARCHIVO + ".part.validador")
+        verificar("sin validador residual", not validador.exists())
+        # Corrida cortada con la versión anterior; el BCRA republica antes de la siguiente
+        (data_dir / ARCHIVO).unlink()
+        ServidorREM.cortes = [100] * descarga.INTENTOS_DESCARGA
+        verificar("exit code 2 (error)", ejecutar(descarga) == 2)
+        republicado = bytes(reversed(original))
+        ServidorREM.archivos = {f"/{ARCHIVO}": republicado}
+        ServidorREM.peticiones = []
+        verificar("exit code 0 con el libro republicado", ejecutar(descarga) == 0)
+        etag_anterior = '"' + hashlib.sha256(original).hexdigest()[:16] + '"'
+        verificar("reanudó con If-Range", ServidorREM.peticiones[0][2].get("If-Range") == etag_anterior)
+        verificar("archivo nuevo completo, sin mezclar versiones", (data_dir / ARCHIVO).read_bytes() == republicado)
+        # .part de una versión anterior del script, sin validador guardado
+        (data_dir / ARCHIVO).unlink()
+        parcial.write_bytes(original[:len(original) // 2])
+        ServidorREM.peticiones = []
+        verificar("exit code 0 (archivo nuevo)", ejecutar(descarga) == 0)
+        verificar(".part sin validador descartado: GET sin Range", "Range" not in ServidorREM.peticiones[0][2])
+        verificar("archivo completo e idéntico", (data_dir / ARCHIVO).read_bytes() == republicado)
+        ServidorREM.archivos = {f"/{ARCHIVO}": original}
+        print()
+
+        print("9️⃣  Sondeo en paralelo de la última edición")
+        sondeo = cargar_descarga(data_dir)
+        sondeo.URL_BASE = f"http://127.0.0.1:{servidor.server_port}"
+        meses = sondeo.meses_anteriores(4)
+        urls = [sondeo.url_rem(edicion) for edicion in meses]
+        ServidorREM.archivos = {
+            "/" + urls[1].rsplit("/", 1)[1]: original,
+            "/" + urls[3].rsplit("/", 1)[1]: revisado,
+        }
+        ServidorREM.demora = 0.3
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            encontrada = sondeo.find_latest_rem_url(4)
+        duracion = time.perf_counter() - inicio
+        verificar("retorna el mes publicado más reciente", encontrada == urls[1])
+        verificar(f"HEADs simultáneos ({duracion:.2f}s, en serie serían ≥0.6s)", duracion < 0.55)
+        ServidorREM.demora = 0
+        desde, hasta = meses[-1], meses[0]
+        verificar("--desde/--hasta descarga las 2 publicadas", ejecutar(sondeo, "--desde", desde, "--hasta", hasta) == 0)
+        verificar("archivos de las 2 ediciones", all((data_dir / u.rsplit("/", 1)[1]).exists() for u in (urls[1], urls[3])))
+        print()
+
+        if fixture:
+            print("🔟 --parsear: descarga y parseo en memoria")
+            ServidorREM.archivos = {f"/{ARCHIVO}": original}
+            validar_tablas = validate_output.Validator.validar_tablas
+            validate_output.Validator.validar_tablas = lambda self, tablas, origen="": self.error("forzado")
+            verificar("--validar con errores: exit code 2", ejecutar(descarga, "--parsear", "--validar") == 2)
+            validate_output.Validator.validar_tablas = validar_tablas
+            verificar("--validar con errores: no se escribe ningún JSON", not list(data_dir.glob("rem_*")))
+            verificar("exit code 0 (datos nuevos)", ejecutar(descarga, "--parsear") == 0)
+            verificar("JSON escritos", (data_dir / "rem_bloques.json").exists())
+            ServidorREM.peticiones = []
+            verificar("exit code 1 con 304", ejecutar(descarga, "--parsear") == 1)
+            verificar("una sola petición", len(ServidorREM.peticiones) == 1)
+        else:
+            print("⏭️  --parsear omitido: no hay XLSX en ./data")
+        print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("🗂️  --espejo: archivo histórico con manifiesto")
+        data_dir = Path(tmp)
+        (data_dir / ARCHIVO).write_bytes(original)
+        espejo = cargar_descarga(data_dir)
+        espejo_dir = espejo.ESPEJO_DIR
+        espejo.URL_BASE = f"http://127.0.0.1:{servidor.server_port}"
+        espejo.ESPERA_ESPEJO = 0.05
+        espejo.PAUSA_POR_HOST = 0.2
+        urls = {edicion: espejo.url_rem(edicion) for edicion in ediciones_en_rango("2024-01", "2024-08")}
+        contenidos = {ed: original + ed.encode() for ed in urls}
+        del contenidos["2024-05"]  # edición no publicada
+        ServidorREM.archivos = {"/" + urls[ed].rsplit("/", 1)[1]: c for ed, c in contenidos.items()}
+        ServidorREM.fallas = {"/" + urls["2024-03"].rsplit("/", 1)[1]: 2}
+        ServidorREM.cortes = [700]
+        ServidorREM.demora = 0.1
+        ServidorREM.peticiones, ServidorREM.llegadas, ServidorREM.max_en_curso = [], [], 0
+        verificar("exit code 0 (ediciones nuevas)", ejecutar(espejo, "--espejo", "--desde", "2024-01", "--hasta", "2024-08") == 0)
+        manifiesto = espejo.leer_manifiesto()
+        verificar("manifiesto con las 7 publicadas", sorted(manifiesto) == sorted(contenidos))
+        verificar("validadores solo en el manifiesto, no en descargas.json", not espejo.ESTADO_DESCARGAS.exists())
+        verificar("hashes del manifiesto = contenido en disco", all(
+            manifiesto[ed]["sha256"] == hashlib.sha256(c).hexdigest() == hash_archivo(espejo_dir / manifiesto[ed]["archivo"])
+            for ed, c in contenidos.items()
+        ))
+        verificar("ediciones en data/historico, data/ solo con la vigente",
+                  [f.name for f in data_dir.glob("*.xlsx")] == [ARCHIVO]
+                  and len(list(espejo_dir.glob("*.xlsx"))) == len(contenidos))
+        verificar("503 reintentados con espera", sum(p == "/" + urls["2024-03"].rsplit("/", 1)[1] for _, p, _ in ServidorREM.peticiones) == 3)
+        verificar(f"cortesía por host (máx. {ServidorREM.max_en_curso} en curso)", ServidorREM.max_en_curso <= espejo.MAX_POR_HOST)
+        espacios = [b - a for a, b in zip(ServidorREM.llegadas, ServidorREM.llegadas[1:])]
+        verificar(f"pausa mínima entre pedidos ({min(espacios):.3f}s)", min(espacios) >= espejo.PAUSA_POR_HOST * 0.5)
+        ServidorREM.demora = 0
+        ServidorREM.peticiones = []
+        verificar("exit code 1 en la segunda corrida", ejecutar(espejo, "--espejo", "--desde", "2024-01", "--hasta", "2024-08") == 1)
+        verificar("solo se vuelve a pedir la no publicada", [p for _, p, _ in ServidorREM.peticiones] == ["/" + urls["2024-05"].rsplit("/", 1)[1]])
+        (espejo_dir / manifiesto["2024-02"]["archivo"]).write_bytes(b"corrupto")
+        ServidorREM.peticiones = []
+        verificar("hash distinto: se vuelve a descargar", ejecutar(espejo, "--espejo", "--desde", "2024-02", "--hasta", "2024-02") == 0)
+        verificar("archivo reparado", (espejo_dir / manifiesto["2024-02"]["archivo"]).read_bytes() == contenidos["2024-02"])
+        ServidorREM.error = 500
+        verificar("exit code 2 si una edición falla", ejecutar(espejo, "--espejo", "--desde", "2024-09", "--hasta", "2024-09") == 2)
+        ServidorREM.error = None
+        print()
+
+    servidor.shutdown()
+
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 else 1
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(test_descarga())
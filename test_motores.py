@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+test_motores.py
+---------------
+Verifica que todos los motores de lectura del paquete `rem` generen
+exactamente la misma salida y compara sus tiempos.
+
+Sin XLSX en ./data (checkout limpio, CI) arma un libro de prueba con la
+estructura del REM y compara los motores sobre ese.
+
+Uso:
+    python test_motores.py                      # edición más reciente en ./data o libro de prueba
+    python test_motores.py archivo.xlsx -n 5    # archivo y repeticiones
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import rem
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Bloques del libro de prueba: (título, unidad, períodos)
+MENSUAL = [datetime(2025, m, 1) for m in range(10, 13)] + [datetime(2026, 1, 1), "próx. 12 meses"]
+TRIMESTRAL = ["Trim. IV-25", "Trim. I-26", "Trim. II-26", 2026, 2027]
+ANUAL = [2025, 2026, "2027"]
+BLOQUES_PRUEBA = [
+    ("Precios minoristas (IPC nivel general-Nacional; INDEC)", "var. % mensual", MENSUAL),
+    ("Tipo de cambio nominal", "$/US$", MENSUAL),
+    ("Exportaciones", "millones de US$", ANUAL),
+    ("PIB a precios constantes", "var. % trim. s.e.", TRIMESTRAL),
+]
+COLUMNAS_PRUEBA = ["Período", "Referencia", "Mediana", "Promedio", "Desvío", "Máximo", "Mínimo",
+                   "Percentil 90", "Percentil 10", "Cantidad de participantes"]
+
+def crear_libro_prueba(destino, semilla=1):
+    """
+    Escribe en `destino` un XLSX chico con la estructura del REM: las hojas
+    de HOJAS_PROCESAR con un bloque por indicador (título, encabezado,
+    filas de datos y "Fuente") y valores que cubren las conversiones del
+    parser (coma decimal, "s/d" sin dato, años como número y como texto).
+    `semilla` cambia los valores para simular otra edición.
+    """
+    from openpyxl import Workbook
+    
+    libro = Workbook()
+    libro.active.title = "Notas"
+    libro.active.append(["Relevamiento de Expectativas de Mercado (REM)"])
+    for hoja in rem.HOJAS_PROCESAR:
+        ws = libro.create_sheet(hoja)
+        ws.append([f"Relevamiento de Expectativas de Mercado (REM) - {hoja}"])
+        ws.append([])
+        for n, (titulo, unidad, periodos) in enumerate(BLOQUES_PRUEBA):
+            ws.append([None, titulo])
+            ws.append([])
+            ws.append([None] + COLUMNAS_PRUEBA)
+            for i, periodo in enumerate(periodos):
+                base = 10 * (n + 1) + i + semilla / 10
+                valores = [round(base * (1 + k / 100), 2) for k in range(7)]
+                if i == 1:
+                    valores[0] = str(valores[0]).replace(".", ",")
+                if i == 2:
+                    valores[2] = "s/d"
+                ws.append([None, periodo, unidad] + valores + [10 + i])
+            ws.append([])
+            ws.append([None, "Fuente: BCRA"])
+            ws.append([])
+            ws.append([])
+    libro.save(destino)
+    return destino
+
+def parsear_silencioso(archivo, motor):
+    """Parsea el archivo con un motor sin mostrar el log del parser."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return rem.parsear_libro(archivo, motor)
+
+def leer_hojas(archivo, motor):
+    """Solo la etapa de lectura: materializa las hojas a procesar."""
+    _, hojas = rem.MOTORES[motor](archivo, rem.HOJAS_PROCESAR)
+    return [df.shape for _, df in hojas]
+
+def mejor_tiempo(funcion, repeticiones):
+    """Mejor tiempo (segundos) de N corridas."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def comparar_motores(archivo, repeticiones):
+    print("=" * 70)
+    print("🧪 PARIDAD Y TIEMPOS DE MOTORES DE LECTURA")
+    print("=" * 70)
+    print(f"Archivo: {archivo.name}")
+    print(f"Repeticiones: {repeticiones}")
+    print()
+
+    referencia = None
+    tiempos = {}
+    tests_passed = 0
+    tests_failed = 0
+
+    for motor in rem.MOTORES:
+        try:
+            resultado = parsear_silencioso(archivo, motor)
+        except ImportError as e:
+            print(f"⏭️  {motor:10s} omitido: {e}")
+            continue
+
+        tiempos[motor] = (
+            mejor_tiempo(lambda: leer_hojas(archivo, motor), repeticiones),
+            mejor_tiempo(lambda: parsear_silencioso(archivo, motor), repeticiones),
+        )
+
+        salida = json.dumps(resultado, ensure_ascii=False, indent=2)
+        if referencia is None:
+            referencia = (motor, salida)
+            print(f"📌 {motor:10s} referencia ({len(resultado)} tablas)")
+            tests_passed += 1
+        elif salida == referencia[1]:
+            print(f"✅ {motor:10s} salida idéntica a '{referencia[0]}'")
+            tests_passed += 1
+        else:
+            print(f"❌ {motor:10s} salida distinta a '{referencia[0]}'")
+            tests_failed += 1
+
+    if tiempos:
+        base = tiempos.get("openpyxl", max(tiempos.values()))[0]
+        print()
+        print("⏱️  Tiempos (mejor corrida):")
+        print(f"   {'motor':10s} {'lectura':>10s} {'total':>10s}")
+        for motor, (lectura, total) in sorted(tiempos.items(), key=lambda x: x[1]):
+            print(f"   {motor:10s} {lectura * 1000:7.1f} ms {total * 1000:7.1f} ms"
+                  f"   (lectura {base / lectura:4.1f}x vs openpyxl)")
+
+    print()
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 and tests_passed > 0 else 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridad y tiempos de motores de lectura REM")
+    parser.add_argument("archivo", nargs="?", type=Path, help="XLSX a procesar (default: la edición más reciente en ./data)")
+    parser.add_argument("-n", "--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    ediciones = rem.encontrar_ediciones(BASE_DIR / "data")
+    archivo = args.archivo or (list(ediciones.values())[-1] if ediciones else None)
+    if archivo:
+        sys.exit(comparar_motores(archivo, args.repeticiones))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print("📝 Sin XLSX en ./data: libro de prueba generado")
+        archivo = crear_libro_prueba(Path(tmp) / "tablas-relevamiento-expectativas-mercado-nov-2025.xlsx")
+        codigo = comparar_motores(archivo, args.repeticiones)
+    sys.exit(codigo)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+test_normalizacion.py
+---------------------
+Verifica la conversión de números y períodos de rem.normalizacion sobre
+bloques chicos como los del REM y compara su tiempo con la conversión
+celda por celda.
+
+Uso:
+    python test_normalizacion.py
+"""
+
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from rem.normalizacion import (
+    TAMANIO_CACHE_TEXTOS, convertir_bloque_numerico, convertir_columna_periodo, etiquetas_periodo,
+    inferir_formato_fecha, interpretar_etiqueta_periodo, interpretar_numero,
+)
+from rem.salida import bloque_a_dataframe
+
+def a_numero_celda(valor):
+    """Referencia: la conversión celda por celda del parser original."""
+    if valor is None or pd.isna(valor):
+        return None
+    if isinstance(valor, (int, float, np.number)):
+        return float(valor)
+    resultado = interpretar_numero(str(valor))
+    return None if isinstance(resultado, float) and np.isnan(resultado) else resultado
+
+def test_normalizacion():
+    print("=" * 70)
+    print("🧪 PROBANDO NORMALIZACIÓN DE BLOQUES")
+    print("=" * 70)
+    print()
+
+    tests_passed = 0
+    tests_failed = 0
+
+    def verificar(nombre, condicion):
+        nonlocal tests_passed, tests_failed
+        if condicion:
+            print(f"   ✅ {nombre}")
+            tests_passed += 1
+        else:
+            print(f"   ❌ {nombre}")
+            tests_failed += 1
+
+    print("1️⃣  Columnas numéricas de un bloque")
+    bloque = pd.DataFrame({
+        "mediana": [1.5, "2,3", " 4 % ", "$ 1\xa0000", None],
+        "promedio": ["1_000", "1e3", "nan", 7, np.nan],
+        "referencia": ["s/d", "próx. 12 meses", 3.0, "", None],
+        "desvio": [0.5, 1, 2.0, np.nan, 4],
+    })
+    convertido = convertir_bloque_numerico(bloque)
+    verificar("mismas columnas e índice", list(convertido.columns) == list(bloque.columns)
+              and convertido.index.equals(bloque.index))
+    verificar("textos con coma, % y $ a float", convertido["mediana"].tolist()[:4] == [1.5, 2.3, 4.0, 1000.0])
+    verificar('"1_000" y "1e3" como float() de Python', convertido["promedio"].tolist()[:2] == [1000.0, 1000.0])
+    verificar("columna solo numérica → float64", convertido["promedio"].dtype == "float64"
+              and convertido["desvio"].dtype == "float64")
+    verificar('"nan" y nulos → NaN', convertido["promedio"].isna().tolist() == [False, False, True, False, True])
+    verificar("con textos no numéricos → object con los textos", convertido["referencia"].dtype == object
+              and convertido["referencia"].tolist() == ["s/d", "próx. 12 meses", 3.0, "", None])
+    verificar("igual a la conversión celda por celda", all(
+        convertido[col].astype(object).where(convertido[col].notna(), None).tolist()
+        == [a_numero_celda(v) for v in bloque[col]]
+        for col in bloque.columns
+    ))
+    for i in range(TAMANIO_CACHE_TEXTOS + 100):
+        interpretar_numero(f"{i},5 %")
+    verificar("caché de textos acotada", interpretar_numero.cache_info().currsize <= TAMANIO_CACHE_TEXTOS)
+    verificar("bloque ya numérico: float64 sin recorrer celdas",
+              (convertir_bloque_numerico(bloque[["desvio"]]).dtypes == "float64").all())
+    print()
+
+    print("2️⃣  Tiempo en bloques chicos (10 filas × 12 columnas)")
+    chico = pd.DataFrame({f"c{i}": ["1,5", "2.3%", "s/d", None, 4.0] * 2 for i in range(12)})
+    repeticiones = 200
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        convertir_bloque_numerico(chico)
+    bloque_ms = (time.perf_counter() - inicio) / repeticiones * 1000
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for col in chico.columns:
+            chico[col].apply(a_numero_celda)
+    celdas_ms = (time.perf_counter() - inicio) / repeticiones * 1000
+    verificar(f"bloque {bloque_ms:.2f} ms vs celda por celda {celdas_ms:.2f} ms", bloque_ms < celdas_ms * 1.5)
+    print()
+
+    print("3️⃣  Columna de período")
+    casos = [
+        (datetime(2025, 10, 1), "2025-10-01", "fecha"),
+        (pd.Timestamp("2025-11-01"), "2025-11-01", "fecha"),
+        (date(2025, 12, 1), "2025-12-01", "fecha"),
+        ("2025-12", "2025-12-01", "fecha"),
+        ("2025-10-31 00:00:00", "2025-10-31", "fecha"),
+        ("31/10/2025", "2025-10-31", "fecha"),
+        ("10/2025", "2025-10-01", "fecha"),
+        ("Trim. III-25", "2025-07-01", "trimestre"),
+        ("2026", "2026-01-01", "año"),
+        (2027.0, "2027-01-01", "año"),
+        ("próx. 12 meses", "próx. 12 meses", "relativo"),
+        ("Fuente: BCRA", "Fuente: BCRA", "nota"),
+        ("s/d", "s/d", "texto"),
+        (None, None, None),
+    ]
+    periodos, tipos = convertir_columna_periodo(pd.Series([valor for valor, _, _ in casos]))
+    for (valor, periodo, tipo), obtenido, tipo_obtenido in zip(casos, periodos, tipos):
+        verificar(f"{valor!r} → {periodo!r} ({tipo})", (obtenido, tipo_obtenido) == (periodo, tipo))
+    periodos, tipos = convertir_columna_periodo(pd.Series([pd.Timestamp("2025-01-01"), pd.NaT]))
+    verificar("columna datetime64 con NaT → None", periodos.tolist() == ["2025-01-01", None]
+              and tipos.tolist() == ["fecha", None])
+    periodos, tipos = convertir_columna_periodo(pd.Series([datetime(2025, 2, 1), pd.NaT, np.datetime64("NaT")], dtype=object))
+    verificar("NaT sueltos en columna object → None", periodos.tolist() == ["2025-02-01", None, None])
+    # Una columna cuya primera fecha no es de FORMATOS_FECHA no arrastra al resto
+    periodos, tipos = convertir_columna_periodo(pd.Series(["2025-10-31 00:00:00", "2025-12", "01/11/2025"]))
+    verificar("cada celda cae a pd.to_datetime por separado",
+              periodos.tolist() == ["2025-10-31", "2025-12-01", "2025-11-01"] and set(tipos) == {"fecha"})
+    verificar("formato inferido de la primera muestra que sirve",
+              inferir_formato_fecha(["2025-10-31 00:00:00", "2025-12", "01/11/2025"]) == "%Y-%m"
+              and inferir_formato_fecha(["próx. 12 meses", "2026"]) is None)
+    verificar("caché de etiquetas acotada",
+              interpretar_etiqueta_periodo.cache_info().maxsize == TAMANIO_CACHE_TEXTOS)
+    serie = pd.Series([" Trim. IV-25 ", 2026.0, datetime(2025, 10, 1), "próx. 12 meses", None])
+    periodos, tipos = convertir_columna_periodo(serie)
+    verificar("etiqueta original del Excel junto al período",
+              etiquetas_periodo(serie, periodos).tolist() == ["Trim. IV-25", "2026", "2025-10-01", "próx. 12 meses", None])
+    entrada = {"columnas": ["período", "período_tipo", "período_etiqueta", "mediana"], "datos": [
+        {"período": p, "período_tipo": t, "período_etiqueta": e, "mediana": 1.0}
+        for p, t, e in zip(periodos, tipos, etiquetas_periodo(serie, periodos))
+    ]}
+    df = bloque_a_dataframe(entrada)
+    verificar("Parquet: período como fecha y la etiqueta original",
+              df["período_etiqueta"].tolist()[:4] == ["Trim. IV-25", "2026", "2025-10-01", "próx. 12 meses"]
+              and str(df["período"].dtype).startswith("datetime64") and df["período"].isna().tolist()[3])
+    print()
+
+    print("4️⃣  Tiempo de la columna de período en bloques chicos (10 filas)")
+    periodo = pd.Series([datetime(2025, 10, 1), "Trim. III-25", "2026", "próx. 12 meses", "2025-12"] * 2)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        convertir_columna_periodo(periodo)
+    periodo_ms = (time.perf_counter() - inicio) / repeticiones * 1000
+    verificar(f"columna de período en {periodo_ms:.2f} ms (< 1 ms)", periodo_ms < 1)
+    print()
+
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(test_normalizacion())
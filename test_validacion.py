@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+test_validacion.py
+------------------
+Verifica que la validación por columnas (NumPy) de validate_output.py
+produzca exactamente el mismo reporte que el recorrido fila por fila, que
+informe las filas con problemas, que las reglas de reglas_validacion.json
+se compilen y sobrescriban bien, que el resultado del parser se valide una
+sola vez (los archivos individuales solo se comparan por hash con el
+maestro), que la lectura en streaming del maestro dé el mismo reporte con
+memoria acotada, y compara sus tiempos sobre un histórico sintético de
+varios años.
+
+Uso:
+    python test_validacion.py                 # 5000 filas por tabla
+    python test_validacion.py --filas 50000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import validate_output
+from rem.salida import escribir_json
+
+CLAVES = [
+    "ipc_general", "ipc_nucleo", "tasa_interes", "tipo_cambio", "exportaciones",
+    "importaciones", "resultado_primario", "desocupacion", "pbi",
+]
+COLUMNAS = [
+    "período", "período_tipo", "referencia", "mediana", "promedio", "desvío",
+    "máximo", "mínimo", "percentil_90", "percentil_10", "cantidad_de_participantes",
+]
+# Por debajo de este tamaño del maestro domina lo fijo del streaming (el
+# bloque de lectura y las filas de un bloque) y la proporción no dice nada
+MAESTRO_MINIMO_MEMORIA = 16_000_000
+FILAS_POR_DEFECTO = 5000
+
+def tabla(clave, datos):
+    """Tabla con la estructura que genera el parser."""
+    return {
+        "titulo": clave, "hoja": "CUADROS DE RESULTADOS", "clave": clave,
+        "filas": len(datos), "columnas": list(datos[0]) if datos else COLUMNAS, "datos": datos,
+    }
+
+def fila_limpia(fecha, valor):
+    """Fila sin problemas para cualquier familia de tabla."""
+    return {
+        "período": fecha, "período_tipo": "fecha", "referencia": "var. %",
+        "mediana": valor, "promedio": valor, "desvío": 0.5, "máximo": valor + 1,
+        "mínimo": valor - 1, "percentil_90": valor + 0.5, "percentil_10": valor - 0.5,
+        "cantidad_de_participantes": 12.0,
+    }
+
+def tablas_con_problemas():
+    """Las 18 tablas con un caso de cada anomalía que detecta el validador."""
+    hoy = datetime.now()
+    reciente = (hoy - timedelta(days=60)).strftime("%Y-%m-%d")
+    vieja = (hoy - timedelta(days=365 * 7)).strftime("%Y-%m-%d")
+    lejana = (hoy + timedelta(days=365 * 8)).strftime("%Y-%m-%d")
+    tablas = {}
+    for clave in CLAVES:
+        datos = [fila_limpia(reciente, 10.0) for _ in range(12)]
+        datos[1]["período"] = "1970-01-01"
+        datos[2]["período"] = vieja
+        datos[3]["período"] = lejana
+        datos[4]["período"] = "2025-02-30"
+        datos[5].update({"período": "próx. 12 meses", "período_tipo": "relativo"})
+        datos[6]["período"] = f"{reciente}T10:00:00Z"
+        datos[7].update({"período": 2019, "período_tipo": "año"})
+        datos[8].update({"mediana": 0, "desvío": "s/d", "máximo": None, "mínimo": ""})
+        datos[9].update({"promedio": 1e6, "mínimo": -1e6, "percentil_90": "7e5"})
+        datos[10]["columna_extra"] = -999.0
+        del datos[11]["percentil_10"]
+        tablas[clave] = tabla(clave, datos)
+        tablas[f"{clave}_top10"] = tabla(f"{clave}_top10", [dict(f) for f in datos])
+    return tablas
+
+def historico(filas):
+    """Las 18 tablas con `filas` filas cada una, como un histórico de varios años."""
+    azar = random.Random(2025)
+    hoy = datetime.now()
+    tablas = {}
+    for clave in CLAVES:
+        datos = [
+            fila_limpia((hoy - timedelta(days=azar.randrange(365 * 4))).strftime("%Y-%m-%d"),
+                        round(azar.uniform(1, 15), 2))
+            for _ in range(filas)
+        ]
+        for i in azar.sample(range(filas), 5):
+            datos[i]["promedio"] = 1e6
+        tablas[clave] = tabla(clave, datos)
+        tablas[f"{clave}_top10"] = tabla(f"{clave}_top10", datos)
+    return tablas
+
+class ValidadorContado(validate_output.Validator):
+    """Validator que cuenta cuántas tablas valida."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tablas_validadas = 0
+
+    def validar_datos_tabla(self, clave, tabla):
+        self.tablas_validadas += 1
+        return super().validar_datos_tabla(clave, tabla)
+
+def ejecutar(directorio, resultado=None, streaming=False, archivos=True):
+    """Corre Validator.ejecutar() sin mostrar el reporte."""
+    validador = ValidadorContado(directorio=directorio, streaming=streaming)
+    with contextlib.redirect_stdout(io.StringIO()):
+        exito = validador.ejecutar(resultado, archivos)
+    return validador, exito
+
+def reporte(validador):
+    """Lo que produce una validación: errores, advertencias y validaciones OK."""
+    return validador.errores, validador.warnings, validador.validaciones_ok
+
+def validar_maestro(directorio, streaming, modo="columnas", **kwargs):
+    """Valida solo rem_bloques.json; retorna (validador, pico de memoria en bytes)."""
+    validador = validate_output.Validator(modo, directorio=directorio)
+    tracemalloc.start()
+    if streaming:
+        validador.validar_archivo_maestro_streaming(**kwargs)
+    else:
+        validador.validar_archivo_maestro()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return validador, pico
+
+def validar(tablas, modo):
+    """Valida los datos de todas las tablas; retorna (validador, segundos)."""
+    validador = validate_output.Validator(modo=modo)
+    inicio = time.perf_counter()
+    for clave, t in tablas.items():
+        validador.validar_datos_tabla(clave, t)
+    return validador, time.perf_counter() - inicio
+
+def test_validacion(filas=FILAS_POR_DEFECTO):
+    print("=" * 70)
+    print("🧪 PROBANDO VALIDACIÓN POR COLUMNAS")
+    print("=" * 70)
+    print()
+
+    tests_passed = 0
+    tests_failed = 0
+
+    def verificar(nombre, condicion):
+        nonlocal tests_passed, tests_failed
+        if condicion:
+            print(f"   ✅ {nombre}")
+            tests_passed += 1
+        else:
+            print(f"   ❌ {nombre}")
+            tests_failed += 1
+
+    print("1️⃣  Mismo reporte que fila por fila")
+    tablas = tablas_con_problemas()
+    por_filas, _ = validar(tablas, "filas")
+    por_columnas, _ = validar(tablas, "columnas")
+    verificar(f"mismos errores ({len(por_filas.errores)})", por_columnas.errores == por_filas.errores)
+    verificar(f"mismas advertencias ({len(por_filas.warnings)})", por_columnas.warnings == por_filas.warnings)
+    verificar("mismas validaciones OK", por_columnas.validaciones_ok == por_filas.validaciones_ok)
+    verificar("detecta epoch, fecha inválida y con zona horaria",
+              sum("epoch" in e for e in por_filas.errores) == 18
+              and sum("Error parseando" in e for e in por_filas.errores) == 36)
+    print()
+
+    print("2️⃣  Filas con problemas por columna")
+    problemas = validate_output.Validator().validar_datos_columnas("tipo_cambio", tablas["tipo_cambio"])
+    filas_de = {campo: indices.tolist() for campo, indices in problemas.items()}
+    verificar("período: filas 1, 2, 3, 4, 6 y 7", filas_de.get("período") == [1, 2, 3, 4, 6, 7])
+    verificar("mediana en cero: fila 8", filas_de.get("mediana") == [8])
+    verificar("fuera de rango: fila 9", filas_de.get("promedio") == [9] and filas_de.get("percentil_90") == [9])
+    verificar("columna que solo aparece en una fila", filas_de.get("columna_extra") == [10])
+    verificar("nulos, texto y faltantes no se reportan", "desvío" not in filas_de and "percentil_10" not in filas_de)
+    sin_rango = validate_output.Validator().validar_datos_columnas("resultado_primario", tablas["resultado_primario"])
+    verificar("tabla sin rango: solo fechas", list(sin_rango) == ["período"])
+    print()
+
+    print(f"3️⃣  Histórico sintético: 18 tablas × {filas} filas")
+    tablas = historico(filas)
+    por_filas, t_filas = validar(tablas, "filas")
+    por_columnas, t_columnas = validar(tablas, "columnas")
+    print(f"   filas:    {t_filas:.3f}s")
+    print(f"   columnas: {t_columnas:.3f}s ({t_filas / t_columnas:.1f}x)")
+    verificar("mismo reporte", (por_columnas.errores, por_columnas.warnings) == (por_filas.errores, por_filas.warnings))
+    verificar("detecta las filas fuera de rango (16 tablas con rango)", len(por_columnas.warnings) == 16 * 5)
+    verificar("por columnas es más rápido", t_columnas < t_filas)
+    print()
+
+    print("4️⃣  Reglas declarativas")
+    reglas = validate_output.cargar_reglas()
+    reglas["tablas"]["exportaciones"]["*"]["max"] = 2e6
+    reglas["tablas"]["pbi"]["cantidad_de_participantes"] = {"min": 0, "max": None}
+    reglas["tablas"]["tasa_interes"]["desvío"] = {"nulos": False}
+    reglas["top10"] = {"*": {"cantidad_de_participantes": {"max": 10}}, "pbi": {"*": {"min": -30}}}
+    compiladas = validate_output.ReglasValidacion(reglas)
+    pbi, pbi_top10 = compiladas.de_tabla("pbi"), compiladas.de_tabla("pbi_top10")
+    verificar("se compila una vez por tabla", compiladas.de_tabla("pbi") is pbi)
+    verificar("columna propia sobre '*'", pbi["cantidad_de_participantes"].max is None and pbi["*"].max == 20)
+    verificar("override _top10 por campo", pbi_top10["*"] == (-30, 20, True, "numero")
+              and pbi_top10["cantidad_de_participantes"] == (0, 10, True, "numero"))
+    verificar("la columna hereda de '*' lo que no declara",
+              compiladas.de_tabla("tasa_interes")["desvío"] == (0, 300, False, "numero")
+              and compiladas.de_tabla("ipc_general_top10")["cantidad_de_participantes"] == (-50, 10, True, "numero"))
+    verificar("clave repetida usa las reglas de su base", compiladas.de_tabla("pbi_2") is pbi
+              and compiladas.de_tabla("pbi_top10_3") is pbi_top10)
+    verificar("referencia es texto en todas las tablas", compiladas.de_tabla("desconocida") == {
+        "referencia": (None, None, True, "texto")
+    })
+    tablas = tablas_con_problemas()
+    por_filas = validate_output.Validator("filas", reglas)
+    por_columnas = validate_output.Validator("columnas", compiladas)
+    for validador in (por_filas, por_columnas):
+        for clave, t in tablas.items():
+            validador.validar_datos_tabla(clave, t)
+    verificar("mismo reporte con reglas propias", (por_columnas.errores, por_columnas.warnings)
+              == (por_filas.errores, por_filas.warnings))
+    verificar("techo de exportaciones ajustado sin tocar código", not any(
+        "'exportaciones'" in w and "1000000.0 >" in w for w in por_filas.warnings
+    ))
+    verificar("nulos=false advierte 's/d' en desvío", sum(
+        "nulo o no numérico en 'desvío'" in w for w in por_filas.warnings
+    ) == 2)
+    repetida = validate_output.Validator("columnas", compiladas)
+    repetida.validar_datos_tabla("exportaciones_2", tablas["exportaciones"])
+    verificar("rangos también en la tabla repetida", sorted(repetida.warnings) == sorted(
+        w.replace("'exportaciones'", "'exportaciones_2'") for w in por_columnas.warnings if "'exportaciones'" in w
+    ) and repetida.warnings)
+    verificar("máximo 10 participantes en TOP 10", sum(
+        "12.0 > 10 en 'cantidad_de_participantes'" in w for w in por_filas.warnings
+    ) == 9 * 12)
+    try:
+        validate_output.ReglasValidacion({"tablas": {"pbi": {"*": {"tipo": "fecha"}}}})
+        verificar("tipo inválido rechazado al cargar", False)
+    except ValueError:
+        verificar("tipo inválido rechazado al cargar", True)
+    print()
+
+    print("5️⃣  Resultado en memoria y archivos comparados por hash")
+    tablas = tablas_con_problemas()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        escribir_json(tablas, tmp)
+        disco, _ = ejecutar(tmp)
+        memoria, _ = ejecutar(tmp, tablas)
+        verificar("cada tabla se valida una sola vez", disco.tablas_validadas == memoria.tablas_validadas == 18)
+        verificar("mismo reporte desde disco y en memoria", (disco.errores, disco.warnings, disco.validaciones_ok)
+                  == (memoria.errores, memoria.warnings, memoria.validaciones_ok))
+
+        archivo = tmp / "rem_pbi_top10.json"
+        original = archivo.read_bytes()
+        archivo.write_bytes(original.replace(b"10.0", b"10.5", 1))
+        validador, exito = ejecutar(tmp, tablas)
+        diferencias = [e for e in validador.errores if "no coincide" in e]
+        verificar("archivo alterado detectado", not exito and diferencias == [
+            "❌ ERROR: rem_pbi_top10.json no coincide con su fragmento en rem_bloques.json"
+        ])
+        archivo.unlink()
+        (tmp / "rem_vieja.json").write_bytes(b"{}")
+        validador, exito = ejecutar(tmp, tablas)
+        verificar("archivo faltante es error", not exito and any("Falta el archivo individual rem_pbi_top10.json" in e for e in validador.errores))
+        verificar("archivo sobrante es advertencia", any("rem_vieja.json no está en el archivo maestro" in w for w in validador.warnings))
+        archivo.write_bytes(original)
+        (tmp / "rem_vieja.json").unlink()
+
+        # --validar: el resultado se valida antes de escribir y después solo se comparan los archivos
+        previo, exito = ejecutar(tmp / "sin_escribir", tablas, archivos=False)
+        verificar("antes de escribir: mismo reporte sin mirar el directorio",
+                  not exito and previo.errores == [e for e in memoria.errores if "coincide" not in e]
+                  and previo.warnings == memoria.warnings)
+        with contextlib.redirect_stdout(io.StringIO()):
+            iguales = validate_output.Validator(directorio=tmp).verificar_escritos(list(tablas))
+            archivo.write_bytes(original.replace(b"10.0", b"10.5", 1))
+            alterado = validate_output.Validator(directorio=tmp).verificar_escritos(list(tablas))
+        archivo.write_bytes(original)
+        verificar("después de escribir: archivos iguales al maestro", iguales)
+        verificar("después de escribir: archivo alterado detectado", not alterado)
+        escribir_json(tablas, tmp, indentado=True)
+        validador, _ = ejecutar(tmp)
+        verificar("maestro indentado (--pretty) consistente", not any("coincide" in e for e in validador.errores)
+                  and validador.warnings == disco.warnings)
+    print()
+
+    print("6️⃣  Maestro en streaming")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tablas = tablas_con_problemas()
+        tablas["pbi"]["filas"] = 99
+        del tablas["ipc_nucleo_top10"]
+        escribir_json(tablas, tmp)
+        chico = {"filas_por_bloque": 5, "tamanio_bloque": 64}
+        for modo in validate_output.MODOS:
+            completo, _ = validar_maestro(tmp, False, modo)
+            streaming, _ = validar_maestro(tmp, True, modo, **chico)
+            verificar(f"mismo reporte que json.load (por {modo}, bloques de 5 filas y 64 caracteres)",
+                      reporte(streaming) == reporte(completo))
+        verificar("17 tablas: la advertencia va primero", completo.warnings[0].endswith("se encontraron 17"))
+        verificar("ejecutar() en streaming: mismo reporte",
+                  reporte(ejecutar(tmp, streaming=True)[0]) == reporte(ejecutar(tmp)[0]))
+
+        # 'datos' antes que 'columnas': esa tabla se lee entera, el reporte no cambia
+        maestro = {clave: dict(reversed(list(t.items()))) for clave, t in tablas.items()}
+        (tmp / "rem_bloques.json").write_text(json.dumps(maestro, ensure_ascii=False), encoding="utf-8")
+        completo, _ = validar_maestro(tmp, False)
+        streaming, _ = validar_maestro(tmp, True, **chico)
+        verificar("'datos' antes que 'columnas'", reporte(streaming) == reporte(completo))
+
+        contenido = (tmp / "rem_bloques.json").read_bytes()
+        (tmp / "rem_bloques.json").write_bytes(contenido[:len(contenido) // 2])
+        streaming, _ = validar_maestro(tmp, True, **chico)
+        verificar("documento cortado: solo el error de sintaxis", not streaming.warnings
+                  and len(streaming.errores) == 1 and "Error parseando JSON maestro" in streaming.errores[0]
+                  and streaming.validaciones_ok == 0)
+
+        escribir_json(historico(filas), tmp)
+        tamanio = (tmp / "rem_bloques.json").stat().st_size
+        completo, pico_completo = validar_maestro(tmp, False)
+        streaming, pico_streaming = validar_maestro(tmp, True, filas_por_bloque=1000)
+        print(f"   maestro de {tamanio / 1e6:.1f} MB: pico json.load {pico_completo / 1e6:.1f} MB, "
+              f"streaming {pico_streaming / 1e6:.1f} MB")
+        verificar("mismo reporte sobre el histórico", reporte(streaming) == reporte(completo))
+        verificar("memoria del streaming ≤ pico con json.load", pico_streaming <= pico_completo)
+        if tamanio >= MAESTRO_MINIMO_MEMORIA:
+            verificar("memoria acotada (< 1/5 del pico con json.load)", pico_streaming < pico_completo / 5)
+        else:
+            print(f"   ⏭️  cota de 1/5 omitida: maestro menor a {MAESTRO_MINIMO_MEMORIA / 1e6:.0f} MB")
+    print()
+
+    print("=" * 70)
+    print(f"✅ Tests exitosos: {tests_passed}")
+    print(f"❌ Tests fallidos:  {tests_failed}")
+    print("=" * 70)
+
+    return 0 if tests_failed == 0 else 1
+
+if __name__ == "__main__":
+    import sys
+    parser = argparse.ArgumentParser(description="Paridad y tiempos de la validación por columnas")
+    parser.add_argument("--filas", type=int, default=FILAS_POR_DEFECTO, help="Filas por tabla del histórico sintético")
+    sys.exit(test_validacion(parser.parse_args().filas))
@@ -9,22 +9,279 @@ Detecta:
 - Valores faltantes críticos
 - Rangos numéricos anormales
 - Estructura JSON inconsistente
+
+Por defecto valida los datos por columnas con NumPy (una operación por
+columna en vez de una llamada por celda); `--por-filas` usa el recorrido
+original, fila por fila, que produce exactamente el mismo reporte.
+
+Los rangos de cada tabla y columna salen de reglas_validacion.json: se
+leen una vez y se compilan a una búsqueda por tabla, así ajustar un límite
+no requiere tocar el código.
+
+Con `--streaming` el maestro se lee de a una tabla y de a bloques de filas,
+con memoria acotada aunque tenga el histórico de muchas ediciones.
+
+Uso:
+    python validate_output.py
+    python validate_output.py --por-filas
+    python validate_output.py --reglas otras_reglas.json
+    python validate_output.py --streaming
 """
 
 from pathlib import Path
+from collections import namedtuple
+import argparse
+import contextlib
+import hashlib
 import json
+import math
+import re
 from datetime import datetime, timedelta
 import sys
 
+from rem.salida import TIPOS_PERIODO_FECHA
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
+REGLAS = BASE_DIR / "reglas_validacion.json"
+ARCHIVO_MAESTRO = "rem_bloques.json"
+
+# Lectura en streaming: caracteres por lectura del archivo y filas por bloque validado
+TAMANIO_BLOQUE = 1 << 20
+FILAS_POR_BLOQUE = 10000
+
+# Fechas aceptadas: los últimos 5 años y los próximos 5
+AÑOS_VENTANA_FECHAS = 5
+
+# Modos de validación de datos: por columnas (NumPy) o fila por fila
+MODOS = ('columnas', 'filas')
+
+def ventana_fechas():
+    """Rango (desde, hasta) de fechas razonables, relativo a hoy."""
+    hoy = datetime.now()
+    margen = timedelta(days=365 * AÑOS_VENTANA_FECHAS)
+    return hoy - margen, hoy + margen
+
+def columna_periodo(tabla):
+    """Primera columna de período/fecha de la tabla, o None."""
+    for col in tabla['columnas']:
+        if 'per' in col.lower() or 'fecha' in col.lower():
+            return col
+    return None
+
+# Regla de una columna: rango [min, max] (None = sin límite), si acepta nulos y tipo
+Regla = namedtuple('Regla', ['min', 'max', 'nulos', 'tipo'])
+TIPOS_REGLA = ('numero', 'texto')
+SUFIJO_TOP10 = '_top10'
+# Sufijo de las claves repetidas en un libro ("ipc_general_2", ver generar_clave_bloque)
+SUFIJO_REPETIDA = re.compile(r'_\d+$')
+
+def cargar_reglas(ruta=None):
+    """Lee el archivo de reglas (por defecto reglas_validacion.json)."""
+    with open(ruta or REGLAS, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class ReglasValidacion:
+    """
+    Reglas compiladas: para cada tabla, {columna: Regla} con '*' como regla
+    del resto de las columnas (y base de las que se declaran aparte). Las
+    tablas del archivo y sus variantes _top10 se compilan al cargar, así un
+    error en el archivo aparece antes de validar. Una clave repetida
+    ("ipc_general_2") usa las reglas de su clave base, y cualquier otra se
+    compila la primera vez que se valida; todas quedan memoizadas.
+    """
+    def __init__(self, reglas):
+        self.por_defecto = reglas.get('por_defecto', {})
+        self.todas = reglas.get('todas', {})
+        self.tablas = {k: v for k, v in reglas.get('tablas', {}).items() if not k.startswith('_')}
+        self.top10 = reglas.get('top10', {})
+        self.compiladas = {}
+        for clave in self.tablas:
+            self.de_tabla(clave)
+            self.de_tabla(clave + SUFIJO_TOP10)
+    
+    def de_tabla(self, clave):
+        """{columna: Regla} de la tabla; '*' (si existe) aplica al resto de las columnas."""
+        if clave not in self.compiladas:
+            base = SUFIJO_REPETIDA.sub('', clave)
+            self.compiladas[clave] = self.de_tabla(base) if base != clave else self._compilar(clave)
+        return self.compiladas[clave]
+    
+    def _compilar(self, clave):
+        base = clave[:-len(SUFIJO_TOP10)] if clave.endswith(SUFIJO_TOP10) else clave
+        capas = [self.todas, self.tablas.get(base, {})]
+        if base != clave:
+            capas += [self.top10.get('*', {}), self.top10.get(base, {})]
+        
+        # Cada capa sobrescribe solo los campos que declara
+        columnas = {}
+        for capa in capas:
+            for columna, campos in capa.items():
+                columnas.setdefault(columna, {}).update(campos)
+        
+        # Una columna propia hereda de '*' los campos que no declara
+        resto = columnas.get('*', {})
+        compiladas = {}
+        for columna, campos in columnas.items():
+            campos = {**resto, **campos}
+            desconocidos = set(campos) - set(Regla._fields)
+            if desconocidos:
+                raise ValueError(f"Regla de '{clave}.{columna}' con campos desconocidos: {sorted(desconocidos)}")
+            regla = Regla(**{'min': None, 'max': None, 'nulos': True, 'tipo': 'numero',
+                             **self.por_defecto, **campos})
+            if regla.tipo not in TIPOS_REGLA:
+                raise ValueError(f"Regla de '{clave}.{columna}' con tipo inválido: {regla.tipo}")
+            compiladas[columna] = regla
+        return compiladas
+
+def a_numero(valor):
+    """float(valor), o NaN si es nulo o no es un número (misma regla que validar_numero)."""
+    if valor is None or valor == "":
+        return float("nan")
+    try:
+        return float(valor)
+    except (ValueError, TypeError):
+        return float("nan")
+
+def es_fecha_iso(valor):
+    """True si el valor es un string 'YYYY-MM-DD' (el caso que se parsea vectorizado)."""
+    return (isinstance(valor, str) and len(valor) == 10 and valor[4] == '-'
+            and valor[7] == '-' and valor[:4].isdigit())
+
+def primera_fila_distinta(columnas, filas, desde=0):
+    """(índice, diferencia) de la primera fila cuyas columnas no son `columnas`, o None."""
+    columnas_esperadas = set(columnas)
+    for i, fila in enumerate(filas, desde):
+        columnas_fila = set(fila.keys())
+        if columnas_fila != columnas_esperadas:
+            return i, columnas_fila.symmetric_difference(columnas_esperadas)
+    return None
+
+class LectorJSON:
+    """
+    Lector incremental de un documento JSON: lee el archivo de a bloques y
+    decodifica un valor por vez con JSONDecoder.raw_decode. En memoria solo
+    están el valor actual (p.ej. una fila) y un bloque del archivo.
+    
+        for clave in lector.miembros():    # claves de un objeto
+            valor = lector.valor()         # cada clave consume su valor
+        for _ in lector.elementos():       # elementos de un array
+            fila = lector.valor()
+    """
+    ESPACIOS = re.compile(r'[ \t\n\r]*')
+    
+    def __init__(self, archivo, tamanio_bloque=TAMANIO_BLOQUE):
+        self.archivo = archivo
+        self.tamanio_bloque = tamanio_bloque
+        self.decodificador = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.leidos = 0  # caracteres descartados del buffer (para las posiciones de error)
+        self.agotado = False
+    
+    def _leer_mas(self):
+        """Agrega un bloque al buffer, descartando lo ya consumido. False al final del archivo."""
+        datos = self.archivo.read(self.tamanio_bloque)
+        if not datos:
+            self.agotado = True
+            return False
+        self.leidos += self.pos
+        self.buffer = self.buffer[self.pos:] + datos
+        self.pos = 0
+        return True
+    
+    def mirar(self):
+        """Próximo carácter que no sea espacio, sin consumirlo ('' al final del documento)."""
+        while True:
+            self.pos = self.ESPACIOS.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._leer_mas():
+                return self.buffer[self.pos:self.pos + 1]
+    
+    def esperar(self, caracter):
+        """Consume `caracter` o falla con la posición en el documento."""
+        if self.mirar() != caracter:
+            raise ValueError(f"Se esperaba '{caracter}' en la posición {self.leidos + self.pos}")
+        self.pos += 1
+    
+    def valor(self):
+        """Decodifica el próximo valor completo."""
+        self.mirar()
+        while True:
+            try:
+                valor, fin = self.decodificador.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Valor cortado al final del buffer: leer otro bloque y reintentar
+                if self._leer_mas():
+                    continue
+                raise
+            # Un número al final del buffer puede seguir en el próximo bloque
+            if fin == len(self.buffer) and not self.agotado and self._leer_mas():
+                continue
+            self.pos = fin
+            return valor
+    
+    def miembros(self):
+        """Itera las claves de un objeto; antes de pedir la siguiente hay que consumir su valor."""
+        self.esperar('{')
+        if self.mirar() == '}':
+            self.pos += 1
+            return
+        while True:
+            clave = self.valor()
+            if not isinstance(clave, str):
+                raise ValueError(f"Clave inválida en la posición {self.leidos + self.pos}")
+            self.esperar(':')
+            yield clave
+            if self.mirar() != ',':
+                self.esperar('}')
+                return
+            self.pos += 1
+    
+    def elementos(self):
+        """Itera los elementos de un array; antes de pedir el siguiente hay que consumir el actual."""
+        self.esperar('[')
+        if self.mirar() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.mirar() != ',':
+                self.esperar(']')
+                return
+            self.pos += 1
+
+def archivo_contiene(ruta, patron, tamanio_bloque=TAMANIO_BLOQUE):
+    """True si los bytes del archivo contienen `patron`, leyéndolo de a bloques."""
+    with open(ruta, 'rb') as f:
+        cola = b""
+        while True:
+            datos = f.read(tamanio_bloque)
+            if not datos:
+                return False
+            ventana = cola + datos
+            if patron in ventana:
+                return True
+            cola = ventana[len(ventana) - len(patron) + 1:]
 
 class ValidationError(Exception):
     """Error de validación personalizado."""
     pass
 
 class Validator:
-    def __init__(self):
+    def __init__(self, modo='columnas', reglas=None, directorio=None, streaming=False):
+        if modo not in MODOS:
+            raise ValueError(f"Modo inválido: {modo}. Opciones: {', '.join(MODOS)}")
+        self.modo = modo
+        self.directorio = Path(directorio) if directorio else DATA_DIR
+        # Leer el maestro de a una tabla y de a bloques de filas (memoria acotada)
+        self.streaming = streaming
+        # Reglas ya compiladas, un dict con su contenido o la ruta del archivo
+        if isinstance(reglas, ReglasValidacion):
+            self.reglas = reglas
+        elif isinstance(reglas, dict):
+            self.reglas = ReglasValidacion(reglas)
+        else:
+            self.reglas = ReglasValidacion(cargar_reglas(reglas))
         self.errores = []
         self.warnings = []
         self.validaciones_ok = 0
@@ -37,24 +294,29 @@ class Validator:
         """Registra una advertencia."""
         self.warnings.append(f"⚠️  WARNING: {mensaje}")
         
+    def registrar(self, nivel, mensaje):
+        """Registra un error o una advertencia según el nivel ('error' | 'warning')."""
+        if nivel == 'error':
+            self.error(mensaje)
+        else:
+            self.warning(mensaje)
+        
     def ok(self, mensaje):
         """Registra una validación exitosa."""
         self.validaciones_ok += 1
         
-    def validar_fecha(self, fecha_str, campo, contexto):
-        """Valida que una fecha sea razonable."""
-        if not fecha_str:
-            return
-            
+    def diagnosticar_fecha(self, fecha_str, campo, contexto, ventana=None):
+        """
+        Diagnostica una fecha no vacía: retorna ('error' | 'warning', mensaje)
+        si no es razonable, o None si lo es.
+        """
         try:
             # Intentar parsear diferentes formatos
             if isinstance(fecha_str, (int, float)):
                 # Podría ser año
                 if 2020 <= fecha_str <= 2030:
-                    return True
-                else:
-                    self.warning(f"{contexto}: año fuera de rango esperado: {fecha_str}")
-                    return False
+                    return None
+                return 'warning', f"{contexto}: año fuera de rango esperado: {fecha_str}"
             
             # Parsear fecha ISO
             if 'T' in str(fecha_str):
@@ -65,26 +327,30 @@ class Validator:
             else:
                 fecha = datetime.strptime(str(fecha_str), '%Y-%m-%d')
             
-            # Validar rango razonable
-            hoy = datetime.now()
-            hace_5_años = hoy - timedelta(days=365*5)
-            en_5_años = hoy + timedelta(days=365*5)
-            
             # Detectar fecha Unix epoch (1970-01-01)
             if fecha.year == 1970 and fecha.month == 1 and fecha.day == 1:
-                self.error(f"{contexto}: Fecha epoch detectada (1970-01-01) en '{campo}'")
-                return False
+                return 'error', f"{contexto}: Fecha epoch detectada (1970-01-01) en '{campo}'"
             
             # Verificar rango razonable (últimos 5 años a próximos 5 años)
+            hace_5_años, en_5_años = ventana or ventana_fechas()
             if not (hace_5_años <= fecha <= en_5_años):
-                self.warning(f"{contexto}: Fecha fuera de rango esperado: {fecha_str}")
-                return False
+                return 'warning', f"{contexto}: Fecha fuera de rango esperado: {fecha_str}"
                 
-            return True
+            return None
             
         except Exception as e:
-            self.error(f"{contexto}: Error parseando fecha '{fecha_str}': {e}")
-            return False
+            return 'error', f"{contexto}: Error parseando fecha '{fecha_str}': {e}"
+    
+    def validar_fecha(self, fecha_str, campo, contexto):
+        """Valida que una fecha sea razonable."""
+        if not fecha_str:
+            return
+        
+        problema = self.diagnosticar_fecha(fecha_str, campo, contexto)
+        if problema is None:
+            return True
+        self.registrar(*problema)
+        return False
     
     def validar_numero(self, valor, campo, contexto, rango_min=None, rango_max=None):
         """Valida que un número esté en un rango razonable."""
@@ -113,8 +379,12 @@ class Validator:
             # No es número, podría ser texto válido
             return True
     
-    def validar_estructura_tabla(self, clave, tabla):
-        """Valida la estructura de una tabla individual."""
+    def validar_estructura_tabla(self, clave, tabla, num_filas=None, fila_distinta=None):
+        """
+        Valida la estructura de una tabla individual. En streaming, num_filas y
+        fila_distinta (ver primera_fila_distinta) llegan ya calculados y
+        tabla['datos'] no se recorre.
+        """
         contexto = f"Tabla '{clave}'"
         
         # Verificar campos obligatorios
@@ -134,159 +404,442 @@ class Validator:
         if not isinstance(tabla['datos'], list):
             self.error(f"{contexto}: 'datos' debe ser lista")
         
+        if num_filas is None:
+            num_filas = len(tabla['datos'])
+            fila_distinta = primera_fila_distinta(tabla['columnas'], tabla['datos'])
+        
         # Verificar coherencia
-        num_filas = len(tabla['datos'])
         if num_filas != tabla['filas']:
             self.warning(f"{contexto}: 'filas' ({tabla['filas']}) no coincide con len(datos) ({num_filas})")
         
-        # Verificar que todas las filas tengan las columnas esperadas
-        columnas_esperadas = set(tabla['columnas'])
-        for i, fila in enumerate(tabla['datos']):
-            columnas_fila = set(fila.keys())
-            if columnas_fila != columnas_esperadas:
-                diff = columnas_fila.symmetric_difference(columnas_esperadas)
-                self.warning(f"{contexto}: Fila {i} tiene columnas diferentes: {diff}")
-                break  # Solo reportar la primera discrepancia
+        # Verificar que todas las filas tengan las columnas esperadas (solo se reporta la primera discrepancia)
+        if fila_distinta is not None:
+            i, diff = fila_distinta
+            self.warning(f"{contexto}: Fila {i} tiene columnas diferentes: {diff}")
         
         self.ok(f"{contexto}: Estructura válida")
         return True
     
     def validar_datos_tabla(self, clave, tabla):
-        """Valida los datos de una tabla."""
+        """Valida los datos de una tabla con el modo elegido."""
+        self.validar_filas(clave, tabla)
+        self.ok(f"Tabla '{clave}': Datos validados")
+        return True
+    
+    def validar_filas(self, clave, tabla, desde=0):
+        """
+        Valida las filas de tabla['datos'] con el modo elegido; `desde` es el
+        índice de la primera en la tabla completa (validación por bloques).
+        """
+        if self.modo == 'filas':
+            self.validar_datos_filas(clave, tabla, desde)
+        else:
+            self.validar_datos_columnas(clave, tabla, desde)
+    
+    def validar_datos_filas(self, clave, tabla, desde=0):
+        """Valida los datos de una tabla fila por fila."""
         contexto = f"Tabla '{clave}'"
         
         # Buscar columna de período/fecha
-        columna_periodo = None
-        for col in tabla['columnas']:
-            if 'per' in col.lower() or 'fecha' in col.lower():
-                columna_periodo = col
-                break
+        col_periodo = columna_periodo(tabla)
+        
+        # El parser agrega '<período>_tipo' (fecha, trimestre, año, relativo...)
+        # y '<período>_etiqueta' (el texto original del Excel)
+        columna_tipo = f"{col_periodo}_tipo" if col_periodo else None
+        columna_etiqueta = f"{col_periodo}_etiqueta" if col_periodo else None
+        
+        # Reglas por columna, resueltas una vez para toda la tabla
+        reglas = self.reglas.de_tabla(clave)
+        resto = reglas.get('*')
         
         # Validar cada fila
-        for i, fila in enumerate(tabla['datos']):
+        for i, fila in enumerate(tabla['datos'], desde):
             fila_ctx = f"{contexto}, fila {i}"
             
-            # Validar fecha si existe
-            if columna_periodo and columna_periodo in fila:
-                self.validar_fecha(fila[columna_periodo], columna_periodo, fila_ctx)
+            # Validar fecha si existe (los períodos relativos no son fechas)
+            if col_periodo and col_periodo in fila:
+                if fila.get(columna_tipo, 'fecha') in TIPOS_PERIODO_FECHA:
+                    self.validar_fecha(fila[col_periodo], col_periodo, fila_ctx)
             
-            # Validar campos numéricos según el tipo de tabla
+            # Validar campos numéricos
             for campo, valor in fila.items():
-                if campo == columna_periodo or campo == 'referencia':
+                if campo in (col_periodo, columna_tipo, columna_etiqueta):
                     continue
-                
-                # Rangos específicos según tipo de dato
-                if 'ipc' in clave or 'inflacion' in clave:
-                    # Inflación: -50% a 200% mensual es razonable (contexto argentino)
-                    self.validar_numero(valor, campo, fila_ctx, -50, 200)
-                    
-                elif 'tipo_cambio' in clave:
-                    # Tipo de cambio: > 0 (no puede ser negativo)
-                    self.validar_numero(valor, campo, fila_ctx, 0, 100000)
-                    
-                elif 'tasa' in clave:
-                    # Tasas: 0% a 300% anual
-                    self.validar_numero(valor, campo, fila_ctx, 0, 300)
-                    
-                elif 'pbi' in clave:
-                    # PBI: -20% a +20% variación trimestral
-                    self.validar_numero(valor, campo, fila_ctx, -20, 20)
-                    
-                elif 'exportaciones' in clave or 'importaciones' in clave:
-                    # Comercio exterior: > 0
-                    self.validar_numero(valor, campo, fila_ctx, 0, 50000)
-                    
-                elif 'desocupacion' in clave:
-                    # Desocupación: 0% a 50%
-                    self.validar_numero(valor, campo, fila_ctx, 0, 50)
-        
-        self.ok(f"{contexto}: Datos validados")
+                regla = reglas.get(campo, resto)
+                if regla is None or regla.tipo != 'numero':
+                    continue
+                if not regla.nulos and math.isnan(a_numero(valor)):
+                    self.warning(f"{fila_ctx}: Valor nulo o no numérico en '{campo}'")
+                    continue
+                self.validar_numero(valor, campo, fila_ctx, regla.min, regla.max)
+        
         return True
     
+    def validar_datos_columnas(self, clave, tabla, desde=0):
+        """
+        Valida los datos de una tabla columna por columna: cada columna se
+        carga como array de NumPy, los rangos y las fechas se chequean con
+        operaciones vectoriales y solo las filas con problemas se convierten
+        en mensajes, en el mismo orden que validar_datos_filas.
+        
+        Retorna {columna: array de índices de las filas con problemas}
+        (contados desde `desde`).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("La validación por columnas requiere: pip install numpy")
+        
+        contexto = f"Tabla '{clave}'"
+        datos = tabla['datos']
+        col_periodo = columna_periodo(tabla)
+        columna_tipo = f"{col_periodo}_tipo" if col_periodo else None
+        columna_etiqueta = f"{col_periodo}_etiqueta" if col_periodo else None
+        reglas = self.reglas.de_tabla(clave)
+        resto = reglas.get('*')
+        
+        # (fila, orden de la columna, nivel, mensaje); la fecha va primero en cada fila
+        hallazgos = []
+        # Columnas declaradas + las que aparezcan solo en alguna fila
+        campos = list(dict.fromkeys([*tabla['columnas'], *(c for fila in datos for c in fila)]))
+        
+        if col_periodo:
+            filas = [
+                i for i, fila in enumerate(datos)
+                if fila.get(col_periodo) and fila.get(columna_tipo, 'fecha') in TIPOS_PERIODO_FECHA
+            ]
+            hallazgos += self._hallazgos_fecha(np, datos, filas, col_periodo, contexto, desde)
+        
+        for orden, campo in enumerate(campos):
+            regla = reglas.get(campo, resto)
+            if campo in (col_periodo, columna_tipo, columna_etiqueta) or regla is None or regla.tipo != 'numero':
+                continue
+            valores = [fila.get(campo) for fila in datos]
+            try:
+                numeros = np.array(valores, dtype=float)
+            except (ValueError, TypeError):
+                # Hay texto ('s/d', '') u otros tipos: se convierten uno a uno
+                numeros = np.array([a_numero(v) for v in valores], dtype=float)
+            
+            if not regla.nulos:
+                # Solo los valores presentes: las columnas faltantes se informan en la estructura
+                presentes = np.array([campo in fila for fila in datos], dtype=bool)
+                for i in np.flatnonzero(np.isnan(numeros) & presentes):
+                    hallazgos.append((i, orden, 'warning', f"{contexto}, fila {i + desde}: Valor nulo o no numérico en '{campo}'"))
+            
+            # Las comparaciones con NaN (nulos, texto) son siempre falsas
+            if "median" in campo.lower():
+                for i in np.flatnonzero(numeros == 0):
+                    hallazgos.append((i, orden, 'warning', f"{contexto}, fila {i + desde}: Mediana en cero podría ser sospechoso"))
+            if regla.min is not None:
+                for i in np.flatnonzero(numeros < regla.min):
+                    hallazgos.append((i, orden, 'warning', f"{contexto}, fila {i + desde}: Valor {float(numeros[i])} < {regla.min} en '{campo}'"))
+            if regla.max is not None:
+                for i in np.flatnonzero(numeros > regla.max):
+                    hallazgos.append((i, orden, 'warning', f"{contexto}, fila {i + desde}: Valor {float(numeros[i])} > {regla.max} en '{campo}'"))
+        
+        # Orden estable por (fila, columna): igual que recorrer fila por fila
+        hallazgos.sort(key=lambda h: (h[0], h[1]))
+        problemas = {}
+        for i, orden, nivel, mensaje in hallazgos:
+            self.registrar(nivel, mensaje)
+            campo = col_periodo if orden < 0 else campos[orden]
+            problemas.setdefault(campo, []).append(int(i) + desde)
+        
+        return {campo: np.unique(filas) for campo, filas in problemas.items()}
+    
+    def _hallazgos_fecha(self, np, datos, filas, campo, contexto, desde=0):
+        """Chequea las fechas de las filas indicadas; las ISO se parsean en bloque."""
+        ventana = ventana_fechas()
+        iso = [i for i in filas if es_fecha_iso(datos[i][campo])]
+        resto = [i for i in filas if not es_fecha_iso(datos[i][campo])]
+        hallazgos = []
+        
+        try:
+            fechas = np.array([datos[i][campo] for i in iso], dtype='datetime64[D]')
+        except ValueError:
+            # Alguna fecha inválida (p. ej. '2025-02-30'): se diagnostican una por una
+            fechas, resto = None, filas
+        
+        if fechas is not None and len(iso):
+            inicio, fin = (np.datetime64(f, 'us') for f in ventana)
+            en_us = fechas.astype('datetime64[us]')
+            epoch = fechas == np.datetime64('1970-01-01')
+            fuera = ~epoch & ((en_us < inicio) | (en_us > fin))
+            for j in np.flatnonzero(epoch):
+                i = iso[j]
+                hallazgos.append((i, -1, 'error', f"{contexto}, fila {i + desde}: Fecha epoch detectada (1970-01-01) en '{campo}'"))
+            for j in np.flatnonzero(fuera):
+                i = iso[j]
+                hallazgos.append((i, -1, 'warning', f"{contexto}, fila {i + desde}: Fecha fuera de rango esperado: {datos[i][campo]}"))
+        
+        for i in resto:
+            problema = self.diagnosticar_fecha(datos[i][campo], campo, f"{contexto}, fila {i + desde}", ventana)
+            if problema is not None:
+                hallazgos.append((i, -1, *problema))
+        return hallazgos
+    
+    def validar_cantidad_tablas(self, num_tablas, origen="Archivo maestro"):
+        """Verifica que haya 18 tablas."""
+        if num_tablas != 18:
+            self.warning(f"Se esperan 18 tablas, se encontraron {num_tablas}")
+        else:
+            self.ok(f"{origen} contiene {num_tablas} tablas")
+    
+    def validar_tablas(self, tablas, origen="Archivo maestro"):
+        """Valida un dict {clave: tabla}: la cantidad de tablas y cada una de ellas."""
+        self.validar_cantidad_tablas(len(tablas), origen)
+        
+        # Validar cada tabla
+        for clave, tabla in tablas.items():
+            self.validar_estructura_tabla(clave, tabla)
+            self.validar_datos_tabla(clave, tabla)
+    
     def validar_archivo_maestro(self):
-        """Valida el archivo maestro rem_bloques.json."""
-        archivo = DATA_DIR / "rem_bloques.json"
+        """Valida el archivo maestro rem_bloques.json. Retorna sus tablas, o None si no se pudo leer."""
+        archivo = self.directorio / ARCHIVO_MAESTRO
         
         if not archivo.exists():
             self.error(f"No existe archivo maestro: {archivo}")
-            return False
+            return None
         
         try:
             with open(archivo, 'r', encoding='utf-8') as f:
                 data = json.load(f)
         except json.JSONDecodeError as e:
             self.error(f"Error parseando JSON maestro: {e}")
-            return False
+            return None
         except Exception as e:
             self.error(f"Error leyendo archivo maestro: {e}")
-            return False
+            return None
         
         # Verificar que sea un diccionario
         if not isinstance(data, dict):
             self.error("Archivo maestro debe ser un objeto JSON (diccionario)")
-            return False
+            return None
         
-        # Verificar número de tablas
-        num_tablas = len(data)
-        if num_tablas != 18:
-            self.warning(f"Se esperan 18 tablas, se encontraron {num_tablas}")
-        else:
-            self.ok(f"Archivo maestro contiene {num_tablas} tablas")
+        self.validar_tablas(data)
+        return data
+    
+    def validar_archivo_maestro_streaming(self, filas_por_bloque=FILAS_POR_BLOQUE, tamanio_bloque=TAMANIO_BLOQUE):
+        """
+        Igual que validar_archivo_maestro, pero sin cargar el documento: lee
+        rem_bloques.json de a una tabla y valida sus filas de a bloques de
+        `filas_por_bloque`, así la memoria no depende del tamaño del maestro.
+        Produce los mismos errores y advertencias, en el mismo orden (si el
+        documento es inválido, el texto del error de sintaxis puede variar).
+        Retorna las claves de las tablas, o None si no se pudo leer.
+        """
+        archivo = self.directorio / ARCHIVO_MAESTRO
         
-        # Validar cada tabla
-        for clave, tabla in data.items():
+        if not archivo.exists():
+            self.error(f"No existe archivo maestro: {archivo}")
+            return None
+        
+        # Si el documento resulta inválido, el reporte es solo ese error (como con json.load)
+        estado = len(self.errores), len(self.warnings), self.validaciones_ok
+        claves = []
+        try:
+            with open(archivo, 'r', encoding='utf-8') as f:
+                lector = LectorJSON(f, tamanio_bloque)
+                if lector.mirar() != '{':
+                    lector.valor()
+                    if lector.mirar():
+                        raise ValueError(f"Datos extra en la posición {lector.leidos + lector.pos}")
+                    self.error("Archivo maestro debe ser un objeto JSON (diccionario)")
+                    return None
+                for clave in lector.miembros():
+                    claves.append(clave)
+                    self._validar_tabla_streaming(clave, lector, filas_por_bloque)
+                if lector.mirar():
+                    raise ValueError(f"Datos extra en la posición {lector.leidos + lector.pos}")
+        except UnicodeDecodeError as e:
+            self._restaurar(estado)
+            self.error(f"Error leyendo archivo maestro: {e}")
+            return None
+        except (json.JSONDecodeError, ValueError) as e:
+            self._restaurar(estado)
+            self.error(f"Error parseando JSON maestro: {e}")
+            return None
+        except Exception as e:
+            self._restaurar(estado)
+            self.error(f"Error leyendo archivo maestro: {e}")
+            return None
+        
+        # La cantidad de tablas se conoce al final, pero va antes que los mensajes de cada tabla
+        errores, warnings, _ = estado
+        with self._mensajes_antes(errores, warnings):
+            self.validar_cantidad_tablas(len(claves))
+        return claves
+    
+    def _validar_tabla_streaming(self, clave, lector, filas_por_bloque):
+        """Valida la tabla que sigue en el lector; los datos, de a bloques de filas."""
+        if lector.mirar() != '{':
+            tabla = lector.valor()
             self.validar_estructura_tabla(clave, tabla)
             self.validar_datos_tabla(clave, tabla)
+            return
         
-        return True
-    
-    def validar_archivos_individuales(self):
-        """Valida que existan los archivos individuales."""
-        patron = "rem_*.json"
-        archivos = list(DATA_DIR.glob(patron))
+        errores, warnings = len(self.errores), len(self.warnings)
+        tabla = {}
+        num_filas = fila_distinta = None
+        for campo in lector.miembros():
+            # Las filas se validan al leerlas si ya se conocen las columnas (el parser las escribe antes)
+            if campo != 'datos' or lector.mirar() != '[' or not isinstance(tabla.get('columnas'), list):
+                tabla[campo] = lector.valor()
+                continue
+            
+            tabla['datos'] = []
+            num_filas = 0
+            bloque = {'columnas': tabla['columnas'], 'datos': []}
+            for _ in lector.elementos():
+                bloque['datos'].append(lector.valor())
+                if len(bloque['datos']) == filas_por_bloque:
+                    fila_distinta = fila_distinta or primera_fila_distinta(tabla['columnas'], bloque['datos'], num_filas)
+                    self.validar_filas(clave, bloque, num_filas)
+                    num_filas += len(bloque['datos'])
+                    bloque['datos'] = []
+            fila_distinta = fila_distinta or primera_fila_distinta(tabla['columnas'], bloque['datos'], num_filas)
+            self.validar_filas(clave, bloque, num_filas)
+            num_filas += len(bloque['datos'])
         
-        # Excluir el archivo maestro
-        archivos = [f for f in archivos if f.name != "rem_bloques.json"]
+        if num_filas is None:
+            # Sin filas leídas en streaming (p.ej. 'datos' antes que 'columnas'): la tabla está entera en memoria
+            self.validar_estructura_tabla(clave, tabla)
+            self.validar_datos_tabla(clave, tabla)
+            return
         
+        # La estructura se conoce al final de la tabla, pero sus mensajes van antes que los de los datos
+        with self._mensajes_antes(errores, warnings):
+            self.validar_estructura_tabla(clave, tabla, num_filas, fila_distinta)
+        self.ok(f"Tabla '{clave}': Datos validados")
+    
+    @contextlib.contextmanager
+    def _mensajes_antes(self, errores, warnings):
+        """Los errores y advertencias registrados dentro del bloque quedan en las posiciones dadas."""
+        errores_despues, warnings_despues = self.errores[errores:], self.warnings[warnings:]
+        del self.errores[errores:], self.warnings[warnings:]
+        yield
+        self.errores += errores_despues
+        self.warnings += warnings_despues
+    
+    def _restaurar(self, estado):
+        """Descarta lo registrado después de `estado` (errores, warnings, validaciones_ok)."""
+        errores, warnings, self.validaciones_ok = estado
+        del self.errores[errores:], self.warnings[warnings:]
+    
+    def validar_archivos_individuales(self, claves):
+        """
+        Verifica que cada rem_{clave}.json sea byte a byte el fragmento de su
+        tabla en el maestro, sin volver a parsearlo ni validarlo: el maestro
+        armado con los archivos individuales tiene que tener el mismo SHA-256
+        que el del disco. Los archivos se hashean de a uno, sin armar el
+        maestro en memoria. Solo si no coincide se busca qué archivo difiere.
+        """
+        from rem.cache import hash_archivo
+        from rem.salida import ensamblar_objeto
+        
+        archivos = [f for f in self.directorio.glob("rem_*.json") if f.name != ARCHIVO_MAESTRO]
         if not archivos:
             self.error("No se encontraron archivos JSON individuales")
             return False
         
         self.ok(f"Encontrados {len(archivos)} archivos individuales")
         
-        # Validar cada archivo
-        for archivo in archivos:
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    tabla = json.load(f)
-                
-                clave = archivo.stem.replace('rem_', '')
-                self.validar_estructura_tabla(clave, tabla)
-                self.validar_datos_tabla(clave, tabla)
-                
-            except Exception as e:
-                self.error(f"Error validando {archivo.name}: {e}")
+        esperados = {f"rem_{clave}.json" for clave in claves}
+        for archivo in sorted(archivos):
+            if archivo.name not in esperados:
+                self.warning(f"{archivo.name} no está en el archivo maestro")
         
-        return True
+        maestro = self.directorio / ARCHIVO_MAESTRO
+        try:
+            with open(maestro, 'rb') as f:
+                # El maestro indentado (--pretty) tiene los fragmentos con una sangría más
+                indentado = f.read(2) == b"{\n"
+            sha_maestro = hash_archivo(maestro)
+        except OSError as e:
+            self.error(f"Error leyendo archivo maestro: {e}")
+            return False
+        
+        apertura, separador, cierre = (b"{\n", b",\n", b"\n}") if indentado else (b"{", b",", b"}")
+        
+        def miembro(clave, archivo):
+            """Bytes de la tabla dentro del maestro: "clave":<contenido del archivo>."""
+            return ensamblar_objeto({clave: archivo.read_bytes()}, indentado)[len(apertura):-len(cierre)]
+        
+        armado = hashlib.sha256(apertura)
+        presentes = {}
+        for clave in claves:
+            archivo = self.directorio / f"rem_{clave}.json"
+            if not archivo.exists():
+                self.error(f"Falta el archivo individual {archivo.name}")
+                continue
+            if presentes:
+                armado.update(separador)
+            armado.update(miembro(clave, archivo))
+            presentes[clave] = archivo
+        armado.update(cierre)
+        
+        if armado.hexdigest() == sha_maestro:
+            self.ok(f"{len(presentes)} archivos individuales idénticos al maestro")
+            return True
+        
+        diferentes = [
+            archivo.name for clave, archivo in presentes.items()
+            if not archivo_contiene(maestro, miembro(clave, archivo))
+        ]
+        for nombre in diferentes:
+            self.error(f"{nombre} no coincide con su fragmento en {ARCHIVO_MAESTRO}")
+        if not diferentes and len(presentes) == len(claves):
+            self.error(f"{ARCHIVO_MAESTRO} no coincide con los archivos individuales")
+        return False
+    
+    def verificar_escritos(self, claves):
+        """
+        Compara por hash los archivos recién escritos con el maestro, para el
+        resultado que ya se validó en memoria con ejecutar(resultado,
+        archivos=False) antes de escribirlo. Retorna True si coinciden.
+        """
+        print("🔍 Comparando archivos individuales con el maestro...")
+        errores = len(self.errores)
+        self.validar_archivos_individuales(claves)
+        for e in self.errores[errores:]:
+            print(f"   {e}")
+        return len(self.errores) == errores
     
-    def ejecutar(self):
-        """Ejecuta todas las validaciones."""
+    def ejecutar(self, resultado=None, archivos=True):
+        """
+        Ejecuta todas las validaciones. Con `resultado` (el dict {clave: tabla}
+        que retorna el parser) valida las tablas en memoria en vez de releer
+        el maestro; los archivos del directorio solo se comparan por hash.
+        Con archivos=False valida solo el resultado, sin mirar el directorio:
+        así se puede validar antes de escribir (ver verificar_escritos).
+        """
         print("=" * 70)
         print("VALIDACIÓN DE DATOS REM")
         print("=" * 70)
         print()
         
         # Verificar que exista el directorio
-        if not DATA_DIR.exists():
-            self.error(f"No existe directorio de datos: {DATA_DIR}")
+        if archivos and not self.directorio.exists():
+            self.error(f"No existe directorio de datos: {self.directorio}")
             return False
         
         # Ejecutar validaciones
-        print("🔍 Validando archivo maestro...")
-        self.validar_archivo_maestro()
+        if resultado is None and self.streaming:
+            print("🔍 Validando archivo maestro (streaming)...")
+            tablas = self.validar_archivo_maestro_streaming()
+        elif resultado is None:
+            print("🔍 Validando archivo maestro...")
+            tablas = self.validar_archivo_maestro()
+        else:
+            print("🔍 Validando resultado del parser (en memoria)...")
+            self.validar_tablas(resultado, "Resultado del parser")
+            tablas = resultado
         
-        print("\n🔍 Validando archivos individuales...")
-        self.validar_archivos_individuales()
+        if tablas is not None and archivos:
+            print("\n🔍 Comparando archivos individuales con el maestro...")
+            self.validar_archivos_individuales(list(tablas))
         
         # Mostrar resumen
         print("\n" + "=" * 70)
@@ -324,7 +877,16 @@ class Validator:
             return True
 
 def main():
-    validator = Validator()
+    parser = argparse.ArgumentParser(description="Valida los JSON generados en ./data")
+    parser.add_argument("--por-filas", action="store_true",
+                        help="Validar fila por fila en vez de por columnas (más lento, mismo reporte)")
+    parser.add_argument("--reglas", type=Path, default=REGLAS,
+                        help="Archivo de reglas de validación (default: reglas_validacion.json)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Leer rem_bloques.json de a una tabla y de a bloques de filas (memoria acotada)")
+    args = parser.parse_args()
+    
+    validator = Validator(modo='filas' if args.por_filas else 'columnas', reglas=args.reglas, streaming=args.streaming)
     exito = validator.ejecutar()
     sys.exit(0 if exito else 1)
 
@@ -66,13 +66,19 @@ export default {
       }
       
       if (path === '/api/bloques' || path === '/bloques') {
-        return handleBloques(env, corsHeaders);
+        return handleBloques(env, request, corsHeaders);
       }
       
       if (path === '/api/stats' || path === '/stats') {
         return handleStats(env, corsHeaders);
       }
       
+      // Objeto inmutable por hash: /api/objetos/{sha256}.json[.gz|.br]
+      const objectMatch = path.match(/^\/api\/objetos\/([0-9a-f]{64}\.json(?:\.gz|\.br)?)$/);
+      if (objectMatch) {
+        return handleObjeto(env, request, objectMatch[1], corsHeaders);
+      }
+      
       // Endpoint para tabla específica: /api/{tabla}
       // Soporta query params: ?periodo=2025-11 o ?year=2025&month=11
       const match = path.match(/^\/api\/([a-z_0-9]+)$/);
@@ -83,7 +89,7 @@ export default {
         const year = searchParams.get('year');
         const month = searchParams.get('month');
         
-        return handleTabla(env, tabla, periodo, year, month, corsHeaders);
+        return handleTabla(env, request, tabla, periodo, year, month, corsHeaders);
       }
 
       // 404
@@ -141,6 +147,11 @@ function handleIndex(headers) {
         metodo: 'GET',
         ejemplo: '/api/bloques'
       },
+      objeto: {
+        ruta: '/api/objetos/{sha256}.json',
+        descripcion: 'Versión inmutable de una tabla (ver header Content-Location de /api/{tabla}); cache de 1 año',
+        metodo: 'GET'
+      },
       tabla: {
         ruta: '/api/{tabla}',
         descripcion: 'Obtener datos de una tabla específica',
@@ -227,7 +238,7 @@ function handleIndex(headers) {
       exito: {
         descripcion: 'Datos en formato JSON',
         content_type: 'application/json',
-        cache: 'Cache-Control: public, max-age=3600 (1 hora)'
+        cache: 'Cache-Control: public, max-age=300 (5 minutos) con ETag; /api/objetos/{hash}: immutable'
       },
       error: {
         campos: ['error', 'mensaje', 'sugerencia'],
@@ -253,7 +264,8 @@ function handleIndex(headers) {
 // Handler: Metadata
 async function handleMetadata(env, headers) {
   try {
-    const object = await env.R2_BUCKET.get('data/latest/_metadata.json');
+    const { prefix } = await resolveEdition(env, null);
+    const object = await env.R2_BUCKET.get(`${prefix}_metadata.json`);
     
     if (!object) {
       return new Response(
@@ -275,27 +287,20 @@ async function handleMetadata(env, headers) {
 }
 
 // Handler: Bloques (archivo maestro)
-async function handleBloques(env, headers) {
+async function handleBloques(env, request, headers) {
   try {
-    // Siempre buscar en latest/
-    const object = await env.R2_BUCKET.get('data/latest/rem_bloques.json');
+    // Siempre la edición vigente
+    const edition = await resolveEdition(env, null);
+    const found = await getJsonObject(env, edition, 'rem_bloques.json', request);
     
-    if (!object) {
+    if (!found) {
       return new Response(
         JSON.stringify({ error: 'Archivo maestro no encontrado' }),
         { status: 404, headers }
       );
     }
 
-    const data = await object.json();
-    
-    // Agregar headers de cache
-    const headersWithCache = {
-      ...headers,
-      'Cache-Control': 'public, max-age=3600', // Cache 1 hora
-    };
-
-    return new Response(JSON.stringify(data, null, 2), { headers: headersWithCache });
+    return jsonObjectResponse(found, headers);
 
   } catch (error) {
     console.error('Error leyendo bloques:', error);
@@ -307,56 +312,43 @@ async function handleBloques(env, headers) {
 }
 
 // Handler: Tabla específica
-async function handleTabla(env, tabla, periodo, year, month, headers) {
+async function handleTabla(env, request, tabla, periodo, year, month, headers) {
   try {
-    // Determinar ruta según parámetros
-    let basePath = 'data/latest';
-    
-    if (periodo) {
-      // Formato: 2025-11
-      const [y, m] = periodo.split('-');
-      basePath = `data/${y}/${m}`;
-    } else if (year && month) {
-      basePath = `data/${year}/${month}`;
-    }
+    // Edición según parámetros (formato 2025-11, o year + month); sin ellos, la vigente
+    const requested = periodo || (year && month ? `${year}-${month}` : null);
+    const edition = await resolveEdition(env, requested);
     
     // Construir nombre de archivo
-    const fileName = `${basePath}/rem_${tabla}.json`;
+    const fileName = `rem_${tabla}.json`;
     
-    console.log(`Intentando obtener: ${fileName}`);
+    console.log(`Intentando obtener: ${edition.prefix}${fileName}`);
     console.log(`Binding R2_BUCKET:`, env.R2_BUCKET ? 'OK' : 'MISSING');
     
-    const object = await env.R2_BUCKET.get(fileName);
+    const found = await getJsonObject(env, edition, fileName, request);
     
-    console.log(`Objeto obtenido:`, object ? 'SI' : 'NO');
+    console.log(`Objeto obtenido:`, found ? 'SI' : 'NO');
     
-    if (!object) {
-      // Intentar listar objetos para debug
-      const list = await env.R2_BUCKET.list({ prefix: 'data/latest/', limit: 5 });
-      console.log(`Archivos encontrados con prefix data/latest/:`, list.objects.map(o => o.key));
+    if (!found) {
+      // Archivos de la edición para debug: del índice, o listando el prefijo
+      const archivos = edition.objetos
+        ? Object.keys(edition.objetos).filter(name => name.endsWith('.json')).slice(0, 5)
+        : (await env.R2_BUCKET.list({ prefix: edition.prefix, limit: 5 })).objects.map(o => o.key);
+      console.log(`Archivos encontrados en ${edition.prefix}:`, archivos);
       
       return new Response(
         JSON.stringify({ 
           error: 'Tabla no encontrada',
           tabla: tabla,
-          buscando: fileName,
-          periodo_solicitado: periodo || `${year}-${month}` || 'latest',
-          archivos_encontrados: list.objects.map(o => o.key),
+          buscando: `${edition.prefix}${fileName}`,
+          periodo_solicitado: requested || 'latest',
+          archivos_encontrados: archivos,
           sugerencia: 'Ver /api para lista de tablas disponibles. Usa ?periodo=2025-11 para períodos específicos'
         }),
         { status: 404, headers }
       );
     }
 
-    const data = await object.json();
-    
-    // Agregar headers de cache
-    const headersWithCache = {
-      ...headers,
-      'Cache-Control': 'public, max-age=3600', // Cache 1 hora
-    };
-
-    return new Response(JSON.stringify(data, null, 2), { headers: headersWithCache });
+    return jsonObjectResponse(found, headers);
 
   } catch (error) {
     console.error(`Error leyendo tabla ${tabla}:`, error);
@@ -367,6 +359,170 @@ async function handleTabla(env, tabla, periodo, year, month, headers) {
   }
 }
 
+// ============================================================================
+// EDICIONES PUBLICADAS
+// ============================================================================
+
+// El deploy sube cada archivo a data/objetos/{sha256}.json[.gz|.br] (inmutable)
+// y cada edición es un índice nombre → clave. Los punteros data/latest.json y
+// data/YYYY/MM/_edicion.json se mueven al final de cada publicación.
+const LATEST_POINTER_KEY = 'data/latest.json';
+const OBJECTS_PREFIX = 'data/objetos/';
+
+const CACHE_MUTABLE = 'public, max-age=300'; // 5 minutos, revalidación con ETag
+const CACHE_IMMUTABLE = 'public, max-age=31536000, immutable';
+
+// Los índices no cambian nunca (su clave es su hash): se guardan por isolate
+const indexCache = new Map();
+
+function editionPrefix(periodo) {
+  const [y, m] = periodo.split('-');
+  return `data/${y}/${m}/`;
+}
+
+/**
+ * Resuelve una edición ('YYYY-MM', o la vigente si es null) a través de su
+ * puntero. Ediciones publicadas sin puntero se leen de data/YYYY/MM/ o de
+ * la copia en data/latest/.
+ * @returns {object} { prefix, objetos } con objetos = índice nombre → clave, o null
+ */
+async function resolveEdition(env, periodo) {
+  const fallback = periodo ? editionPrefix(periodo) : 'data/latest/';
+  const pointerObject = await env.R2_BUCKET.get(
+    periodo ? `${editionPrefix(periodo)}_edicion.json` : LATEST_POINTER_KEY
+  );
+  if (!pointerObject) {
+    return { prefix: fallback, objetos: null };
+  }
+  
+  const { prefijo, indice } = await pointerObject.json();
+  const prefix = prefijo ? (prefijo.endsWith('/') ? prefijo : `${prefijo}/`) : fallback;
+  return { prefix, objetos: indice ? await getIndex(env, indice) : null };
+}
+
+async function getIndex(env, key) {
+  if (!indexCache.has(key)) {
+    const object = await env.R2_BUCKET.get(key);
+    if (!object) {
+      return null;
+    }
+    indexCache.set(key, (await object.json()).objetos);
+  }
+  return indexCache.get(key);
+}
+
+/** ETag de un objeto inmutable: el hash que ya está en su clave. */
+function objectEtag(key) {
+  const match = key.match(/([0-9a-f]{64})/);
+  return match ? `"${match[1]}"` : null;
+}
+
+function matchesEtag(request, etag) {
+  return Boolean(etag) && (request.headers.get('If-None-Match') || '').includes(etag);
+}
+
+// Handler: Objeto inmutable por hash (/api/objetos/{sha256}.json[.gz|.br])
+async function handleObjeto(env, request, name, headers) {
+  const key = `${OBJECTS_PREFIX}${name}`;
+  const etag = objectEtag(key);
+  const responseHeaders = { ...headers, 'Cache-Control': CACHE_IMMUTABLE, 'ETag': etag };
+  
+  if (matchesEtag(request, etag)) {
+    return new Response(null, { status: 304, headers: responseHeaders });
+  }
+  
+  const object = await env.R2_BUCKET.get(key);
+  if (!object) {
+    return new Response(
+      JSON.stringify({ error: 'Objeto no encontrado', objeto: name }),
+      { status: 404, headers }
+    );
+  }
+  
+  const compressed = PRECOMPRESSED.find(({ extension }) => name.endsWith(extension));
+  if (compressed) {
+    responseHeaders['Content-Encoding'] = compressed.encoding;
+    return new Response(object.body, { headers: responseHeaders, encodeBody: 'manual' });
+  }
+  return new Response(object.body, { headers: responseHeaders });
+}
+
+// ============================================================================
+// JSON PRECOMPRIMIDOS
+// ============================================================================
+
+// Versiones precomprimidas que sube el deploy, en orden de preferencia
+const PRECOMPRESSED = [
+  { extension: '.br', encoding: 'br' },
+  { extension: '.gz', encoding: 'gzip' },
+];
+
+/**
+ * Busca la versión de `fileName` de la edición que mejor acepta el cliente
+ * (.br, .gz o el JSON sin comprimir). Con índice, la clave y el ETag salen
+ * del índice: si el cliente ya tiene esa versión (If-None-Match) no se lee
+ * el objeto de R2.
+ * @returns {object|null} { object, encoding, key, etag } (object null → 304) o null si no existe
+ */
+async function getJsonObject(env, edition, fileName, request) {
+  const acceptEncoding = request.headers.get('Accept-Encoding') || '';
+  const candidates = [
+    ...PRECOMPRESSED.filter(({ encoding }) => acceptEncoding.includes(encoding)),
+    { extension: '', encoding: null },
+  ];
+  
+  for (const { extension, encoding } of candidates) {
+    const key = edition.objetos
+      ? edition.objetos[fileName + extension]
+      : `${edition.prefix}${fileName}${extension}`;
+    if (!key) {
+      continue;
+    }
+    
+    const etag = edition.objetos ? objectEtag(key) : null;
+    if (matchesEtag(request, etag)) {
+      return { object: null, encoding, key, etag };
+    }
+    
+    const object = await env.R2_BUCKET.get(key);
+    if (object) {
+      return { object, encoding, key, etag };
+    }
+  }
+  
+  return null;
+}
+
+/**
+ * Responde con los bytes de R2 tal cual están guardados: sin parsear ni
+ * recomprimir el JSON en cada petición.
+ */
+function jsonObjectResponse({ object, encoding, key, etag }, headers) {
+  const responseHeaders = {
+    ...headers,
+    'Cache-Control': CACHE_MUTABLE,
+    'Vary': 'Accept-Encoding',
+  };
+  
+  if (etag) {
+    // Versión inmutable de esta misma respuesta
+    responseHeaders['ETag'] = etag;
+    responseHeaders['Content-Location'] = `/api/objetos/${key.slice(OBJECTS_PREFIX.length)}`;
+  }
+  
+  if (!object) {
+    return new Response(null, { status: 304, headers: responseHeaders });
+  }
+  
+  if (encoding) {
+    responseHeaders['Content-Encoding'] = encoding;
+    // encodeBody: 'manual' → el runtime no vuelve a comprimir el body
+    return new Response(object.body, { headers: responseHeaders, encodeBody: 'manual' });
+  }
+  
+  return new Response(object.body, { headers: responseHeaders });
+}
+
 // ============================================================================
 // RATE LIMITING & USAGE TRACKING
 // ============================================================================